@@ -7,19 +7,41 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import io
+import os
+import time
+import functools
+import uuid
 import warnings
+from packaging.version import Version
 warnings.filterwarnings('ignore')
 
 # 导入自定义模块
-from time_series_stationarity_analyzer.stationarity import StationarityAnalyzer
-from time_series_stationarity_analyzer.visualization import TimeSeriesVisualizer, create_test_report_chart
+from time_series_stationarity_analyzer.stationarity import find_difference_order
+from time_series_stationarity_analyzer.aggregation import aggregate_csv, aggregate_frame
+from time_series_stationarity_analyzer.frequency import regularize_series
+from time_series_stationarity_analyzer.grouped import analyze_groups, analyze_columns, analyze_series, numeric_columns
+from time_series_stationarity_analyzer.instrumentation import timings_table
+from time_series_stationarity_analyzer.jobs import AnalysisJobManager, DONE, FAILED, CANCELLED
+from time_series_stationarity_analyzer.excel_source import EXCEL_EXTENSIONS, list_sheets, read_preview, read_excel_columns
+from time_series_stationarity_analyzer.multi_file import (
+    CSV_ENCODINGS, expand_archives, preview_files, parse_files, merge_sorted, file_extension
+)
+from time_series_stationarity_analyzer.sqlite_source import SQLiteSource
+from time_series_stationarity_analyzer.results_store import ResultsStore
+from time_series_stationarity_analyzer.session_store import ArtifactRegistry, ArtifactStore
+from time_series_stationarity_analyzer.shared_cache import SharedCache
+from time_series_stationarity_analyzer.transforms import TransformCache, TransformPipeline
+from time_series_stationarity_analyzer.visualization import (
+    TimeSeriesVisualizer, create_test_report_chart, create_p_value_heatmap, create_history_chart
+)
 from time_series_stationarity_analyzer.utils import (
     load_data_from_file, 
     validate_time_series_data, 
     generate_analysis_report,
     create_sample_data,
     get_data_summary,
-    export_results_to_csv
+    export_results_to_file,
+    bytes_fingerprint
 )
 
 # 页面配置
@@ -82,6 +104,469 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_job_manager() -> AnalysisJobManager:
+    """获取进程内共享的后台分析任务管理器，任务完成时将结果写入结果存储一次"""
+    store = get_results_store()
+    
+    def record_job(job, data: pd.Series) -> None:
+        fingerprint, record_timings = job.key
+        store.record(data.name or '未命名序列', data, job.result,
+                     params={'record_timings': record_timings}, fingerprint=fingerprint)
+    
+    return AnalysisJobManager(on_complete=record_job if store is not None else None)
+
+@st.cache_resource
+def get_artifact_registry() -> ArtifactRegistry:
+    """获取进程内共享的会话产物登记表（全局内存预算）"""
+    return ArtifactRegistry()
+
+@st.cache_resource
+def get_shared_cache() -> SharedCache:
+    """获取跨会话共享的数据与分析结果缓存"""
+    return SharedCache()
+
+# 检验结果数据库路径，可通过环境变量指定
+RESULTS_DB_PATH = os.environ.get(
+    'TSSA_RESULTS_DB', os.path.join(os.path.expanduser('~'), '.time_series_stationarity_analyzer', 'results.db')
+)
+
+# SQLite数据源只能读取该目录（含子目录）中的数据库文件，可通过环境变量指定
+DATA_DIR = os.path.realpath(os.environ.get(
+    'TSSA_DATA_DIR', os.path.join(os.path.expanduser('~'), '.time_series_stationarity_analyzer', 'data')
+))
+
+def resolve_data_path(path: str) -> str:
+    """
+    将输入的数据库路径解析为数据目录中的文件路径
+    
+    相对路径相对于数据目录；解析符号链接和 .. 后位于数据目录之外的路径被拒绝
+    """
+    resolved = os.path.realpath(os.path.join(DATA_DIR, path))
+    if os.path.commonpath([resolved, DATA_DIR]) != DATA_DIR:
+        raise ValueError(f"只能读取数据目录 {DATA_DIR} 中的数据库文件")
+    return resolved
+
+@st.cache_resource
+def get_results_store():
+    """获取进程内共享的检验结果存储，无法打开数据库时返回None"""
+    try:
+        return ResultsStore(RESULTS_DB_PATH)
+    except Exception:
+        return None
+
+def record_batch(output, series_ids: dict, params: dict) -> None:
+    """将分组分析或多列分析的全部结果批量写入结果存储"""
+    store = get_results_store()
+    if store is not None:
+        store.record_many(
+            ((series_ids.get(name, name), output['series'][name], result)
+             for name, result in output['results'].items()),
+            params=params
+        )
+
+TEST_LABELS = {'adf_test': 'ADF检验', 'kpss_test': 'KPSS检验', 'ljung_box_test': 'Ljung-Box检验'}
+STATUS_LABELS = {'pending': '⏳ 等待中', 'running': '🔄 运行中', 'done': '✅ 完成',
+                 'failed': '❌ 失败', 'cancelled': '⛔ 已取消'}
+
+# 数值时间列的时间戳单位
+EPOCH_UNITS = {'自动推断': 'auto', '秒': 's', '毫秒': 'ms', '微秒': 'us', '纳秒': 'ns'}
+# 重复时间戳的处理方式
+DUPLICATE_POLICIES = {'保留最后一个': 'last', '保留第一个': 'first', '取平均值': 'mean', '全部保留': 'keep'}
+
+# 规整为等间隔序列时缺失值的填充方式
+FILL_LABELS = {'按时间线性插值': 'interpolate', '沿用前值': 'ffill', '保留缺失值': 'none'}
+
+# 逐笔数据的聚合方式
+AGGREGATION_LABELS = {'收盘价': 'last', '均值': 'mean', '成交量加权均价 (VWAP)': 'vwap'}
+
+# 分组分析结果表的显示列名
+GROUP_LABELS = {'entity': '实体', 'n_obs': '数据点数量', 'start': '开始时间', 'end': '结束时间',
+                'overall_conclusion': '综合结论', 'is_stationary': '是否平稳', 'adf_statistic': 'ADF统计量',
+                'adf_p_value': 'ADF p值', 'adf_stationary': 'ADF平稳', 'kpss_p_value': 'KPSS p值',
+                'kpss_stationary': 'KPSS平稳', 'ljung_box_p_value': 'Ljung-Box p值',
+                'ljung_box_independent': 'Ljung-Box独立', 'error': '错误'}
+
+# 多文件上传的处理方式: 是否合并为一个序列
+MULTI_FILE_MODES = {'按时间合并为一个序列': True, '逐文件分别分析': False}
+
+# 批量结果区域的标题与标签: (标题, 数量, 平稳数量, 选择框)
+BATCH_LABELS = {'columns': ("🧮 全部数值列检验结果", "数值列数量", "平稳列", "查看列"),
+                'files': ("🗂️ 逐文件检验结果", "文件数量", "平稳文件", "查看文件")}
+
+# 导出格式: (文件扩展名, MIME类型)
+EXPORT_FORMATS = {'CSV': ('csv', 'text/csv'), 'Parquet': ('parquet', 'application/octet-stream')}
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    del EXPORT_FORMATS['Parquet']
+
+# 聚合CSV逐笔数据时每次读入的行数
+AGGREGATION_CHUNKSIZE = 500_000
+
+def aggregate_csv_upload(content: bytes, time_col: str, value_col: str, bar: str, how: str,
+                         weight_col, epoch_unit) -> pd.Series:
+    """分块读取上传的CSV文件并聚合为K线，依次尝试常见编码"""
+    for encoding in CSV_ENCODINGS:
+        try:
+            return aggregate_csv(io.BytesIO(content), time_col, value_col, bar, how=how,
+                                 weight_col=weight_col, epoch_unit=epoch_unit,
+                                 chunksize=AGGREGATION_CHUNKSIZE, encoding=encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("无法读取CSV文件，请检查文件编码")
+
+def validate_upload(load_columns, columns: list, time_col: str, value_col: str, duplicates: str,
+                    epoch_unit, aggregation, csv_content: bytes = None) -> tuple:
+    """
+    验证上传的数据，指定聚合参数 (K线周期, 聚合方式, 权重列) 时先聚合为K线
+    
+    提供 csv_content 时聚合直接分块读取CSV文件，不载入完整的数据框
+    """
+    if aggregation is None:
+        return validate_time_series_data(load_columns(columns), time_col, value_col,
+                                         duplicates=duplicates, epoch_unit=epoch_unit)
+    bar, how, weight_col = aggregation
+    try:
+        if csv_content is not None:
+            bars = aggregate_csv_upload(csv_content, time_col, value_col, bar, how,
+                                        weight_col, epoch_unit).dropna()
+        else:
+            bars = aggregate_frame(load_columns(columns), time_col, value_col, bar, how=how,
+                                   weight_col=weight_col, epoch_unit=epoch_unit).dropna()
+    except Exception as e:
+        return False, f"逐笔数据聚合失败: {str(e)}", None
+    if len(bars) < 10:
+        return False, f"聚合后的K线太少（{len(bars)} 根），请缩短K线周期", None
+    return True, "", bars
+
+def _read_file(path: str) -> bytes:
+    """读取导出文件内容"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+# 下载按钮从 Streamlit 1.52 起接受可调用对象，在点击时才读取数据；
+# 更早的版本只能在每次运行时读入完整内容
+DEFERRED_DOWNLOAD_SUPPORTED = Version(st.__version__) >= Version("1.52.0")
+
+def render_job_progress():
+    """渲染后台分析任务的进度与部分结果，任务结束后将结果写入会话状态"""
+    job = get_job_manager().get(st.session_state.analysis_job_key)
+    if job is None:
+        st.session_state.analysis_job_key = None
+        return
+    
+    snapshot = job.snapshot()
+    if snapshot['status'] == DONE:
+        st.session_state.analysis_results = get_shared_cache().put('analysis', job.key, snapshot['result'])
+        st.session_state.analysis_job_key = None
+        st.rerun()
+    elif snapshot['status'] == FAILED:
+        st.error(snapshot['error'])
+        st.session_state.analysis_job_key = None
+    elif snapshot['status'] == CANCELLED:
+        st.warning("分析已取消")
+        st.session_state.analysis_job_key = None
+    else:
+        st.progress(job.fraction_done(), text=f"正在进行平稳性分析... 已用时 {snapshot['elapsed']:.1f} 秒")
+        cols = st.columns(len(snapshot['progress']))
+        for col, (name, state) in zip(cols, snapshot['progress'].items()):
+            with col:
+                st.write(f"**{TEST_LABELS.get(name, name)}**: {STATUS_LABELS.get(state, state)}")
+                partial = snapshot['partial_results'].get(name)
+                if partial is not None and 'error' not in partial:
+                    st.metric("p值", f"{partial['p_value']:.4f}")
+                    st.caption(partial['conclusion'])
+        if st.button("取消分析"):
+            # 其他会话也在等待同一任务时只退订本会话，任务继续为其他会话运行
+            if not get_job_manager().cancel(job.key, subscriber=st.session_state.session_id):
+                st.session_state.analysis_job_key = None
+            st.rerun()
+
+# 支持局部刷新时每秒只重新运行进度区域，否则在脚本末尾整体重新运行
+if hasattr(st, 'fragment'):
+    render_job_progress = st.fragment(run_every=1.0)(render_job_progress)
+
+def render_performance_panel(timings: dict):
+    """渲染性能面板"""
+    with st.expander("⏱️ 性能", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("总耗时", f"{timings['wall_time'] * 1000:.1f} ms")
+        with col2:
+            st.metric("CPU时间", f"{timings['cpu_time'] * 1000:.1f} ms")
+        with col3:
+            peak = timings.get('peak_memory')
+            st.metric("峰值内存", f"{peak / 1024 / 1024:.2f} MB" if peak is not None else "N/A")
+        
+        if timings.get('execution') == 'serial':
+            st.caption("记录峰值内存时各项检验依次执行，以便单独测量每项检验的内存")
+        
+        table = pd.DataFrame(timings_table(timings))
+        if not table.empty:
+            table['wall_time'] = table['wall_time'] * 1000
+            table['cpu_time'] = table['cpu_time'] * 1000
+            # 与其他分析并发运行、无法单独测量的阶段峰值内存为空
+            table['peak_memory'] = pd.to_numeric(table['peak_memory']) / 1024
+            if table['memory_concurrent'].any():
+                st.caption("部分阶段与其他会话的分析同时运行，其峰值内存无法单独测量")
+            table = table.drop(columns='memory_concurrent')
+            table.columns = ['阶段', '耗时 (ms)', 'CPU时间 (ms)', '峰值内存 (KB)']
+            st.dataframe(table, use_container_width=True, hide_index=True)
+
+def render_figure_metrics(metrics: dict):
+    """渲染图表数据量面板"""
+    if not metrics:
+        return
+    with st.expander("📦 图表数据量", expanded=False):
+        table = pd.DataFrame(list(metrics.values()))
+        table['build_time'] = table['build_time'] * 1000
+        table['budget_time'] = table['budget_time'] * 1000
+        table['bytes'] = table['bytes'] / 1024
+        table['original_bytes'] = table['original_bytes'] / 1024
+        table = table[['figure', 'build_time', 'budget_time', 'bytes', 'original_bytes',
+                       'points', 'original_points', 'decimated', 'exact_size']]
+        table.columns = ['图表', '构建耗时 (ms)', '测量/抽稀耗时 (ms)', '大小 (KB)', '原始大小 (KB)',
+                         '数据点', '原始数据点', '已抽稀', '大小为实测值']
+        st.dataframe(table, use_container_width=True, hide_index=True)
+
+def run_grouped_analysis(df, group_col, time_col, value_col, duplicates, epoch_unit, progress_bar):
+    """执行分组分析并将各实体的结果写入结果存储"""
+    output = analyze_groups(
+        df, group_col, time_col, value_col,
+        duplicates=duplicates, epoch_unit=epoch_unit, keep_results=True,
+        progress=lambda done, total: progress_bar.progress(done / total, text=f"分组检验中... {done}/{total}")
+    )
+    record_batch(output, {entity: f"{value_col} ({entity})" for entity in output['results']},
+                 params={'duplicates': duplicates, 'group_col': group_col})
+    return output
+
+def run_column_analysis(df, time_col, value_cols, duplicates, epoch_unit, progress_bar):
+    """执行多列分析并将各列的结果写入结果存储"""
+    output = analyze_columns(
+        df, time_col, value_cols,
+        duplicates=duplicates, epoch_unit=epoch_unit, keep_results=True,
+        progress=lambda done, total: progress_bar.progress(done / total, text=f"多列检验中... {done}/{total}")
+    )
+    record_batch(output, {}, params={'duplicates': duplicates})
+    return output
+
+def run_multi_file(files, time_col, value_col, duplicates, epoch_unit, combine, progress_bar) -> dict:
+    """并发解析多个文件，合并为一个序列或逐文件执行检验"""
+    report, series = parse_files(
+        files, time_col, value_col,
+        # 合并时跨文件的重复时间戳在合并后统一处理
+        duplicates='keep' if combine else duplicates, epoch_unit=epoch_unit,
+        progress=lambda done, total: progress_bar.progress(done / total, text=f"解析文件中... {done}/{total}")
+    )
+    if combine:
+        return {'report': report, 'data': merge_sorted(series, duplicates), 'analysis': None}
+    
+    output = analyze_series(
+        [(name, data) for name, data, parsed in zip(report['file'], series, report['error'].isna()) if parsed],
+        keep_results=True,
+        progress=lambda done, total: progress_bar.progress(done / total, text=f"逐文件检验中... {done}/{total}")
+    )
+    record_batch(output, {name: f"{value_col} ({name})" for name in output['results']},
+                 params={'duplicates': duplicates})
+    return {'report': report, 'data': None, 'analysis': output}
+
+def render_multi_file_upload(uploaded_files):
+    """多文件上传：选择各文件共用的列映射，并发解析后合并为一个序列或逐文件分析"""
+    contents = [(uploaded.name, uploaded.getvalue()) for uploaded in uploaded_files]
+    upload_key = tuple((name, bytes_fingerprint(content)) for name, content in contents)
+    try:
+        files = expand_archives(contents)
+        preview = get_shared_cache().get_or_compute('file_preview', upload_key, lambda: preview_files(files))
+    except Exception as e:
+        st.error(f"文件读取失败: {str(e)}")
+        return
+    st.success(f"已上传 {len(files)} 个文件，按第一个文件的列选择时间列和数值列")
+    
+    time_col = st.selectbox("选择时间列", preview.columns)
+    value_col = st.selectbox("选择数值列", preview.columns)
+    epoch_unit = None
+    if pd.api.types.is_numeric_dtype(preview[time_col]):
+        epoch_label = st.selectbox("时间戳单位", list(EPOCH_UNITS))
+        epoch_unit = EPOCH_UNITS[epoch_label]
+    duplicates_label = st.selectbox("重复时间戳处理", list(DUPLICATE_POLICIES))
+    duplicates = DUPLICATE_POLICIES[duplicates_label]
+    combine = MULTI_FILE_MODES[st.radio(
+        "多文件处理方式", list(MULTI_FILE_MODES),
+        help="合并时各文件按时间归并为一个序列，跨文件的重复时间戳按上面的方式处理"
+    )]
+    
+    if not st.button("读取文件" if combine else "逐文件分析", type="primary"):
+        return
+    progress_bar = st.progress(0.0, text="解析文件中...")
+    started = time.perf_counter()
+    try:
+        output = get_shared_cache().get_or_compute(
+            'multi_file', (upload_key, time_col, value_col, duplicates, epoch_unit, combine),
+            lambda: run_multi_file(files, time_col, value_col, duplicates, epoch_unit, combine, progress_bar)
+        )
+    except Exception as e:
+        st.error(f"文件解析失败: {str(e)}")
+        progress_bar.empty()
+        return
+    progress_bar.empty()
+    
+    clear_batch_results()
+    st.session_state.file_report = (output['report'], time.perf_counter() - started)
+    if combine:
+        if len(output['data']) < 10:
+            st.error("有效数据点太少（少于10个）")
+            return
+        st.session_state.data = output['data']
+        st.success(f"文件合并完成！共 {len(output['data']):,} 个数据点")
+    elif output['analysis']['n_groups'] == 0:
+        st.error("没有成功解析的文件")
+    else:
+        st.session_state.column_results = output['analysis']
+        st.session_state.column_results_kind = 'files'
+        select_column(output['analysis']['summary']['entity'].iloc[0])
+        st.success(f"逐文件分析完成！共 {output['analysis']['n_groups']} 个文件")
+
+def render_file_report():
+    """显示多文件上传的逐文件解析耗时"""
+    report, elapsed = st.session_state.file_report
+    with st.expander(f"📁 文件解析（{len(report)} 个文件）", expanded=bool(report['error'].notna().any())):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("解析失败", f"{int(report['error'].notna().sum()):,}")
+        with col2:
+            st.metric("总耗时", f"{elapsed:.2f} 秒")
+        with col3:
+            st.metric("逐文件解析耗时合计", f"{report['parse_time'].sum():.2f} 秒")
+        columns = {'file': '文件', 'n_rows': '行数', 'n_obs': '数据点数量', 'start': '开始时间',
+                   'end': '结束时间', 'parse_time': '解析耗时(秒)', 'error': '错误'}
+        st.dataframe(report.rename(columns=columns), use_container_width=True, hide_index=True,
+                     column_config={'解析耗时(秒)': st.column_config.NumberColumn(format="%.3f")})
+
+def render_history():
+    """显示结果存储中的历史检验记录和p值趋势"""
+    store = get_results_store()
+    if store is None:
+        return
+    series_ids = store.series_ids()
+    if series_ids.empty:
+        return
+    
+    with st.expander(f"🗂️ 历史检验记录（{len(series_ids)} 个序列）"):
+        current = st.session_state.data.name if st.session_state.data is not None else None
+        options = series_ids['series_id'].tolist()
+        series_id = st.selectbox("选择序列", options,
+                                 index=options.index(current) if current in options else 0)
+        history = store.query(series_id=series_id, limit=500)
+        if len(history) > 1:
+            st.plotly_chart(create_history_chart(history), use_container_width=True)
+        columns = {'created_at': '检验时间', 'n_obs': '数据点数量', 'start_time': '开始时间',
+                   'end_time': '结束时间', 'overall_conclusion': '综合结论', 'is_stationary': '是否平稳',
+                   'adf_p_value': 'ADF p值', 'kpss_p_value': 'KPSS p值',
+                   'ljung_box_p_value': 'Ljung-Box p值', 'wall_time': '耗时(秒)', 'params': '参数'}
+        st.dataframe(history[list(columns)].rename(columns=columns),
+                     use_container_width=True, hide_index=True)
+
+def clear_batch_results():
+    """清除分组分析和多列分析的结果"""
+    st.session_state.group_results = None
+    st.session_state.group_source = None
+    st.session_state.column_results = None
+    st.session_state.column_results_kind = 'columns'
+    st.session_state.selected_column = None
+    st.session_state.file_report = None
+
+def select_column(name: str):
+    """将多列分析中的一列设为当前序列，直接使用已缓存的检验结果"""
+    column_results = st.session_state.column_results
+    result = column_results['results'][name]
+    st.session_state.data = column_results['series'][name]
+    st.session_state.analysis_results = None if 'error' in result else result
+    st.session_state.analysis_job_key = None
+    st.session_state.selected_column = name
+
+def render_column_results():
+    """显示多列分析的结果热力图和结果表，切换查看的列时不重新计算"""
+    column_results = st.session_state.column_results
+    summary = column_results['summary']
+    names = summary['entity'].tolist()
+    
+    title, count_label, stationary_label, selector_label = \
+        BATCH_LABELS[st.session_state.get('column_results_kind', 'columns')]
+    
+    st.header(title)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(count_label, f"{column_results['n_groups']:,}")
+    with col2:
+        st.metric(stationary_label, f"{column_results['n_stationary']:,}")
+    with col3:
+        st.metric("检验失败", f"{column_results['n_failed']:,}")
+    
+    selected = st.session_state.get('selected_column')
+    st.selectbox(
+        selector_label, names,
+        index=names.index(selected) if selected in names else 0,
+        key='column_selector',
+        on_change=lambda: select_column(st.session_state.column_selector),
+        help="只渲染所选列的详细图表"
+    )
+    
+    st.plotly_chart(create_p_value_heatmap(summary, highlight=st.session_state.get('selected_column')),
+                    use_container_width=True)
+    
+    with st.expander("📋 结果表"):
+        p_value_format = st.column_config.NumberColumn(format="%.4f")
+        st.dataframe(
+            summary.rename(columns=GROUP_LABELS),
+            use_container_width=True, hide_index=True,
+            column_config={GROUP_LABELS[col]: p_value_format
+                           for col in ('adf_statistic', 'adf_p_value', 'kpss_p_value', 'ljung_box_p_value')}
+        )
+
+def render_group_results():
+    """显示分组分析的逐实体结果表，可选择实体载入为当前序列"""
+    group_results = st.session_state.group_results
+    df, group_col, time_col, value_col, duplicates, epoch_unit = st.session_state.group_source
+    
+    st.header(f"👥 分组分析结果（{group_col}）")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("实体数量", f"{group_results['n_groups']:,}")
+    with col2:
+        st.metric("平稳实体", f"{group_results['n_stationary']:,}")
+    with col3:
+        st.metric("检验失败", f"{group_results['n_failed']:,}")
+    
+    # 点击列标题即可排序
+    summary = group_results['summary']
+    p_value_format = st.column_config.NumberColumn(format="%.4f")
+    st.dataframe(
+        summary.rename(columns=GROUP_LABELS),
+        use_container_width=True, hide_index=True,
+        column_config={GROUP_LABELS[col]: p_value_format
+                       for col in ('adf_statistic', 'adf_p_value', 'kpss_p_value', 'ljung_box_p_value')}
+    )
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        entity = st.selectbox("选择实体", summary['entity'].tolist())
+    with col2:
+        st.write("")
+        load_entity = st.button("载入该实体序列")
+    if load_entity:
+        is_valid, error_msg, ts_data = validate_time_series_data(
+            df[df[group_col] == entity], time_col, value_col,
+            duplicates=duplicates, epoch_unit=epoch_unit
+        )
+        if is_valid:
+            st.session_state.data = ts_data.rename(f"{value_col} ({entity})")
+            st.session_state.analysis_results = None
+            st.session_state.analysis_job_key = None
+            st.rerun()
+        else:
+            st.error(f"数据验证失败: {error_msg}")
+
 def main():
     """主应用函数"""
     
@@ -94,8 +579,15 @@ def main():
         st.session_state.data = None
     if 'analysis_results' not in st.session_state:
         st.session_state.analysis_results = None
+    if 'analysis_job_key' not in st.session_state:
+        st.session_state.analysis_job_key = None
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
     if 'visualizer' not in st.session_state:
         st.session_state.visualizer = TimeSeriesVisualizer()
+    if 'artifacts' not in st.session_state:
+        st.session_state.artifacts = ArtifactStore(registry=get_artifact_registry())
+    artifacts = st.session_state.artifacts
     
     # 侧边栏
     with st.sidebar:
@@ -104,35 +596,212 @@ def main():
         # 数据源选择
         data_source = st.radio(
             "选择数据源",
-            ["上传文件", "使用示例数据"],
+            ["上传文件", "SQLite数据库", "使用示例数据"],
             index=0
         )
         
         # 数据加载
         if data_source == "上传文件":
-            uploaded_file = st.file_uploader(
-                "上传CSV或Excel文件",
-                type=['csv', 'xlsx', 'xls'],
-                help="支持CSV和Excel格式，请确保包含时间列和数值列"
-            )
+            uploaded_files = st.file_uploader(
+                "上传CSV、Excel或ZIP文件",
+                type=['csv', *EXCEL_EXTENSIONS, 'zip'],
+                accept_multiple_files=True,
+                help="支持CSV和Excel格式，可一次上传多个文件或ZIP压缩包，请确保包含时间列和数值列"
+            ) or []
+            
+            # 多个文件或压缩包使用相同的列映射并发解析，单个文件沿用原有流程
+            if len(uploaded_files) > 1 or any(file_extension(f.name) == 'zip' for f in uploaded_files):
+                render_multi_file_upload(uploaded_files)
+                uploaded_file = None
+            else:
+                uploaded_file = uploaded_files[0] if uploaded_files else None
             
             if uploaded_file is not None:
-                df = load_data_from_file(uploaded_file)
+                # 按文件内容缓存解析结果，相同文件在所有会话中只解析一次
+                content = uploaded_file.getvalue()
+                file_ext = uploaded_file.name.lower().split('.')[-1]
+                file_key = (bytes_fingerprint(content), file_ext)
+                if file_ext in EXCEL_EXTENSIONS:
+                    # Excel只读取工作表名和前几行用于选择列，分析时再只读取所需的列
+                    try:
+                        sheets = get_shared_cache().get_or_compute(
+                            'excel_sheets', file_key, lambda: list_sheets(content, file_ext)
+                        )
+                        sheet = st.selectbox("选择工作表", sheets)
+                        file_key = file_key + (sheet,)
+                        df = get_shared_cache().get_or_compute(
+                            'excel_preview', file_key, lambda: read_preview(content, sheet, file_ext)
+                        )
+                    except Exception as e:
+                        st.error(f"文件读取失败: {str(e)}")
+                        df = None
+                    
+                    def load_columns(columns):
+                        columns = list(dict.fromkeys(columns))
+                        return get_shared_cache().get_or_compute(
+                            'excel_columns', file_key + (tuple(columns),),
+                            lambda: read_excel_columns(content, sheet, columns, extension=file_ext)
+                        )
+                else:
+                    df = get_shared_cache().get_or_compute(
+                        'parsed', file_key, lambda: load_data_from_file(uploaded_file)
+                    )
+                    
+                    def load_columns(columns):
+                        return df[list(dict.fromkeys(columns))]
+                
                 if df is not None:
-                    st.success(f"文件加载成功！数据维度: {df.shape}")
+                    if file_ext in EXCEL_EXTENSIONS:
+                        st.success(f"文件加载成功！工作表 {sheet}，共 {len(df.columns)} 列")
+                    else:
+                        st.success(f"文件加载成功！数据维度: {df.shape}")
                     
                     # 列选择
                     time_col = st.selectbox("选择时间列", df.columns)
                     value_col = st.selectbox("选择数值列", df.columns)
                     
-                    if st.button("验证数据", type="primary"):
-                        is_valid, error_msg, ts_data = validate_time_series_data(df, time_col, value_col)
+                    # 长表格式数据（实体、时间、数值）按分组列拆分后逐个实体检验
+                    group_options = ["（不分组）"] + [col for col in df.columns if col not in (time_col, value_col)]
+                    group_col = st.selectbox("分组列", group_options,
+                                             help="长表格式数据按该列拆分为多个序列，并发检验每个实体")
+                    group_col = None if group_col == group_options[0] else group_col
+                    analyze_all = group_col is None and st.checkbox(
+                        "分析全部数值列", help="并发检验除时间列外的全部数值列，以热力图汇总结果"
+                    )
+                    
+                    # 数值时间列按整数时间戳解析
+                    epoch_unit = None
+                    if pd.api.types.is_numeric_dtype(df[time_col]):
+                        epoch_label = st.selectbox("时间戳单位", list(EPOCH_UNITS))
+                        epoch_unit = EPOCH_UNITS[epoch_label]
+                    duplicates_label = st.selectbox("重复时间戳处理", list(DUPLICATE_POLICIES))
+                    duplicates = DUPLICATE_POLICIES[duplicates_label]
+                    
+                    # 高频逐笔数据先聚合为K线再检验
+                    aggregation = None
+                    if group_col is None and not analyze_all and st.checkbox("聚合逐笔数据", help="将高频逐笔数据按固定周期聚合为K线后再检验"):
+                        bar = st.text_input("K线周期", value="1min", help="如 5s、1min、15min、1h")
+                        how_label = st.selectbox("聚合方式", list(AGGREGATION_LABELS))
+                        weight_col = None
+                        if AGGREGATION_LABELS[how_label] == 'vwap':
+                            weight_col = st.selectbox("权重列（成交量）", df.columns)
+                        aggregation = (bar, AGGREGATION_LABELS[how_label], weight_col)
+                    
+                    if group_col is not None:
+                        if st.button("分组分析", type="primary"):
+                            progress_bar = st.progress(0.0, text="分组检验中...")
+                            try:
+                                group_results = get_shared_cache().get_or_compute(
+                                    'grouped', (file_key, group_col, time_col, value_col, duplicates, epoch_unit),
+                                    lambda: run_grouped_analysis(load_columns([group_col, time_col, value_col]),
+                                                                 group_col, time_col, value_col,
+                                                                 duplicates, epoch_unit, progress_bar)
+                                )
+                            except Exception as e:
+                                st.error(f"分组分析失败: {str(e)}")
+                            else:
+                                clear_batch_results()
+                                st.session_state.group_results = group_results
+                                st.session_state.group_source = (load_columns([group_col, time_col, value_col]),
+                                                                 group_col, time_col, value_col,
+                                                                 duplicates, epoch_unit)
+                                st.success(f"分组分析完成！共 {group_results['n_groups']} 个实体")
+                            progress_bar.empty()
+                    elif analyze_all:
+                        if st.button("分析全部列", type="primary"):
+                            value_cols = numeric_columns(df, exclude=(time_col,))
+                            progress_bar = st.progress(0.0, text="多列检验中...")
+                            try:
+                                column_results = get_shared_cache().get_or_compute(
+                                    'columns', (file_key, time_col, tuple(value_cols), duplicates, epoch_unit),
+                                    lambda: run_column_analysis(load_columns([time_col, *value_cols]), time_col,
+                                                                value_cols, duplicates, epoch_unit, progress_bar)
+                                )
+                            except Exception as e:
+                                st.error(f"多列分析失败: {str(e)}")
+                            else:
+                                if column_results['n_groups'] == 0:
+                                    st.error("没有可分析的数值列")
+                                else:
+                                    clear_batch_results()
+                                    st.session_state.column_results = column_results
+                                    names = column_results['summary']['entity'].tolist()
+                                    select_column(value_col if value_col in names else names[0])
+                                    st.success(f"多列分析完成！共 {column_results['n_groups']} 列")
+                            progress_bar.empty()
+                    elif st.button("验证数据", type="primary"):
+                        needed = [time_col, value_col]
+                        if aggregation is not None and aggregation[2] is not None:
+                            needed.append(aggregation[2])
+                        is_valid, error_msg, ts_data = get_shared_cache().get_or_compute(
+                            'validated', (file_key, time_col, value_col, duplicates, epoch_unit, aggregation),
+                            lambda: validate_upload(load_columns, needed, time_col, value_col,
+                                                    duplicates, epoch_unit, aggregation,
+                                                    csv_content=content if file_ext == 'csv' else None),
+                            should_cache=lambda result: result[0]
+                        )
                         if is_valid:
+                            clear_batch_results()
                             st.session_state.data = ts_data
                             st.success("数据验证成功！")
                         else:
                             st.error(f"数据验证失败: {error_msg}")
         
+        elif data_source == "SQLite数据库":
+            db_path = st.text_input("数据库路径", help=f"数据目录 {DATA_DIR} 中的SQLite数据库文件路径")
+            
+            if db_path:
+                # 同一会话中对同一数据库的查询复用连接
+                sources = st.session_state.setdefault('sqlite_sources', {})
+                try:
+                    db_path = resolve_data_path(db_path)
+                    if db_path not in sources:
+                        sources[db_path] = SQLiteSource(db_path)
+                    source = sources[db_path]
+                    tables = source.list_tables()
+                except Exception as e:
+                    sources.pop(db_path, None)
+                    st.error(f"无法打开数据库: {str(e)}")
+                    tables = []
+                
+                if tables:
+                    table = st.selectbox("选择表", tables)
+                    columns = source.list_columns(table)
+                    column_names = [column['name'] for column in columns]
+                    time_col = st.selectbox("选择时间列", column_names)
+                    value_col = st.selectbox("选择数值列", column_names)
+                    
+                    epoch_unit = None
+                    if next(column for column in columns if column['name'] == time_col)['affinity'] \
+                            in ('INTEGER', 'REAL', 'NUMERIC'):
+                        epoch_label = st.selectbox("时间戳单位", list(EPOCH_UNITS))
+                        epoch_unit = EPOCH_UNITS[epoch_label]
+                    duplicates_label = st.selectbox("重复时间戳处理", list(DUPLICATE_POLICIES))
+                    duplicates = DUPLICATE_POLICIES[duplicates_label]
+                    
+                    # 时间范围在数据库中过滤，留空表示不限制
+                    first, last = source.time_range(table, time_col)
+                    st.caption(f"时间列范围: {first} ~ {last}")
+                    start = st.text_input("开始时间", help="如 2023-01-01，留空表示不限制")
+                    end = st.text_input("结束时间", help="如 2023-12-31 23:59:59，留空表示不限制")
+                    
+                    if st.button("读取数据", type="primary"):
+                        try:
+                            df = source.read(table, [time_col, value_col], time_col=time_col,
+                                             start=start or None, end=end or None, epoch_unit=epoch_unit)
+                        except Exception as e:
+                            st.error(f"数据读取失败: {str(e)}")
+                        else:
+                            is_valid, error_msg, ts_data = validate_time_series_data(
+                                df, time_col, value_col, duplicates=duplicates, epoch_unit=epoch_unit
+                            )
+                            if is_valid:
+                                clear_batch_results()
+                                st.session_state.data = ts_data
+                                st.success(f"数据读取成功！共 {len(ts_data):,} 个数据点")
+                            else:
+                                st.error(f"数据验证失败: {error_msg}")
+        
         else:  # 使用示例数据
             sample_data = create_sample_data()
             st.info("使用内置示例数据集")
@@ -153,6 +822,7 @@ def main():
                     index=sample_data['date'],
                     name=selected_series
                 )
+                clear_batch_results()
                 st.session_state.data = ts_data
                 st.success(f"示例数据加载成功：{selected_series}")
         
@@ -160,14 +830,61 @@ def main():
         if st.session_state.data is not None:
             st.subheader("📊 分析选项")
             
+            record_timings = st.checkbox("记录性能数据", value=False,
+                                         help="记录各检验及其阶段的耗时、CPU时间和峰值内存")
+            
+            figure_budget_mb = st.number_input(
+                "单个图表大小上限 (MB)", min_value=0.0, value=2.0, step=0.5,
+                help="图表序列化后超过该大小时自动抽稀折线数据，0 表示不限制"
+            )
+            st.session_state.visualizer.figure_budget = (
+                int(figure_budget_mb * 1024 * 1024) if figure_budget_mb > 0 else None
+            )
+            
+            reuse_history = st.checkbox("复用历史结果", value=True,
+                                        help="结果数据库中已有相同数据和参数的检验记录时直接使用，不重新计算")
+            
             if st.button("开始分析", type="primary"):
-                with st.spinner("正在进行平稳性分析..."):
-                    analyzer = StationarityAnalyzer(st.session_state.data)
-                    results = analyzer.comprehensive_test()
-                    st.session_state.analysis_results = results
-                st.success("分析完成！")
+                # 其他会话已分析过相同数据时直接使用共享结果，其次使用历史记录，否则提交到后台任务队列
+                key = AnalysisJobManager.make_key(st.session_state.data, record_timings)
+                cached_results = get_shared_cache().get('analysis', key)
+                store = get_results_store()
+                if cached_results is None and reuse_history and store is not None:
+                    stored_results = store.lookup(key[0], params={'record_timings': record_timings})
+                    if stored_results is not None:
+                        cached_results = get_shared_cache().put('analysis', key, stored_results)
+                        st.info("已使用历史记录中的检验结果")
+                if cached_results is not None:
+                    st.session_state.analysis_results = cached_results
+                    st.session_state.analysis_job_key = None
+                else:
+                    job = get_job_manager().submit(st.session_state.data, record_timings=record_timings,
+                                                   subscriber=st.session_state.session_id)
+                    st.session_state.analysis_job_key = job.key
+                    st.session_state.analysis_results = None
+        
+        # 会话内存占用
+        if st.session_state.data is not None and artifacts.get('data') is not st.session_state.data:
+            artifacts.put('data', st.session_state.data)
+        store_stats = artifacts.stats()
+        st.caption(f"会话缓存: {store_stats['memory_bytes'] / 1024 / 1024:.1f} MB / "
+                   f"{store_stats['session_budget'] / 1024 / 1024:.0f} MB")
+        
+        shared_stats = get_shared_cache().stats()
+        hits = sum(item['hits'] for item in shared_stats['namespaces'].values())
+        lookups = hits + sum(item['misses'] for item in shared_stats['namespaces'].values())
+        if lookups:
+            st.caption(f"共享缓存: {shared_stats['total_bytes'] / 1024 / 1024:.1f} MB, "
+                       f"{shared_stats['entries']} 项, 命中率 {hits / lookups:.0%}")
     
     # 主内容区域
+    if st.session_state.get('file_report') is not None:
+        render_file_report()
+    if st.session_state.get('group_results') is not None:
+        render_group_results()
+    if st.session_state.get('column_results') is not None:
+        render_column_results()
+    
     if st.session_state.data is not None:
         # 数据概览
         st.header("📋 数据概览")
@@ -182,8 +899,40 @@ def main():
             st.metric("开始日期", data_summary['start_date'].strftime('%Y-%m-%d') if data_summary['start_date'] else "N/A")
         with col3:
             st.metric("结束日期", data_summary['end_date'].strftime('%Y-%m-%d') if data_summary['end_date'] else "N/A")
+        frequency = data_summary['frequency_analysis']
         with col4:
-            st.metric("数据频率", data_summary['frequency'])
+            st.metric("数据频率", f"{data_summary['frequency']} ({frequency['freq']})"
+                      if frequency['freq'] else data_summary['frequency'])
+        
+        # 采样间隔检查：存在缺口或不规则间隔时可规整为等间隔序列后再检验
+        if frequency['step'] is not None and not frequency['is_regular']:
+            issues = []
+            if frequency['n_gaps']:
+                issues.append(f"{frequency['n_gaps']:,} 处缺口（约缺失 {frequency['missing_points']:,} 个点，"
+                              f"最长 {frequency['largest_gap']}）")
+            if frequency['n_irregular']:
+                issues.append(f"{frequency['n_irregular']:,} 段不规则间隔")
+            if frequency['n_duplicates']:
+                issues.append(f"{frequency['n_duplicates']:,} 个重复时间戳")
+            st.warning(f"序列不是等间隔采样（主导间隔 {frequency['freq']}，"
+                       f"占全部间隔的 {frequency['regularity']:.1%}）：" + "，".join(issues))
+            
+            with st.expander("🕳️ 缺口与不规则区间", expanded=False):
+                if frequency['n_gaps']:
+                    st.markdown("**缺口**")
+                    st.dataframe(frequency['gaps'], use_container_width=True)
+                if frequency['n_irregular']:
+                    st.markdown("**不规则区间**")
+                    st.dataframe(frequency['irregular_spans'], use_container_width=True)
+                
+                fill_label = st.selectbox("缺失值填充方式", list(FILL_LABELS))
+                if st.button("规整为等间隔序列"):
+                    st.session_state.data = regularize_series(
+                        st.session_state.data, fill=FILL_LABELS[fill_label], frequency=frequency
+                    )
+                    st.session_state.analysis_results = None
+                    st.session_state.analysis_job_key = None
+                    st.rerun()
         
         # 基本统计信息
         with st.expander("📊 基本统计信息", expanded=False):
@@ -222,6 +971,12 @@ def main():
                 st.session_state.data, window=window_size
             )
             st.plotly_chart(fig_rolling, use_container_width=True)
+            
+            if st.checkbox("显示滚动方差比与均值漂移诊断"):
+                fig_diag = st.session_state.visualizer.plot_rolling_diagnostics(
+                    st.session_state.data, window=window_size
+                )
+                st.plotly_chart(fig_diag, use_container_width=True)
         
         with viz_tabs[2]:
             lags = st.slider("滞后期数", 10, 100, 40)
@@ -231,9 +986,39 @@ def main():
             st.plotly_chart(fig_acf_pacf, use_container_width=True)
         
         with viz_tabs[3]:
-            fig_decomp = st.session_state.visualizer.plot_decomposition(st.session_state.data)
+            candidates = st.session_state.visualizer.detect_periods(st.session_state.data)
+            candidate_periods = [item['period'] for item in candidates]
+            
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                if candidate_periods:
+                    selected_periods = st.multiselect(
+                        "季节周期（自动检测，按显著性排序）",
+                        candidate_periods,
+                        default=candidate_periods[:1],
+                        help="选择多个周期时使用MSTL分解"
+                    )
+                else:
+                    st.info("未检测到明显的季节周期，使用默认周期进行分解")
+                    selected_periods = []
+            with col2:
+                decomp_methods = {"自动": "auto", "经典分解": "classical", "STL": "stl", "MSTL": "mstl"}
+                decomp_method = st.selectbox("分解方法", list(decomp_methods.keys()))
+            
+            fig_decomp = st.session_state.visualizer.plot_decomposition(
+                st.session_state.data,
+                periods=selected_periods or None,
+                method=decomp_methods[decomp_method]
+            )
             st.plotly_chart(fig_decomp, use_container_width=True)
         
+        render_figure_metrics(st.session_state.visualizer.figure_metrics)
+        
+        # 后台分析进度
+        if st.session_state.analysis_job_key is not None:
+            st.header("🔍 平稳性检验结果")
+            render_job_progress()
+        
         # 平稳性检验结果
         if st.session_state.analysis_results is not None:
             st.header("🔍 平稳性检验结果")
@@ -308,6 +1093,10 @@ def main():
                     st.write(f"**结论**: {ljung_result.get('conclusion', '未知')}")
                 else:
                     st.error(ljung_result.get('error', '检验失败'))
+            
+            # 性能数据
+            if 'timings' in st.session_state.analysis_results:
+                render_performance_panel(st.session_state.analysis_results['timings'])
         
         # 差分处理
         st.header("🔄 差分处理")
@@ -315,24 +1104,70 @@ def main():
         col1, col2 = st.columns([1, 3])
         
         with col1:
-            diff_order = st.selectbox("差分阶数", [1, 2], index=0)
+            transform_options = {
+                "对数变换": "log",
+                "Box-Cox变换": "box_cox",
+                "去趋势": "detrend",
+                "季节差分": "seasonal_difference"
+            }
+            selected_transforms = st.multiselect(
+                "预处理变换", list(transform_options.keys()),
+                help="按选择顺序在差分之前依次执行，中间结果会被缓存复用"
+            )
+            diff_order = st.selectbox(
+                "差分阶数", ["自动", 0, 1, 2], index=0,
+                help="自动：逐阶差分直到综合检验判定为平稳"
+            )
+            seasonal_period = st.number_input(
+                "季节周期（0表示不做季节差分）", min_value=0, value=0, step=1
+            )
             
             if st.button("执行差分", type="secondary"):
-                analyzer = StationarityAnalyzer(st.session_state.data)
-                differenced_data = analyzer.difference_series(order=diff_order)
-                
-                # 对差分后的数据进行分析
-                diff_analyzer = StationarityAnalyzer(differenced_data)
-                diff_results = diff_analyzer.comprehensive_test()
+                # 构建变换流水线（仅记录步骤，检验时才求值）
+                # 中间结果缓存按会话隔离
+                if 'transform_cache' not in st.session_state:
+                    st.session_state.transform_cache = TransformCache()
+                pipeline = TransformPipeline(st.session_state.data, cache=st.session_state.transform_cache)
+                for name in selected_transforms:
+                    step = transform_options[name]
+                    if step == "seasonal_difference":
+                        pipeline = pipeline.seasonal_difference(int(seasonal_period))
+                    else:
+                        pipeline = getattr(pipeline, step)()
                 
-                # 存储差分结果
-                st.session_state.differenced_data = differenced_data
-                st.session_state.diff_results = diff_results
-                st.session_state.diff_order = diff_order
+                try:
+                    if "季节差分" in selected_transforms and seasonal_period < 2:
+                        raise ValueError("季节差分需要设置大于1的季节周期")
+                    
+                    if diff_order == "自动":
+                        use_seasonal = seasonal_period > 1 and "季节差分" not in selected_transforms
+                        search = find_difference_order(
+                            pipeline.evaluate(),
+                            seasonal_period=int(seasonal_period) if use_seasonal else None,
+                            initial_result=st.session_state.analysis_results if not pipeline.steps else None
+                        )
+                        for i in range(search['seasonal_order']):
+                            pipeline = pipeline.seasonal_difference(int(seasonal_period))
+                        pipeline = pipeline.difference(search['order'])
+                        diff_results = search['result']
+                        st.session_state.diff_search = search
+                    else:
+                        pipeline = pipeline.difference(diff_order)
+                        diff_results = pipeline.analyze()
+                        st.session_state.diff_search = None
+                    
+                    # 存储差分结果（超出内存预算时丢弃，需要时由流水线重新求值）；
+                    # 最终结果只由产物存储持有，变换缓存不再引用它，淘汰后内存才能真正释放
+                    evaluate = functools.partial(pipeline.evaluate, cache_result=False)
+                    artifacts.put('differenced_data', evaluate(), recompute=evaluate)
+                    st.session_state.diff_results = diff_results
+                    st.session_state.diff_pipeline = pipeline
+                except Exception as e:
+                    st.error(f"变换失败: {str(e)}")
         
         with col2:
-            if hasattr(st.session_state, 'differenced_data'):
-                st.success(f"已执行{st.session_state.diff_order}阶差分")
+            if 'differenced_data' in artifacts:
+                st.success(f"已执行: {st.session_state.diff_pipeline.describe()}")
                 
                 # 显示差分后的结果
                 diff_conclusion = st.session_state.diff_results.get('overall_conclusion', '分析中...')
@@ -342,13 +1177,28 @@ def main():
                     st.success(f"差分后结论: {diff_conclusion}")
                 else:
                     st.warning(f"差分后结论: {diff_conclusion}")
+                
+                # 自动搜索时展示每一阶的检验结果
+                if st.session_state.get('diff_search'):
+                    order_table = pd.DataFrame([
+                        {
+                            '季节差分阶数': item['seasonal_order'],
+                            '差分阶数': item['order'],
+                            '数据点数量': item['n_obs'],
+                            'ADF p值': item['adf_p_value'],
+                            'KPSS p值': item['kpss_p_value'],
+                            '综合结论': item['overall_conclusion']
+                        }
+                        for item in st.session_state.diff_search['order_results']
+                    ])
+                    st.dataframe(order_table, use_container_width=True, hide_index=True)
         
         # 差分对比图
-        if hasattr(st.session_state, 'differenced_data'):
+        if 'differenced_data' in artifacts:
             fig_compare = st.session_state.visualizer.compare_series(
                 st.session_state.data,
-                st.session_state.differenced_data,
-                labels=("原始序列", f"{st.session_state.diff_order}阶差分序列")
+                artifacts.get('differenced_data'),
+                labels=("原始序列", f"变换后序列（{st.session_state.diff_pipeline.describe()}）")
             )
             st.plotly_chart(fig_compare, use_container_width=True)
         
@@ -361,36 +1211,48 @@ def main():
             with col1:
                 if st.button("生成报告", type="secondary"):
                     data_info = get_data_summary(st.session_state.data)
-                    report_text = generate_analysis_report(st.session_state.analysis_results, data_info)
-                    st.session_state.report = report_text
+                    make_report = functools.partial(
+                        generate_analysis_report, st.session_state.analysis_results, data_info
+                    )
+                    artifacts.put('report', make_report(), recompute=make_report)
             
             with col2:
-                if st.button("导出CSV", type="secondary"):
-                    csv_data = export_results_to_csv(st.session_state.data, st.session_state.analysis_results)
-                    st.session_state.csv_export = csv_data
+                export_format = st.selectbox("导出格式", list(EXPORT_FORMATS), key="export_format")
+                if st.button("导出数据", type="secondary"):
+                    extension, mime = EXPORT_FORMATS[export_format]
+                    # 分块直接写入会话存储管理的文件，不在内存中构建完整的导出内容
+                    path = export_results_to_file(
+                        st.session_state.data, st.session_state.analysis_results,
+                        artifacts.file_path('export', f".{extension}"), file_format=extension
+                    )
+                    artifacts.put('export_file', {'path': path, 'format': export_format,
+                                                 'extension': extension, 'mime': mime})
             
             # 显示报告
-            if hasattr(st.session_state, 'report'):
+            if 'report' in artifacts:
+                report_text = artifacts.get('report')
                 st.download_button(
                     label="下载Markdown报告",
-                    data=st.session_state.report,
+                    data=report_text,
                     file_name=f"stationarity_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
                     mime="text/markdown"
                 )
                 
                 with st.expander("预览报告", expanded=False):
-                    st.markdown(st.session_state.report)
+                    st.markdown(report_text)
             
-            # CSV下载
-            if hasattr(st.session_state, 'csv_export'):
+            # 导出文件下载
+            export_file = artifacts.get('export_file')
+            if export_file is not None and os.path.exists(export_file['path']):
+                read_export = functools.partial(_read_file, export_file['path'])
                 st.download_button(
-                    label="下载CSV数据",
-                    data=st.session_state.csv_export,
-                    file_name=f"stationarity_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
+                    label=f"下载{export_file['format']}数据",
+                    data=read_export if DEFERRED_DOWNLOAD_SUPPORTED else read_export(),
+                    file_name=f"stationarity_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_file['extension']}",
+                    mime=export_file['mime']
                 )
     
-    else:
+    elif st.session_state.get('group_results') is None:
         # 欢迎页面
         st.info("👆 请从左侧面板上传数据文件或选择示例数据开始分析")
         
@@ -400,7 +1262,7 @@ def main():
         features = [
             ("📊 自动化平稳性检验", "支持ADF、KPSS、Ljung-Box等多种检验方法"),
             ("📈 交互式可视化", "时间序列图、ACF/PACF图、分布图等多种图表"),
-            ("🔄 差分处理", "一阶、二阶差分处理和实时结果展示"),
+            ("🔄 差分处理", "对数、Box-Cox、去趋势、季节差分与差分的组合变换，支持自动选择差分阶数"),
             ("📋 报告生成", "自动生成详细的分析报告，支持下载"),
             ("🎯 用户友好", "直观的Web界面，支持多种文件格式")
         ]
@@ -436,8 +1298,15 @@ def main():
             
             6. **导出结果**
                - 生成并下载分析报告
-               - 导出CSV格式的详细数据
+               - 导出CSV或Parquet格式的详细数据
             """)
+    
+    render_history()
+    
+    # 不支持局部刷新时，任务运行期间定期整体刷新页面
+    if st.session_state.analysis_job_key is not None and not hasattr(st, 'fragment'):
+        time.sleep(1.0)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
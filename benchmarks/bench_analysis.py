@@ -0,0 +1,369 @@
+"""
+分析热点性能基准
+对平稳性检验、ACF/PACF、差分以及可视化图表构建进行基准测试，
+记录耗时、峰值内存和吞吐量到JSON，并支持与基线结果对比以发现性能回退。
+
+用法:
+    python benchmarks/bench_analysis.py run --output bench.json
+    python benchmarks/bench_analysis.py run --lengths 100 1000 10000 --lags 10 40
+    python benchmarks/bench_analysis.py compare baseline.json bench.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from time_series_stationarity_analyzer.stationarity import StationarityAnalyzer, calculate_acf_pacf
+from time_series_stationarity_analyzer.visualization import (
+    TimeSeriesVisualizer, create_test_report_chart, FIGURE_METRICS
+)
+
+DEFAULT_LENGTHS = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_LAGS = [10, 40]
+
+
+def make_synthetic_series(n: int, kind: str = 'random_walk', seed: int = 42) -> pd.Series:
+    """
+    生成与 create_sample_data 形态一致的合成序列
+    
+    为支持千万级长度，索引使用分钟频率而非日频率
+    
+    Args:
+        n: 序列长度
+        kind: 序列类型 ('trend_series', 'stationary_series', 'seasonal_series', 'random_walk')
+        seed: 随机种子
+    
+    Returns:
+        合成的时间序列
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start='2020-01-01', periods=n, freq='min')
+    t = np.arange(n)
+    
+    if kind == 'trend_series':
+        values = np.linspace(100, 200, n) + rng.normal(0, 10, n)
+    elif kind == 'stationary_series':
+        values = rng.normal(50, 5, n)
+    elif kind == 'seasonal_series':
+        values = 100 + 20 * np.sin(2 * np.pi * t / 365.25) + rng.normal(0, 5, n)
+    elif kind == 'random_walk':
+        values = np.cumsum(rng.normal(0, 1, n)) + 100
+    else:
+        raise ValueError(f"未知的序列类型: {kind}")
+    
+    return pd.Series(values, index=index, name=kind)
+
+
+def _prepare_adf(data: pd.Series, lags: int) -> Callable[[], Any]:
+    analyzer = StationarityAnalyzer(data)
+    return lambda: analyzer.adf_test(maxlag=lags)
+
+
+def _prepare_kpss(data: pd.Series, lags: int) -> Callable[[], Any]:
+    analyzer = StationarityAnalyzer(data)
+    return lambda: analyzer.kpss_test(nlags=lags)
+
+
+def _prepare_ljung_box(data: pd.Series, lags: int) -> Callable[[], Any]:
+    analyzer = StationarityAnalyzer(data)
+    return lambda: analyzer.ljung_box_test(lags=lags)
+
+
+def _prepare_acf_pacf(data: pd.Series, lags: int) -> Callable[[], Any]:
+    return lambda: calculate_acf_pacf(data, lags=lags)
+
+
+def _prepare_difference(data: pd.Series, lags: Optional[int]) -> Callable[[], Any]:
+    # difference_series 会缓存低阶结果，因此每次调用都使用新的分析器
+    return lambda: StationarityAnalyzer(data).difference_series(order=2)
+
+
+def _prepare_figure(method: str, **kwargs) -> Callable[[pd.Series, Optional[int]], Callable[[], Any]]:
+    """构造图表基准的准备函数；每次调用使用新的可视化器，避免命中其内部缓存"""
+    def prepare(data: pd.Series, lags: Optional[int]) -> Callable[[], Any]:
+        call_kwargs = dict(kwargs)
+        if lags is not None:
+            call_kwargs['lags'] = lags
+        return lambda: getattr(TimeSeriesVisualizer(), method)(data, **call_kwargs)
+    return prepare
+
+
+def _prepare_compare_series(data: pd.Series, lags: Optional[int]) -> Callable[[], Any]:
+    differenced = data.diff().dropna()
+    return lambda: TimeSeriesVisualizer().compare_series(data, differenced)
+
+
+def _prepare_report_chart(data: pd.Series, lags: Optional[int]) -> Callable[[], Any]:
+    results = StationarityAnalyzer(data).comprehensive_test()
+    return lambda: create_test_report_chart(results)
+
+
+# 基准用例：名称 -> (准备函数, 最大长度, 是否使用滞后参数)
+# 准备函数接收 (序列, 滞后期数)，在计时之外完成准备工作，返回待计时的无参函数
+BENCHMARKS: Dict[str, tuple] = {
+    'adf_test': (_prepare_adf, 100_000, True),
+    'kpss_test': (_prepare_kpss, 10_000_000, True),
+    'ljung_box_test': (_prepare_ljung_box, 10_000_000, True),
+    'calculate_acf_pacf': (_prepare_acf_pacf, 1_000_000, True),
+    'difference_series': (_prepare_difference, 10_000_000, False),
+    'plot_time_series': (_prepare_figure('plot_time_series'), 1_000_000, False),
+    'plot_distribution': (_prepare_figure('plot_distribution'), 1_000_000, False),
+    'plot_rolling_statistics': (_prepare_figure('plot_rolling_statistics', window=12), 1_000_000, False),
+    'plot_acf_pacf': (_prepare_figure('plot_acf_pacf'), 1_000_000, True),
+    'plot_decomposition': (_prepare_figure('plot_decomposition', periods=[365]), 1_000_000, False),
+    'compare_series': (_prepare_compare_series, 1_000_000, False),
+    'create_test_report_chart': (_prepare_report_chart, 10_000, False),
+}
+
+
+def _time_call(func: Callable[[], Any], repeats: int, min_time: float) -> List[float]:
+    """多次调用并返回每次的耗时；单次耗时超过 min_time 时不再重复"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        if timings[-1] > min_time:
+            break
+    return timings
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    """使用tracemalloc测量单次调用的峰值内存（字节）"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(names: List[str], lengths: List[int], lags_list: List[int],
+                   kind: str = 'random_walk', repeats: int = 5, min_time: float = 1.0,
+                   measure_memory: bool = True, ignore_caps: bool = False) -> Dict[str, Any]:
+    """
+    运行基准测试
+    
+    Args:
+        names: 基准用例名称
+        lengths: 序列长度列表
+        lags_list: 滞后期数列表
+        kind: 合成序列类型
+        repeats: 最多重复次数
+        min_time: 单次耗时超过该值（秒）时不再重复
+        measure_memory: 是否测量峰值内存
+        ignore_caps: 是否忽略各用例的最大长度限制
+    
+    Returns:
+        包含环境信息和结果列表的字典
+    """
+    results = []
+    for n in lengths:
+        data = make_synthetic_series(n, kind)
+        for name in names:
+            prepare, max_length, uses_lags = BENCHMARKS[name]
+            for lags in (lags_list if uses_lags else [None]):
+                record: Dict[str, Any] = {'name': name, 'length': n, 'lags': lags}
+                if n > max_length and not ignore_caps:
+                    record['status'] = 'skipped'
+                    results.append(record)
+                    continue
+                try:
+                    func = prepare(data, lags)
+                    FIGURE_METRICS.clear()
+                    timings = _time_call(func, repeats, min_time)
+                    wall_time = statistics.median(timings)
+                    record.update({
+                        'status': 'ok',
+                        'wall_time': wall_time,
+                        'min_wall_time': min(timings),
+                        'repeats': len(timings),
+                        'throughput': n / wall_time if wall_time > 0 else None,
+                        'peak_memory': _peak_memory(func) if measure_memory else None
+                    })
+                    if FIGURE_METRICS:
+                        metrics = FIGURE_METRICS[-1]
+                        record.update({
+                            'figure_bytes': metrics['bytes'],
+                            'figure_original_bytes': metrics['original_bytes'],
+                            'figure_points': metrics['points'],
+                            'figure_decimated': metrics['decimated']
+                        })
+                except Exception as e:
+                    record.update({'status': 'error', 'error': str(e)})
+                results.append(record)
+                _print_record(record)
+    
+    return {
+        'metadata': _environment_info(kind),
+        'results': results
+    }
+
+
+def _environment_info(kind: str) -> Dict[str, Any]:
+    """收集运行环境信息"""
+    import scipy
+    import statsmodels
+    import plotly
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scipy': scipy.__version__,
+        'statsmodels': statsmodels.__version__,
+        'plotly': plotly.__version__,
+        'series_kind': kind
+    }
+
+
+def _format_bytes(size: Optional[float]) -> str:
+    """格式化字节数"""
+    if size is None:
+        return 'N/A'
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def _print_record(record: Dict[str, Any]) -> None:
+    """打印单条结果"""
+    label = f"{record['name']:<26} n={record['length']:<10} lags={str(record['lags']):<5}"
+    if record['status'] == 'ok':
+        line = (f"{label} {record['wall_time'] * 1000:>12.2f} ms  "
+                f"{record['throughput']:>14,.0f} pts/s  {_format_bytes(record['peak_memory']):>10}")
+        if 'figure_bytes' in record:
+            line += f"  figure {_format_bytes(record['figure_bytes']):>10}"
+            if record['figure_decimated']:
+                line += f" (decimated from {_format_bytes(record['figure_original_bytes'])})"
+        print(line)
+    else:
+        print(f"{label} {record['status']}: {record.get('error', '')}")
+
+
+def _result_key(record: Dict[str, Any]) -> tuple:
+    return (record['name'], record['length'], record['lags'])
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.2, min_wall_time: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    对比两次基准结果
+    
+    Args:
+        baseline: 基线结果
+        current: 当前结果
+        threshold: 相对变化超过该比例视为回退
+        min_wall_time: 基线耗时低于该值（秒）时不判断耗时回退，避免计时噪声
+    
+    Returns:
+        对比记录列表，regression 为 True 表示出现回退
+    """
+    baseline_map = {
+        _result_key(r): r for r in baseline['results'] if r.get('status') == 'ok'
+    }
+    comparisons = []
+    for record in current['results']:
+        if record.get('status') != 'ok' or _result_key(record) not in baseline_map:
+            continue
+        base = baseline_map[_result_key(record)]
+        time_ratio = record['wall_time'] / base['wall_time'] if base['wall_time'] else None
+        memory_ratio = None
+        if record.get('peak_memory') and base.get('peak_memory'):
+            memory_ratio = record['peak_memory'] / base['peak_memory']
+        size_ratio = None
+        if record.get('figure_bytes') and base.get('figure_bytes'):
+            size_ratio = record['figure_bytes'] / base['figure_bytes']
+        
+        regression = bool(
+            (time_ratio is not None and base['wall_time'] >= min_wall_time
+             and time_ratio > 1 + threshold)
+            or (memory_ratio is not None and memory_ratio > 1 + threshold)
+            or (size_ratio is not None and size_ratio > 1 + threshold)
+        )
+        comparisons.append({
+            'name': record['name'],
+            'length': record['length'],
+            'lags': record['lags'],
+            'time_ratio': time_ratio,
+            'memory_ratio': memory_ratio,
+            'size_ratio': size_ratio,
+            'regression': regression
+        })
+    return comparisons
+
+
+def _print_comparisons(comparisons: List[Dict[str, Any]]) -> None:
+    """打印对比结果"""
+    for item in comparisons:
+        flag = 'REGRESSION' if item['regression'] else 'ok'
+        time_text = f"{item['time_ratio']:.2f}x" if item['time_ratio'] is not None else 'N/A'
+        memory_text = f"{item['memory_ratio']:.2f}x" if item['memory_ratio'] is not None else 'N/A'
+        size_ratio = item.get('size_ratio')
+        size_text = f"{size_ratio:.2f}x" if size_ratio is not None else 'N/A'
+        print(f"{item['name']:<26} n={item['length']:<10} lags={str(item['lags']):<5} "
+              f"time {time_text:>8}  memory {memory_text:>8}  figure {size_text:>8}  {flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="时间序列平稳性分析器性能基准")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = subparsers.add_parser('run', help="运行基准测试")
+    run_parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    run_parser.add_argument('--lengths', nargs='+', type=int, default=DEFAULT_LENGTHS)
+    run_parser.add_argument('--lags', nargs='+', type=int, default=DEFAULT_LAGS)
+    run_parser.add_argument('--kind', default='random_walk',
+                            choices=['trend_series', 'stationary_series', 'seasonal_series', 'random_walk'])
+    run_parser.add_argument('--repeats', type=int, default=5)
+    run_parser.add_argument('--no-memory', action='store_true', help="不测量峰值内存")
+    run_parser.add_argument('--ignore-caps', action='store_true', help="忽略各用例的最大长度限制")
+    run_parser.add_argument('--output', default='bench_results.json')
+    
+    compare_parser = subparsers.add_parser('compare', help="与基线结果对比")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.2,
+                                help="相对变化超过该比例视为回退（默认0.2即20%%）")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'run':
+        report = run_benchmarks(
+            args.benchmarks, args.lengths, args.lags, kind=args.kind,
+            repeats=args.repeats, measure_memory=not args.no_memory,
+            ignore_caps=args.ignore_caps
+        )
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}")
+        return 0
+    
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+    comparisons = compare_results(baseline, current, threshold=args.threshold)
+    _print_comparisons(comparisons)
+    regressions = [item for item in comparisons if item['regression']]
+    print(f"共对比 {len(comparisons)} 项，发现 {len(regressions)} 项回退")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
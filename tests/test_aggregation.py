@@ -0,0 +1,59 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.aggregation import (
+    AGGREGATIONS, TickAggregator, aggregate_csv, aggregate_ticks
+)
+
+
+def _ticks():
+    # 10笔数据、间隔10秒，按1分钟聚合时第一根K线跨越第3行处的分块边界
+    timestamps = pd.date_range('2024-01-01', periods=10, freq='10s')
+    values = np.arange(10, dtype=float)
+    weights = np.arange(1, 11, dtype=float)
+    return timestamps, values, weights
+
+
+@pytest.mark.parametrize('how', AGGREGATIONS)
+def test_chunked_matches_one_shot(how):
+    timestamps, values, weights = _ticks()
+    expected = aggregate_ticks(timestamps, values, '1min', how, weights)
+    
+    aggregator = TickAggregator('1min', how)
+    for chunk in (slice(0, 3), slice(3, 7), slice(7, None)):
+        aggregator.update(timestamps[chunk], values[chunk], weights[chunk])
+    chunked = aggregator.result()
+    
+    if how == 'ohlc':
+        pd.testing.assert_frame_equal(chunked, expected)
+    else:
+        pd.testing.assert_series_equal(chunked, expected)
+
+
+@pytest.mark.parametrize('how', [how for how in AGGREGATIONS if how != 'vwap'])
+def test_chunked_csv_matches_one_shot_unweighted(how):
+    timestamps, values, _ = _ticks()
+    frame = pd.DataFrame({'time': timestamps.strftime('%Y-%m-%d %H:%M:%S'), 'price': values})
+    expected = aggregate_ticks(timestamps, values, '1min', how, name='price')
+    
+    chunked = aggregate_csv(io.StringIO(frame.to_csv(index=False)), 'time', 'price', '1min',
+                            how=how, chunksize=3)
+    
+    if how == 'ohlc':
+        pd.testing.assert_frame_equal(chunked, expected, check_freq=False)
+    else:
+        pd.testing.assert_series_equal(chunked, expected, check_freq=False)
+
+
+def test_mean_and_sum_match_resample():
+    timestamps, values, _ = _ticks()
+    series = pd.Series(values, index=timestamps)
+    for how in ('mean', 'sum'):
+        aggregator = TickAggregator('1min', how)
+        aggregator.update(timestamps[:3], values[:3])
+        aggregator.update(timestamps[3:], values[3:])
+        expected = getattr(series.resample('1min'), how)()
+        np.testing.assert_allclose(aggregator.result().to_numpy(), expected.to_numpy())
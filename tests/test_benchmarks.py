@@ -0,0 +1,78 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+import bench_analysis  # noqa: E402
+from bench_analysis import compare_results, make_synthetic_series, run_benchmarks  # noqa: E402
+
+
+def _report(**records):
+    return {'results': [
+        {'name': name, 'length': 100, 'lags': None, 'status': 'ok', **values}
+        for name, values in records.items()
+    ]}
+
+
+def test_synthetic_series_shape():
+    data = make_synthetic_series(1_000, 'seasonal_series')
+    
+    assert len(data) == 1_000 and data.index.freqstr == 'min'
+    assert make_synthetic_series(10).equals(make_synthetic_series(10))
+
+
+def test_run_records_timing_memory_and_skips():
+    report = run_benchmarks(['difference_series', 'calculate_acf_pacf', 'plot_time_series'], [200],
+                            [5, 10], repeats=2, min_time=0.0)
+    # 超过最大长度的用例被跳过
+    capped = run_benchmarks(['adf_test'], [200_000], [5], measure_memory=False)
+    
+    records = report['results']
+    assert [(r['name'], r['lags']) for r in records] == [
+        ('difference_series', None), ('calculate_acf_pacf', 5), ('calculate_acf_pacf', 10), ('plot_time_series', None)
+    ]
+    assert all(r['status'] == 'ok' and r['repeats'] == 1 and r['peak_memory'] > 0 for r in records)
+    assert records[0]['throughput'] == pytest.approx(200 / records[0]['wall_time'])
+    assert records[-1]['figure_bytes'] > 0 and not records[-1]['figure_decimated']
+    assert report['metadata']['series_kind'] == 'random_walk'
+    assert capped['results'] == [{'name': 'adf_test', 'length': 200_000, 'lags': 5, 'status': 'skipped'}]
+
+
+def test_compare_flags_regressions_above_threshold():
+    baseline = _report(fast={'wall_time': 0.0001, 'peak_memory': 100},
+                       slow={'wall_time': 1.0, 'peak_memory': 100},
+                       chart={'wall_time': 1.0, 'figure_bytes': 1_000},
+                       gone={'wall_time': 1.0})
+    current = _report(fast={'wall_time': 0.001, 'peak_memory': 110},
+                      slow={'wall_time': 1.5, 'peak_memory': 100},
+                      chart={'wall_time': 1.0, 'figure_bytes': 2_000},
+                      new={'wall_time': 1.0})
+    
+    comparisons = {item['name']: item for item in compare_results(baseline, current, threshold=0.2)}
+    
+    # 基线耗时过短的用例不判断耗时回退，只对比两次都存在的用例
+    assert set(comparisons) == {'fast', 'slow', 'chart'}
+    assert not comparisons['fast']['regression'] and comparisons['fast']['time_ratio'] == pytest.approx(10)
+    assert comparisons['slow']['regression'] and comparisons['slow']['memory_ratio'] == 1
+    assert comparisons['chart']['regression'] and comparisons['chart']['size_ratio'] == 2
+
+
+def test_command_line_exit_codes(tmp_path, capsys):
+    output = tmp_path / 'bench.json'
+    
+    assert bench_analysis.main(['run', '--benchmarks', 'difference_series', '--lengths', '100',
+                                '--repeats', '1', '--no-memory', '--output', str(output)]) == 0
+    assert bench_analysis.main(['compare', str(output), str(output)]) == 0
+    
+    slower = json.loads(output.read_text(encoding='utf-8'))
+    slower['results'][0]['wall_time'] = 1.0
+    (tmp_path / 'slower.json').write_text(json.dumps(slower), encoding='utf-8')
+    baseline = json.loads(output.read_text(encoding='utf-8'))
+    baseline['results'][0]['wall_time'] = 0.01
+    (tmp_path / 'baseline.json').write_text(json.dumps(baseline), encoding='utf-8')
+    
+    assert bench_analysis.main(['compare', str(tmp_path / 'baseline.json'), str(tmp_path / 'slower.json')]) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
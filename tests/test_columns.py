@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.grouped import analyze_columns, numeric_columns, split_columns
+from time_series_stationarity_analyzer.utils import validate_time_series_data
+
+
+def _wide_frame(n=80, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, 4)), columns=['a', 'b', 'c', 'd'])
+    df['b'] = df['b'].cumsum()
+    df['time'] = pd.date_range('2024-01-01', periods=n, freq='h')
+    df['label'] = 'x'
+    df['flag'] = True
+    # 打乱行顺序，并加入缺失值、缺失时间和重复时间戳
+    df = df.sample(frac=1, random_state=1).reset_index(drop=True)
+    df.loc[[2, 7], 'c'] = np.nan
+    df.loc[4, 'time'] = pd.NaT
+    return pd.concat([df, df.iloc[[10]].assign(a=50.0)], ignore_index=True)
+
+
+def test_numeric_columns_skip_text_and_booleans():
+    assert numeric_columns(_wide_frame(), exclude=('d',)) == ['a', 'b', 'c']
+
+
+@pytest.mark.parametrize('duplicates', ['last', 'first', 'mean'])
+def test_split_matches_validation_per_column(duplicates):
+    df = _wide_frame()
+    
+    columns = split_columns(df, 'time', duplicates=duplicates)
+    
+    assert [name for name, _ in columns] == ['a', 'b', 'c', 'd']
+    for name, series in columns:
+        _, _, expected = validate_time_series_data(df, 'time', name, duplicates=duplicates)
+        pd.testing.assert_series_equal(series, expected, check_freq=False)
+
+
+def test_complete_columns_share_the_time_index():
+    df = _wide_frame().drop_duplicates('time')
+    
+    columns = dict(split_columns(df, 'time', ['a', 'b', 'c']))
+    
+    assert columns['a'].index is columns['b'].index
+    assert len(columns['c']) == len(columns['a']) - 2
+
+
+def test_split_rejects_missing_columns():
+    with pytest.raises(ValueError):
+        split_columns(_wide_frame(), 'missing')
+    with pytest.raises(ValueError):
+        split_columns(_wide_frame(), 'time', ['a', 'missing'])
+    assert split_columns(_wide_frame(), 'time', []) == []
+
+
+def test_analyze_columns_summarizes_every_column():
+    output = analyze_columns(_wide_frame(), 'time', keep_results=True)
+    
+    summary = output['summary'].set_index('entity')
+    assert output['n_groups'] == 4 and output['n_failed'] == 0
+    assert summary.loc['a', 'adf_p_value'] == output['results']['a']['adf_test']['p_value']
+    assert summary.loc['b', 'adf_p_value'] > summary.loc['a', 'adf_p_value']
+    assert summary.loc['c', 'n_obs'] == len(output['series']['c'])
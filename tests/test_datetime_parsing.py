@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.utils import (
+    _parse_fixed_width, infer_datetime_format, infer_epoch_unit, normalize_time_index,
+    parse_datetime_column
+)
+
+EPOCH_NS = 1_700_000_000_123_456_789
+
+
+def _timestamps(n=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 30 * 365 * 86_400, size=n)
+    return pd.DatetimeIndex(np.datetime64('1995-01-01') + seconds.astype('timedelta64[s]'))
+
+
+@pytest.mark.parametrize('fmt', ['%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M', '%Y%m%d', '%d.%m.%Y'])
+def test_fixed_width_parser_matches_pandas(fmt):
+    values = _timestamps().strftime(fmt).to_numpy(dtype=object)
+    
+    parsed = _parse_fixed_width(values, fmt)
+    
+    expected = pd.to_datetime(values, format=fmt)
+    np.testing.assert_array_equal(parsed, expected.to_numpy().astype('datetime64[us]'))
+
+
+@pytest.mark.parametrize('values', [
+    ['2024-02-30'], ['31/13/2024'], ['1/2/2024', '01/02/2024'], ['ab/cd/efgh'],
+])
+def test_fixed_width_parser_rejects_invalid_values(values):
+    fmt = '%Y-%m-%d' if '-' in values[0] else '%d/%m/%Y'
+    assert _parse_fixed_width(np.array(values, dtype=object), fmt) is None
+
+
+def test_format_inference_uses_day_first_evidence():
+    assert infer_datetime_format(np.array(['01/02/2024', '13/02/2024'], dtype=object)) == '%d/%m/%Y'
+    assert infer_datetime_format(np.array(['01/02/2024', '01/13/2024'], dtype=object)) == '%m/%d/%Y'
+
+
+def test_string_column_with_repeats_and_missing_values():
+    dates = _timestamps(200).strftime('%d/%m/%Y %H:%M').to_numpy(dtype=object)
+    values = np.repeat(dates, 5)
+    values[::7] = None
+    column = pd.Series(values, name='time')
+    
+    parsed = parse_datetime_column(column)
+    
+    expected = pd.to_datetime(column, format='%d/%m/%Y %H:%M')
+    assert parsed.name == 'time'
+    np.testing.assert_array_equal(parsed.to_numpy(), expected.to_numpy().astype(parsed.dtype))
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'Int64'])
+def test_nanosecond_epochs_round_trip_exactly(dtype):
+    ticks = EPOCH_NS + 1_000 * np.arange(1_000)
+    column = pd.Series(ticks, dtype=dtype)
+    
+    parsed = parse_datetime_column(column, epoch_unit='auto')
+    
+    assert parsed.nunique() == 1_000
+    np.testing.assert_array_equal(parsed.as_unit('ns').asi8, ticks)
+
+
+def test_nullable_epochs_keep_missing_values():
+    column = pd.Series([EPOCH_NS, None, EPOCH_NS + 1], dtype='Int64')
+    
+    parsed = parse_datetime_column(column, epoch_unit='ns')
+    
+    assert parsed[1] is pd.NaT
+    assert parsed[2].value - parsed[0].value == 1
+
+
+@pytest.mark.parametrize('magnitude, unit', [(1.7e9, 's'), (1.7e12, 'ms'), (1.7e15, 'us'), (1.7e18, 'ns')])
+def test_epoch_unit_inference(magnitude, unit):
+    assert infer_epoch_unit(magnitude) == unit
+    parsed = parse_datetime_column(pd.Series([int(magnitude)]), epoch_unit='auto')
+    assert parsed[0].year == 2023
+
+
+def test_float_epochs_are_converted():
+    parsed = parse_datetime_column(pd.Series([1.5, np.nan]), epoch_unit='s')
+    assert parsed[0] == pd.Timestamp('1970-01-01 00:00:01.5') and parsed[1] is pd.NaT
+
+
+@pytest.mark.parametrize('duplicates', ['last', 'first', 'mean'])
+def test_normalize_time_index_matches_groupby(duplicates):
+    index = pd.DatetimeIndex(['2024-01-03', '2024-01-01', '2024-01-02', '2024-01-01', '2024-01-03'])
+    data = pd.Series([1.0, 2.0, 3.0, 4.0, 5.0], index=index)
+    
+    result = normalize_time_index(data, duplicates=duplicates)
+    
+    expected = getattr(data.sort_index(kind='stable').groupby(level=0), duplicates)()
+    pd.testing.assert_series_equal(result, expected, check_freq=False)
+
+
+def test_normalize_time_index_leaves_clean_series_untouched():
+    data = pd.Series([1.0, 2.0], index=pd.date_range('2024-01-01', periods=2))
+    
+    assert normalize_time_index(data) is data
+    assert len(normalize_time_index(pd.concat([data, data]), duplicates='keep')) == 4
+    with pytest.raises(ValueError):
+        normalize_time_index(data, duplicates='drop')
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from time_series_stationarity_analyzer import visualization
+from time_series_stationarity_analyzer.visualization import TimeSeriesVisualizer, summarize_distribution
+
+
+def _series(n=10_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(rng.standard_t(3, size=n), name='value')
+
+
+def test_summary_matches_numpy():
+    data = _series()
+    values = data.to_numpy()
+    
+    summary = summarize_distribution(data, bins=25)
+    
+    counts, edges = np.histogram(values, bins=25)
+    np.testing.assert_array_equal(summary['counts'], counts)
+    np.testing.assert_allclose(summary['edges'], edges)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    assert (summary['q1'], summary['median'], summary['q3']) == (q1, median, q3)
+    inside = values[(values >= q1 - 1.5 * (q3 - q1)) & (values <= q3 + 1.5 * (q3 - q1))]
+    assert (summary['lower_fence'], summary['upper_fence']) == (inside.min(), inside.max())
+    assert summary['n_outliers'] == len(values) - len(inside)
+    assert summary['count'] == len(values)
+
+
+def test_outliers_are_subsampled_keeping_extremes():
+    data = _series()
+    
+    summary = summarize_distribution(data, max_outliers=10)
+    
+    assert summary['n_outliers'] > 10 and len(summary['outliers']) == 10
+    assert summary['outliers'][0] == data.min() and summary['outliers'][-1] == data.max()
+
+
+def test_missing_and_infinite_values_are_ignored():
+    data = pd.Series([1.0, 2.0, np.nan, np.inf, 3.0])
+    assert summarize_distribution(data)['count'] == 3
+    assert summarize_distribution(pd.Series([np.nan]))['count'] == 0
+
+
+def test_figure_size_does_not_grow_with_series_length():
+    visualizer = TimeSeriesVisualizer()
+    
+    small = visualizer.plot_distribution(_series(n=1_000), bins=20, max_outliers=50)
+    large = visualizer.plot_distribution(_series(n=200_000), bins=20, max_outliers=50)
+    
+    assert len(small.data[0].y) == len(large.data[0].y) == 20
+    assert len(large.to_json()) < 2 * len(small.to_json())
+
+
+def test_distribution_cache_is_safe_across_threads(monkeypatch):
+    # 缓存容量设为1，使各线程不断淘汰彼此的结果
+    monkeypatch.setattr(visualization, '_DISTRIBUTION_CACHE_SIZE', 1)
+    series_list = [_series(n=2_000, seed=seed) for seed in range(4)]
+    expected = [summarize_distribution(series)['median'] for series in series_list]
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        medians = list(pool.map(lambda i: summarize_distribution(series_list[i % 4])['median'], range(400)))
+    
+    assert medians == [expected[i % 4] for i in range(400)]
+    assert len(visualization._DISTRIBUTION_CACHE) == 1
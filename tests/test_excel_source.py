@@ -0,0 +1,146 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer import excel_source
+from time_series_stationarity_analyzer.excel_source import list_sheets, read_excel_columns, read_preview
+
+pytest.importorskip('openpyxl')
+pytest.importorskip('pyarrow')
+
+
+def _workbook(n=50):
+    frame = pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=n, freq='D'),
+        'a': np.arange(n, dtype=float),
+        'b': np.arange(n) * 2,
+        'c': [f"x{i}" for i in range(n)],
+    })
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        frame.to_excel(writer, sheet_name='data', index=False)
+        frame.iloc[:5].to_excel(writer, sheet_name='other', index=False)
+    return buffer.getvalue(), frame
+
+
+@pytest.fixture(params=['openpyxl', 'default'])
+def engine(request, monkeypatch):
+    # 分别测试 openpyxl 流式读取和默认引擎
+    if request.param == 'openpyxl':
+        monkeypatch.setattr(excel_source, 'excel_engine', lambda extension='xlsx': 'openpyxl')
+    return request.param
+
+
+@pytest.fixture
+def excel_reads(monkeypatch):
+    calls = []
+    read_columns = excel_source._read_columns
+    
+    def counting(source, sheet, extension, columns):
+        calls.append(columns)
+        return read_columns(source, sheet, extension, columns)
+    
+    monkeypatch.setattr(excel_source, '_read_columns', counting)
+    return calls
+
+
+def test_sheets_and_preview(engine):
+    content, frame = _workbook()
+    
+    preview = read_preview(content, 'data', nrows=3)
+    
+    assert list_sheets(content) == ['data', 'other']
+    assert list(preview.columns) == list(frame.columns) and len(preview) == 3
+    assert preview['a'].tolist() == [0.0, 1.0, 2.0]
+
+
+def test_cache_hits_and_misses(engine, excel_reads, tmp_path):
+    content, frame = _workbook()
+    
+    first = read_excel_columns(content, 'data', ['time', 'a'], cache_dir=str(tmp_path))
+    second = read_excel_columns(content, 'data', ['a', 'time'], cache_dir=str(tmp_path))
+    # 只从Excel读取缺少的列，并与缓存合并
+    third = read_excel_columns(content, 'data', ['b', 'a'], cache_dir=str(tmp_path))
+    other = read_excel_columns(content, 'other', ['a'], cache_dir=str(tmp_path))
+    
+    assert excel_reads == [['time', 'a'], ['b'], ['a']]
+    pd.testing.assert_frame_equal(first, frame[['time', 'a']], check_dtype=False)
+    pd.testing.assert_frame_equal(second, frame[['a', 'time']], check_dtype=False)
+    assert third['b'].tolist() == frame['b'].tolist() and len(other) == 5
+    assert len(list(tmp_path.glob('*.parquet'))) == 2 and not list(tmp_path.glob('*.tmp'))
+
+
+def test_changed_content_misses(excel_reads, tmp_path):
+    content, _ = _workbook()
+    changed, _ = _workbook(n=30)
+    
+    read_excel_columns(content, 'data', ['a'], cache_dir=str(tmp_path))
+    result = read_excel_columns(changed, 'data', ['a'], cache_dir=str(tmp_path))
+    
+    assert len(excel_reads) == 2 and len(result) == 30
+
+
+def test_file_paths_are_keyed_by_modification(excel_reads, tmp_path):
+    content, _ = _workbook()
+    path = tmp_path / 'data.xlsx'
+    path.write_bytes(content)
+    cache_dir = str(tmp_path / 'cache')
+    
+    read_excel_columns(str(path), 'data', ['a'], cache_dir=cache_dir)
+    read_excel_columns(str(path), 'data', ['a'], cache_dir=cache_dir)
+    path.write_bytes(_workbook(n=30)[0])
+    result = read_excel_columns(str(path), 'data', ['a'], cache_dir=cache_dir)
+    
+    assert len(excel_reads) == 2 and len(result) == 30
+
+
+def test_corrupt_cache_is_rewritten(excel_reads, tmp_path):
+    content, frame = _workbook()
+    read_excel_columns(content, 'data', ['a'], cache_dir=str(tmp_path))
+    cache_file = next(tmp_path.glob('*.parquet'))
+    cache_file.write_bytes(b'not parquet')
+    
+    result = read_excel_columns(content, 'data', ['a'], cache_dir=str(tmp_path))
+    
+    assert result['a'].tolist() == frame['a'].tolist()
+    assert len(excel_reads) == 2 and cache_file.read_bytes()[:4] == b'PAR1'
+
+
+def test_cache_with_wrong_length_is_replaced(excel_reads, tmp_path):
+    content, frame = _workbook()
+    read_excel_columns(content, 'data', ['a'], cache_dir=str(tmp_path))
+    cache_file = next(tmp_path.glob('*.parquet'))
+    pd.DataFrame({'a': [1.0, 2.0]}).to_parquet(cache_file, index=False)
+    
+    result = read_excel_columns(content, 'data', ['a', 'b'], cache_dir=str(tmp_path))
+    
+    # 缓存行数与文件不一致时重新读取全部所需的列
+    assert excel_reads[-1] == ['a', 'b'] and len(result) == len(frame)
+    assert pd.read_parquet(cache_file)['a'].tolist() == frame['a'].tolist()
+
+
+def test_cache_directory_is_pruned(tmp_path):
+    content, _ = _workbook()
+    read_excel_columns(content, 'data', ['a'], cache_dir=str(tmp_path))
+    old = next(tmp_path.glob('*.parquet'))
+    os.utime(old, (0, 0))
+    
+    read_excel_columns(content, 'other', ['a'], cache_dir=str(tmp_path), max_cache_bytes=1)
+    
+    # 最久未使用的缓存文件被删除，刚写入的文件保留
+    remaining = list(tmp_path.glob('*.parquet'))
+    assert len(remaining) == 1 and remaining[0] != old
+
+
+def test_uncacheable_requests_read_excel(excel_reads, tmp_path):
+    content, _ = _workbook()
+    
+    read_excel_columns(content, 'data', ['a'], cache_dir=None)
+    read_excel_columns(content, 'data', ['a'], cache_dir=None)
+    
+    assert len(excel_reads) == 2 and not list(tmp_path.iterdir())
+    with pytest.raises(ValueError):
+        excel_source._read_columns(content, 'data', 'xlsx', ['missing'])
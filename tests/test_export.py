@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.stationarity import StationarityAnalyzer
+from time_series_stationarity_analyzer.utils import (
+    export_results_to_csv, export_results_to_file, iter_results_csv
+)
+
+
+def _series(n=1_000, freq='D', seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq=freq)
+    return pd.Series(rng.normal(size=n).cumsum(), index=index, name='value')
+
+
+@pytest.fixture(scope='module')
+def results():
+    return StationarityAnalyzer(_series()).comprehensive_test()
+
+
+def _original_section(text):
+    return text.split("=== ORIGINAL DATA ===\n", 1)[1]
+
+
+@pytest.mark.parametrize('freq', ['D', 'h', '250ms'])
+def test_chunks_match_single_write(results, freq):
+    # 按小时时最后一块只有一个午夜时刻，其默认格式会省略时间部分
+    data = _series(n=24 * 40 + 1, freq=freq)
+    
+    chunked = ''.join(iter_results_csv(data, results, chunk_size=24))
+    
+    expected = pd.DataFrame({'Date': data.index, 'Value': data.values}).to_csv(index=False)
+    assert chunked == ''.join(iter_results_csv(data, results, chunk_size=len(data)))
+    assert _original_section(chunked) == expected
+
+
+def test_csv_file_matches_string_export(results, tmp_path):
+    data = _series()
+    path = str(tmp_path / 'export.csv')
+    
+    export_results_to_file(data, results, path, chunk_size=100)
+    
+    with open(path, encoding='utf-8', newline='') as f:
+        assert f.read() == export_results_to_csv(data, results)
+    assert 'ADF Test' in export_results_to_csv(data, results)
+
+
+def test_parquet_round_trip(results, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    data = _series(freq='min')
+    path = str(tmp_path / 'export.parquet')
+    
+    export_results_to_file(data, results, path, file_format='parquet', chunk_size=300)
+    
+    parquet = pq.ParquetFile(path)
+    assert parquet.num_row_groups == 4
+    frame = parquet.read().to_pandas()
+    np.testing.assert_array_equal(frame['Value'].to_numpy(), data.to_numpy())
+    assert pd.DatetimeIndex(frame['Date']).equals(data.index)
+    table = json.loads(parquet.schema_arrow.metadata[b'stationarity_results'])
+    p_value = [row['Value'] for row in table if row['Category'] == 'ADF Test' and row['Metric'] == 'P-Value']
+    assert p_value == [pytest.approx(results['adf_test']['p_value'])]
+
+
+def test_unknown_format_is_rejected(results, tmp_path):
+    with pytest.raises(ValueError):
+        export_results_to_file(_series(), results, str(tmp_path / 'x'), file_format='xlsx')
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from time_series_stationarity_analyzer import visualization
+from time_series_stationarity_analyzer.visualization import (
+    TimeSeriesVisualizer, _estimate_figure_size, _figure_size, decimate_figure, minmax_decimate_indices
+)
+
+
+def _series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='s')
+    return pd.Series(rng.normal(size=n).cumsum(), index=index, name='value')
+
+
+def test_minmax_keeps_extremes_of_every_bucket():
+    values = np.random.default_rng(1).normal(size=10_000)
+    values[1234] = 50.0
+    values[8765] = -50.0
+    
+    keep = minmax_decimate_indices(values, 100)
+    
+    assert len(keep) <= 102 and np.all(np.diff(keep) > 0)
+    assert {0, 1234, 8765, 9999} <= set(keep.tolist())
+    for bucket in np.array_split(np.arange(10_000), 50)[:-1]:
+        assert values[bucket].max() in values[keep] and values[bucket].min() in values[keep]
+
+
+def test_minmax_skips_missing_values():
+    values = np.arange(1000, dtype=float)
+    values[::3] = np.nan
+    
+    keep = minmax_decimate_indices(values, 50)
+    
+    assert not np.isnan(values[keep[1:-1]]).any()
+
+
+def test_short_trace_is_not_decimated():
+    np.testing.assert_array_equal(minmax_decimate_indices(np.arange(10.0), 100), np.arange(10))
+
+
+@pytest.mark.parametrize('n', [1_000, 50_000])
+def test_estimate_is_close_to_serialized_size(n):
+    data = _series(n)
+    fig = go.Figure(go.Scatter(x=data.index, y=data.to_numpy(), mode='lines'))
+    
+    estimate, actual = _estimate_figure_size(fig), _figure_size(fig)
+    
+    assert 0.5 * actual < estimate < 2.0 * actual
+
+
+def test_large_figure_is_decimated_under_budget():
+    visualizer = TimeSeriesVisualizer(figure_budget=200_000)
+    
+    fig = visualizer.plot_time_series(_series(100_000))
+    
+    metrics = visualizer.figure_metrics['plot_time_series']
+    assert metrics['decimated'] and metrics['exact_size']
+    assert metrics['bytes'] <= 200_000 == metrics['budget']
+    assert metrics['bytes'] == _figure_size(fig)
+    assert metrics['points'] < metrics['original_points'] and len(fig.data[0].y) < 100_000
+
+
+def test_small_figure_is_not_serialized(monkeypatch):
+    calls = []
+    monkeypatch.setattr(visualization, '_figure_size', lambda fig: calls.append(fig) or 0)
+    visualizer = TimeSeriesVisualizer()
+    
+    visualizer.plot_time_series(_series(100))
+    
+    metrics = visualizer.figure_metrics['plot_time_series']
+    assert calls == [] and not metrics['exact_size'] and not metrics['decimated']
+
+
+def test_no_budget_and_untracked_figures():
+    untracked = TimeSeriesVisualizer(track_figures=False)
+    unlimited = TimeSeriesVisualizer(figure_budget=None)
+    
+    untracked.plot_time_series(_series(10_000))
+    fig = unlimited.plot_time_series(_series(10_000))
+    
+    assert untracked.figure_metrics == {}
+    assert len(fig.data[0].y) == 10_000 and not unlimited.figure_metrics['plot_time_series']['decimated']
+
+
+def test_decimate_figure_respects_min_points():
+    data = _series(5_000)
+    fig = go.Figure(go.Scatter(x=data.index, y=data.to_numpy()))
+    
+    assert decimate_figure(fig, 0.01, min_points=1_000)
+    assert 900 < len(fig.data[0].y) <= 1_002
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.fractional import (
+    batch_find_min_ffd_order, find_min_ffd_order, frac_diff_ffd, frac_diff_ffd_frame, get_ffd_weights
+)
+
+
+def _naive_ffd(values, weights):
+    # 逐点计算窗口内的加权和：y_t = sum_k w_k * x_{t-k}
+    width = len(weights)
+    return np.array([
+        np.dot(weights, values[t - width + 1:t + 1][::-1]) for t in range(width - 1, len(values))
+    ])
+
+
+def _random_walk(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='h')
+    return pd.Series(rng.normal(size=n).cumsum(), index=index, name='walk')
+
+
+def test_weights_follow_recursion():
+    weights = get_ffd_weights(0.4, threshold=1e-3)
+    
+    assert weights[0] == 1.0
+    assert weights[1] == pytest.approx(-0.4)
+    assert weights[2] == pytest.approx(-weights[1] * (0.4 - 1) / 2)
+    assert np.abs(weights[1:]).min() >= 1e-3
+    assert not weights.flags.writeable
+
+
+def test_integer_order_gives_plain_difference():
+    np.testing.assert_allclose(get_ffd_weights(1.0), [1.0, -1.0])
+
+
+def test_max_width_limits_window():
+    assert len(get_ffd_weights(0.3, threshold=0, max_width=7)) == 7
+
+
+def test_non_positive_threshold_requires_max_width():
+    with pytest.raises(ValueError):
+        get_ffd_weights(0.3, threshold=0)
+
+
+@pytest.mark.parametrize('d', [0.2, 0.5, 0.85])
+def test_ffd_matches_naive_loop(d):
+    walk = _random_walk()
+    weights = get_ffd_weights(d, threshold=1e-3)
+    
+    result = frac_diff_ffd(walk, d, threshold=1e-3)
+    
+    np.testing.assert_allclose(result.to_numpy(), _naive_ffd(walk.to_numpy(), weights), atol=1e-9)
+    assert result.index.equals(walk.index[len(weights) - 1:])
+
+
+def test_short_series_returns_empty():
+    assert frac_diff_ffd(_random_walk(n=5), 0.3, threshold=1e-5).empty
+
+
+def test_frame_matches_per_column():
+    frame = pd.DataFrame({'a': _random_walk(seed=1), 'b': _random_walk(seed=2)})
+    
+    result = frac_diff_ffd_frame(frame, 0.4, threshold=1e-3)
+    
+    for col in frame.columns:
+        pd.testing.assert_series_equal(result[col], frac_diff_ffd(frame[col], 0.4, threshold=1e-3),
+                                       check_freq=False)
+
+
+def test_frame_with_missing_values_falls_back_per_column():
+    frame = pd.DataFrame({'a': _random_walk(seed=1), 'b': _random_walk(seed=2)})
+    frame.iloc[3, 0] = np.nan
+    
+    result = frac_diff_ffd_frame(frame, 0.4, threshold=1e-3)
+    
+    pd.testing.assert_series_equal(result['a'].dropna(), frac_diff_ffd(frame['a'], 0.4, threshold=1e-3),
+                                   check_freq=False)
+
+
+def test_min_order_search_on_random_walk():
+    walk = _random_walk(n=1000)
+    
+    search = find_min_ffd_order(walk, threshold=1e-3)
+    
+    assert 0 < search['d'] <= 1.0
+    assert search['adf_result']['is_stationary']
+    failed = [row['d'] for row in search['history'] if not row['is_stationary']]
+    assert all(d < search['d'] for d in failed)
+
+
+def test_batch_min_order_has_row_per_column():
+    frame = pd.DataFrame({'a': _random_walk(n=600, seed=1), 'b': _random_walk(n=600, seed=2)})
+    
+    summary = batch_find_min_ffd_order(frame, threshold=1e-3)
+    
+    assert list(summary.index) == ['a', 'b']
+    assert summary['d'].notna().all()
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer import frequency
+from time_series_stationarity_analyzer.frequency import analyze_frequency, regularize_series
+
+
+def _hourly(n=500):
+    return pd.date_range('2024-01-01', periods=n, freq='h')
+
+
+def test_regular_index():
+    result = analyze_frequency(_hourly())
+    
+    assert result['is_regular'] and result['step'] == pd.Timedelta(hours=1)
+    assert pd.tseries.frequencies.to_offset(result['freq']) == pd.tseries.frequencies.to_offset('h')
+    assert result['n_gaps'] == result['n_irregular'] == result['n_duplicates'] == 0
+
+
+def test_gaps_duplicates_and_irregular_intervals():
+    index = _hourly()
+    # 删除 10:00-12:00 共3个点，重复一个时间点，插入一个不在整点的时间
+    index = index.delete([10, 11, 12]).insert(50, index[50]).insert(100, index[100] + pd.Timedelta(minutes=30))
+    
+    result = analyze_frequency(index)
+    
+    assert not result['is_regular']
+    assert (result['n_gaps'], result['missing_points'], result['n_duplicates']) == (1, 3, 1)
+    assert result['largest_gap'] == pd.Timedelta(hours=4)
+    assert result['gaps'].iloc[0]['start'] == index[9]
+    assert result['n_irregular'] == 1 and result['irregular_spans'].iloc[0]['n_intervals'] == 2
+
+
+def test_calendar_months():
+    month_end = analyze_frequency(pd.date_range('2020-01-31', periods=36, freq=frequency._MONTH_END_ALIAS))
+    quarters = analyze_frequency(pd.date_range('2020-01-01', periods=12, freq='3MS'))
+    
+    assert month_end['calendar'] and month_end['is_regular']
+    assert month_end['freq'] == frequency._MONTH_END_ALIAS
+    assert quarters['freq'] == '3MS' and quarters['step'] == pd.DateOffset(months=3)
+
+
+def test_regularize_fills_gaps_by_time():
+    index = _hourly(10).delete([3, 4])
+    data = pd.Series(np.arange(10.0)[[0, 1, 2, 5, 6, 7, 8, 9]], index=index, name='value')
+    
+    result = regularize_series(data)
+    
+    pd.testing.assert_series_equal(
+        result, pd.Series(np.arange(10.0), index=_hourly(10), name='value'), check_freq=False
+    )
+    assert regularize_series(data, fill='none').isna().sum() == 2
+    assert regularize_series(data, fill='ffill').iloc[4] == 2.0
+
+
+def test_regularize_month_end_series():
+    index = pd.date_range('2020-01-31', periods=24, freq=frequency._MONTH_END_ALIAS).delete(5)
+    data = pd.Series(np.arange(23.0), index=index)
+    
+    result = regularize_series(data)
+    
+    assert len(result) == 24 and result.index.is_month_end.all()
+    # 按时间插值，各月天数不同
+    assert 4 < result.iloc[5] < 5 and result.iloc[6] == 5.0
+
+
+def test_regularize_rejects_unknown_step():
+    data = pd.Series([1.0, 2.0], index=pd.DatetimeIndex(['2024-01-01', '2024-01-01']))
+    with pytest.raises(ValueError):
+        regularize_series(data)
+    with pytest.raises(ValueError):
+        regularize_series(data, fill='bfill')
+
+
+def test_frequency_cache_is_safe_across_threads(monkeypatch):
+    # 缓存容量设为1，使各线程不断淘汰彼此的结果
+    monkeypatch.setattr(frequency, '_FREQUENCY_CACHE_SIZE', 1)
+    indexes = [_hourly(100 + i).delete([5 + i]) for i in range(4)]
+    expected = [analyze_frequency(index)['n_points'] for index in indexes]
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        counts = list(pool.map(lambda i: analyze_frequency(indexes[i % 4])['n_points'], range(200)))
+    
+    assert counts == [expected[i % 4] for i in range(200)]
+    assert len(frequency._FREQUENCY_CACHE) == 1
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.grouped import GROUP_COLUMNS, analyze_groups, analyze_series, split_groups
+from time_series_stationarity_analyzer.stationarity import StationarityAnalyzer
+from time_series_stationarity_analyzer.utils import validate_time_series_data
+
+
+def _long_frame(n_entities=5, n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(n_entities):
+        values = rng.normal(size=n)
+        frames.append(pd.DataFrame({
+            'entity': f"E{i}",
+            'time': pd.date_range('2024-01-01', periods=n, freq='D'),
+            'value': values.cumsum() if i % 2 else values
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    # 打乱行顺序，并加入缺失值和重复时间戳
+    df = df.sample(frac=1, random_state=0).reset_index(drop=True)
+    df.loc[3, 'value'] = np.nan
+    df.loc[5, 'entity'] = None
+    return pd.concat([df, df.iloc[[10]].assign(value=99.0)], ignore_index=True)
+
+
+@pytest.mark.parametrize('duplicates', ['last', 'first', 'mean'])
+def test_split_matches_validation_per_entity(duplicates):
+    df = _long_frame()
+    
+    groups = split_groups(df, 'entity', 'time', 'value', duplicates=duplicates)
+    
+    assert [entity for entity, _ in groups] == [f"E{i}" for i in range(5)]
+    for entity, series in groups:
+        is_valid, _, expected = validate_time_series_data(df[df['entity'] == entity], 'time', 'value',
+                                                          duplicates=duplicates)
+        assert is_valid
+        np.testing.assert_array_equal(series.to_numpy(), expected.to_numpy())
+        assert series.index.equals(expected.index)
+
+
+def test_split_rejects_missing_columns():
+    with pytest.raises(ValueError):
+        split_groups(_long_frame(), 'missing', 'time', 'value')
+    assert split_groups(_long_frame().iloc[:0], 'entity', 'time', 'value') == []
+
+
+def test_summary_matches_direct_analysis():
+    df = _long_frame()
+    calls = []
+    
+    output = analyze_groups(df, 'entity', 'time', 'value', keep_results=True, max_workers=4,
+                            progress=lambda done, total: calls.append((done, total)))
+    
+    summary = output['summary']
+    assert list(summary.columns) == GROUP_COLUMNS and output['n_groups'] == 5
+    assert calls[-1] == (5, 5) and len(calls) == 5
+    for entity, series in split_groups(df, 'entity', 'time', 'value'):
+        expected = StationarityAnalyzer(series).comprehensive_test()
+        row = summary[summary['entity'] == entity].iloc[0]
+        assert row['adf_p_value'] == expected['adf_test']['p_value']
+        assert row['overall_conclusion'] == expected['overall_conclusion']
+        assert row['n_obs'] == len(series) and row['end'] == series.index[-1]
+    assert output['n_stationary'] == int(summary['is_stationary'].eq(True).sum())
+    assert set(output['results']) == set(output['series']) == set(summary['entity'])
+
+
+def test_short_entities_are_reported_as_errors():
+    df = _long_frame()
+    short = pd.DataFrame({'entity': 'short', 'time': pd.date_range('2024-01-01', periods=3), 'value': 1.0})
+    
+    output = analyze_groups(pd.concat([df, short]), 'entity', 'time', 'value')
+    
+    row = output['summary'].set_index('entity').loc['short']
+    assert output['n_failed'] == 1 and '太少' in row['error'] and row['is_stationary'] is None
+
+
+def test_external_executor_and_prepared_series():
+    series = [(name, group) for name, group in split_groups(_long_frame(), 'entity', 'time', 'value')]
+    
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        output = analyze_series(series, executor=pool)
+    
+    assert output['summary']['entity'].tolist() == [name for name, _ in series]
+    assert output['n_failed'] == 0
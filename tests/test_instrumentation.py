@@ -0,0 +1,102 @@
+import threading
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from time_series_stationarity_analyzer import instrumentation as instrumentation_module
+from time_series_stationarity_analyzer.instrumentation import Instrumentation, timings_table
+from time_series_stationarity_analyzer.stationarity import StationarityAnalyzer
+
+
+def test_nested_spans_build_a_tree():
+    records = []
+    monitor = Instrumentation(hooks=[records.append])
+    
+    with monitor.span('outer', series='a') as outer:
+        with monitor.span('first'):
+            pass
+        with monitor.span('second'):
+            pass
+    
+    assert [child.name for child in outer.children] == ['first', 'second']
+    assert [record['name'] for record in records] == ['first', 'second', 'outer']
+    assert records[0]['parent'] == 'outer' and records[2]['attributes'] == {'series': 'a'}
+    assert outer.wall_time >= sum(child.wall_time for child in outer.children)
+
+
+def test_peak_memory_measures_span_allocations():
+    monitor = Instrumentation()
+    
+    with monitor.span('outer') as outer:
+        with monitor.span('allocate') as inner:
+            block = np.ones(2_000_000)
+            del block
+        with monitor.span('small') as small:
+            pass
+    
+    assert inner.peak_memory >= 16_000_000
+    assert small.peak_memory < 1_000_000
+    assert outer.peak_memory >= inner.peak_memory
+
+
+def test_tracing_stops_after_last_span():
+    assert not tracemalloc.is_tracing()
+    with Instrumentation().span('a'):
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert instrumentation_module._active_spans == 0
+
+
+def test_overlapping_spans_from_other_threads_are_not_reset():
+    monitor = Instrumentation()
+    other = Instrumentation()
+    started, release = threading.Event(), threading.Event()
+    spans = {}
+    
+    def background():
+        with other.span('background') as span:
+            started.set()
+            block = np.ones(2_000_000)
+            release.wait()
+            del block
+        spans['background'] = span
+    
+    thread = threading.Thread(target=background)
+    thread.start()
+    started.wait()
+    with monitor.span('foreground') as foreground:
+        pass
+    release.set()
+    thread.join()
+    
+    # 后开始的区间无法单独测量；先开始的区间的峰值不会被重置
+    assert foreground.peak_memory is None and foreground.to_dict()['memory_concurrent']
+    assert 'memory_concurrent' not in spans['background'].to_dict()
+    assert spans['background'].peak_memory >= 16_000_000
+
+
+def test_hook_errors_are_ignored():
+    def broken(record):
+        raise RuntimeError("boom")
+    
+    with Instrumentation(hooks=[broken]).span('a') as span:
+        pass
+    assert span.wall_time is not None
+
+
+def test_analyzer_results_carry_timings():
+    rng = np.random.default_rng(0)
+    analyzer = StationarityAnalyzer(pd.Series(rng.normal(size=300)), instrumentation=Instrumentation())
+    
+    result = analyzer.comprehensive_test()
+    
+    stages = [row['stage'] for row in timings_table(result['timings'])]
+    assert 'adf_test' in stages and 'adf_test / fit' in stages and 'basic_statistics' in stages
+    assert result['adf_test']['timings']['phases']['fit']['wall_time'] > 0
+
+
+def test_analyzer_without_instrumentation_has_no_timings():
+    rng = np.random.default_rng(0)
+    result = StationarityAnalyzer(pd.Series(rng.normal(size=300))).comprehensive_test()
+    assert 'timings' not in result and 'timings' not in result['adf_test']
@@ -0,0 +1,182 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.jobs import (
+    CANCELLED, DONE, RUNNING, AnalysisJobManager
+)
+from time_series_stationarity_analyzer.stationarity import COMPREHENSIVE_TESTS, StationarityAnalyzer
+
+
+def _series(seed=0, n=300):
+    return pd.Series(np.random.default_rng(seed).normal(size=n).cumsum(), name='value')
+
+
+def _wait(job, timeout=30):
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.finished
+
+
+@pytest.fixture
+def manager():
+    manager = AnalysisJobManager()
+    yield manager
+    manager.shutdown()
+
+
+@pytest.fixture
+def blocked_tests(monkeypatch):
+    # 让检验阻塞在 adf_test 中，便于在运行时取消
+    started, release = threading.Event(), threading.Event()
+    original = StationarityAnalyzer.adf_test
+    
+    def adf_test(self, *args, **kwargs):
+        started.set()
+        release.wait(10)
+        return original(self, *args, **kwargs)
+    
+    monkeypatch.setattr(StationarityAnalyzer, 'adf_test', adf_test)
+    yield started
+    release.set()
+
+
+def test_job_result_matches_direct_analysis(manager):
+    data = _series()
+    
+    job = manager.submit(data)
+    _wait(job)
+    
+    snapshot = job.snapshot()
+    expected = StationarityAnalyzer(data).comprehensive_test()
+    assert snapshot['status'] == DONE and set(snapshot['progress'].values()) == {DONE}
+    assert snapshot['result']['overall_conclusion'] == expected['overall_conclusion']
+    assert snapshot['result']['adf_test']['p_value'] == expected['adf_test']['p_value']
+    assert job.analyzer is None
+
+
+def test_identical_submissions_share_a_job(manager):
+    data = _series()
+    
+    first = manager.submit(data, subscriber='a')
+    second = manager.submit(data.copy(), subscriber='b')
+    other = manager.submit(data, record_timings=True)
+    
+    assert first is second and other is not first
+    _wait(first)
+    _wait(other)
+
+
+def test_cancel_waits_for_every_subscriber(manager, blocked_tests):
+    data = _series()
+    job = manager.submit(data, subscriber='a')
+    manager.submit(data, subscriber='b')
+    blocked_tests.wait(10)
+    
+    assert not manager.cancel(job.key, subscriber='a')
+    assert job.status == RUNNING
+    assert manager.cancel(job.key, subscriber='b')
+    assert job.status == CANCELLED
+    assert job.progress['adf_test'] != DONE and 'adf_test' not in job.partial_results
+
+
+def test_cancelled_job_is_resubmitted(manager, blocked_tests):
+    data = _series()
+    job = manager.submit(data)
+    blocked_tests.wait(10)
+    manager.cancel(job.key)
+    
+    assert manager.submit(data) is not job
+
+
+def test_timed_job_runs_tests_one_at_a_time(manager, monkeypatch):
+    running, overlaps = [], []
+    lock = threading.Lock()
+    
+    def tracked(name):
+        original = getattr(StationarityAnalyzer, name)
+        
+        def run(self, *args, **kwargs):
+            # 只统计本任务的检验（其他用例遗留的检验线程可能仍在运行）
+            if len(self.data) != 301:
+                return original(self, *args, **kwargs)
+            with lock:
+                running.append(name)
+                overlaps.append(len(running))
+            try:
+                time.sleep(0.05)
+                return original(self, *args, **kwargs)
+            finally:
+                with lock:
+                    running.remove(name)
+        return run
+    
+    for name in COMPREHENSIVE_TESTS:
+        monkeypatch.setattr(StationarityAnalyzer, name, tracked(name))
+    
+    job = manager.submit(_series(n=301), record_timings=True)
+    _wait(job)
+    
+    result = job.snapshot()['result']
+    assert len(overlaps) == len(COMPREHENSIVE_TESTS) and max(overlaps) == 1
+    assert result['timings']['execution'] == 'serial'
+    assert all(result[name]['timings']['peak_memory'] is not None for name in COMPREHENSIVE_TESTS)
+
+
+def test_finished_jobs_are_evicted(manager):
+    manager.max_finished = 2
+    jobs = [manager.submit(_series(seed)) for seed in range(4)]
+    for job in jobs:
+        _wait(job)
+    manager.submit(_series(seed=10))
+    
+    assert manager.get(jobs[0].key) is None
+    assert manager.get(jobs[-1].key) is jobs[-1]
+
+
+def test_completion_hook_runs_once_per_job():
+    calls = []
+    manager = AnalysisJobManager(on_complete=lambda job, data: calls.append((job.status, job.result, len(data))))
+    data = _series()
+    try:
+        job = manager.submit(data, subscriber='a')
+        manager.submit(data, subscriber='b')
+        _wait(job)
+        manager.submit(data, subscriber='c')
+    finally:
+        manager.shutdown()
+    
+    assert len(calls) == 1
+    status, result, n_obs = calls[0]
+    assert status == RUNNING and result is job.result and n_obs == len(data)
+
+
+def test_completion_hook_errors_do_not_fail_the_job():
+    def fail(job, data):
+        raise RuntimeError('存储不可用')
+    
+    manager = AnalysisJobManager(on_complete=fail)
+    try:
+        job = manager.submit(_series())
+        _wait(job)
+    finally:
+        manager.shutdown()
+    
+    assert job.status == DONE and job.result is not None
+
+
+def test_completion_hook_skips_cancelled_jobs(blocked_tests):
+    calls = []
+    manager = AnalysisJobManager(on_complete=lambda job, data: calls.append(job))
+    try:
+        job = manager.submit(_series())
+        blocked_tests.wait(10)
+        manager.cancel(job.key)
+    finally:
+        manager.shutdown()
+    
+    assert job.status == CANCELLED and calls == []
@@ -0,0 +1,127 @@
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer import multi_file
+from time_series_stationarity_analyzer.multi_file import (
+    FILE_COLUMNS, expand_archives, merge_sorted, parse_files, preview_files
+)
+from time_series_stationarity_analyzer.utils import normalize_time_index
+
+
+def _csv(start, n, offset=0.0):
+    frame = pd.DataFrame({
+        'time': pd.date_range(start, periods=n, freq='h'),
+        'value': np.arange(n) + offset,
+        'other': 'x',
+    })
+    return frame.to_csv(index=False).encode()
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members:
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_expand_archives_keeps_tables_in_order():
+    archive = _zip([('b/2.csv', b'x'), ('a.csv', b'y'), ('notes.txt', b'z'),
+                    ('.hidden.csv', b'h'), ('__MACOSX/a.csv', b'm'), ('dir/', b'')])
+    
+    files = expand_archives([('first.csv', b'1'), ('data.zip', archive), ('last.csv', b'2')])
+    
+    assert files == [('first.csv', b'1'), ('data.zip/a.csv', b'y'), ('data.zip/b/2.csv', b'x'), ('last.csv', b'2')]
+
+
+def test_duplicate_names_are_disambiguated():
+    archive = _zip([('a.csv', b'1')])
+    
+    files = expand_archives([('a.csv', b'1'), ('a.csv', b'2'), ('data.zip', archive), ('data.zip', archive),
+                             ('a#2.csv', b'3'), ('noext', b'4'), ('noext', b'5')])
+    
+    # 重名文件在扩展名前追加序号，已被占用的名称不会重复使用
+    assert [name for name, _ in files] == ['a.csv', 'a#2.csv', 'data.zip/a.csv', 'data.zip/a#2.csv',
+                                           'a#2#2.csv', 'noext', 'noext#2']
+
+
+def test_archive_limits_are_checked_before_reading(monkeypatch):
+    archive = _zip([(f"{i}.csv", b'0' * 1000) for i in range(5)])
+    reads = []
+    monkeypatch.setattr(zipfile.ZipFile, 'read', lambda self, member, pwd=None: reads.append(member))
+    
+    monkeypatch.setattr(multi_file, 'MAX_ARCHIVE_MEMBERS', 4)
+    with pytest.raises(ValueError, match='条目'):
+        expand_archives([('data.zip', archive)])
+    assert reads == []
+    
+    monkeypatch.setattr(multi_file, 'MAX_ARCHIVE_MEMBERS', 5)
+    monkeypatch.setattr(multi_file, 'MAX_ARCHIVE_BYTES', 6000)
+    # 上限按所有压缩包解压后的总大小计算，超出上限的压缩包不会被读取
+    with pytest.raises(ValueError, match='总大小'):
+        expand_archives([('a.zip', archive), ('b.zip', archive)])
+    assert len(reads) == 5
+
+
+def test_nested_archives_are_rejected():
+    archive = _zip([('a.csv', b'1'), ('inner/nested.zip', _zip([('b.csv', b'2')]))])
+    
+    with pytest.raises(ValueError, match='嵌套'):
+        expand_archives([('data.zip', archive)])
+
+
+def test_parse_files_reports_each_file():
+    files = [('a.csv', _csv('2024-01-01', 24)), ('bad.csv', b'time,other\n1,2\n'),
+             ('b.csv', _csv('2024-01-02', 24, offset=100.0))]
+    calls = []
+    
+    report, series = parse_files(files, 'time', 'value', progress=lambda done, total: calls.append(total))
+    
+    assert list(report.columns) == FILE_COLUMNS and report['file'].tolist() == ['a.csv', 'bad.csv', 'b.csv']
+    assert report['n_obs'].tolist() == [24, 0, 24] and calls == [3, 3, 3]
+    assert '文件解析失败' in report.loc[1, 'error'] and report['error'].isna().sum() == 2
+    assert series[2].iloc[0] == 100.0 and report.loc[2, 'start'] == pd.Timestamp('2024-01-02')
+    assert list(preview_files(files).columns) == ['time', 'value', 'other']
+
+
+def test_parse_files_with_external_executor():
+    files = [(f"{i}.csv", _csv(f"2024-01-{i + 1:02d}", 24)) for i in range(4)]
+    
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        report, series = parse_files(files, 'time', 'value', executor=pool)
+    
+    assert report['error'].isna().all() and [len(s) for s in series] == [24] * 4
+
+
+@pytest.mark.parametrize('duplicates', ['last', 'first', 'mean'])
+def test_merge_matches_full_sort(duplicates):
+    # 区间重叠且有跨文件重复时间戳的序列
+    parts = [
+        pd.Series(np.arange(10.0), index=pd.date_range('2024-01-01', periods=10, freq='2h')),
+        pd.Series(np.arange(10.0) + 100, index=pd.date_range('2024-01-01 01:00', periods=10, freq='2h')),
+        pd.Series(np.arange(5.0) + 200, index=pd.date_range('2024-01-01 04:00', periods=5, freq='h')),
+    ]
+    
+    merged = merge_sorted(parts, duplicates)
+    
+    expected = normalize_time_index(pd.concat(parts), duplicates)
+    np.testing.assert_array_equal(merged.to_numpy(), expected.to_numpy())
+    assert merged.index.equals(expected.index)
+
+
+def test_merge_concatenates_disjoint_series():
+    late = pd.Series([3.0, 4.0], index=pd.date_range('2024-02-01', periods=2).as_unit('ns'))
+    early = pd.Series([1.0, 2.0], index=pd.date_range('2024-01-01', periods=2).as_unit('s'))
+    
+    merged = merge_sorted([late, pd.Series(dtype=float), early])
+    
+    assert merged.tolist() == [1.0, 2.0, 3.0, 4.0] and merged.index.unit == 'ns'
+    with pytest.raises(ValueError):
+        merge_sorted([pd.Series(dtype=float)])
+    with pytest.raises(ValueError):
+        merge_sorted([early, late.tz_localize('UTC')])
@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.reporting import BatchSummary, write_batch_report
+from time_series_stationarity_analyzer.stationarity import StationarityAnalyzer
+
+
+@pytest.fixture(scope='module')
+def results():
+    rng = np.random.default_rng(0)
+    series = {
+        'noise': pd.Series(rng.normal(size=300)),
+        'walk': pd.Series(rng.normal(size=300).cumsum()),
+        'a|b': pd.Series(rng.normal(size=300)),
+    }
+    return {name: StationarityAnalyzer(data).comprehensive_test() for name, data in series.items()}
+
+
+def test_summary_matches_results(results):
+    summary = BatchSummary()
+    for result in results.values():
+        summary.update(result)
+    summary.update({'error': '数据不足'})
+    
+    stats = summary.to_dict()
+    adf_p = [result['adf_test']['p_value'] for result in results.values()]
+    assert stats['n_series'] == 4 and stats['n_errors'] == 1
+    assert sum(stats['verdicts'].values()) == 4 and stats['verdicts']['无法判断'] >= 1
+    assert stats['p_value_histograms']['adf_test'] == np.histogram(adf_p, bins=summary.bins)[0].tolist()
+    assert stats['p_value_stats']['adf_test']['mean'] == pytest.approx(np.mean(adf_p))
+    assert stats['test_counts']['kpss_test']['error'] == 1
+
+
+def test_p_value_of_one_falls_in_last_bin():
+    summary = BatchSummary()
+    summary.update({'adf_test': {'p_value': 1.0, 'is_stationary': False}})
+    
+    assert summary.histograms['adf_test'][-1] == 1
+    assert summary.test_counts['kpss_test']['error'] == 1
+
+
+@pytest.mark.parametrize('file_format', ['markdown', 'html'])
+def test_report_puts_summary_before_series(results, tmp_path, file_format):
+    path = str(tmp_path / f'report.{file_format}')
+    
+    stats = write_batch_report(((name, result) for name, result in results.items()), path,
+                               file_format=file_format)
+    
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    assert stats['path'] == path and stats['n_series'] == 3
+    assert text.index('p值分布') < text.index('各序列结果') < text.index('noise') < text.index('walk')
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    if file_format == 'markdown':
+        assert '| a\\|b |' in text
+    else:
+        assert text.rstrip().endswith('</html>') and '<td>a|b</td>' in text
+
+
+def test_details_list_every_test(results, tmp_path):
+    path = str(tmp_path / 'report.md')
+    
+    write_batch_report(results, path, details=True)
+    
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    assert text.count('#### ADF检验') == 3 and text.count('#### Ljung-Box检验') == 3
+    assert '使用滞后期' in text
+
+
+def test_failed_iteration_leaves_no_files(results, tmp_path):
+    def broken():
+        yield 'noise', results['noise']
+        raise RuntimeError('分析中断')
+    
+    with pytest.raises(RuntimeError):
+        write_batch_report(broken(), str(tmp_path / 'report.md'))
+    
+    assert os.listdir(tmp_path) == []
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_batch_report([], str(tmp_path / 'report.pdf'), file_format='pdf')
@@ -0,0 +1,91 @@
+import pickle
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.stats.diagnostic import acorr_ljungbox
+from statsmodels.tsa.stattools import adfuller, kpss
+
+from time_series_stationarity_analyzer.results import (
+    ADFResult, KPSSResult, LjungBoxResult, format_interpretation
+)
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).normal(size=400)
+
+
+def test_adf_result_matches_statsmodels(values):
+    raw = adfuller(values)
+    
+    result = ADFResult.from_statsmodels(raw)
+    
+    assert isinstance(result, Mapping)
+    assert result['test_statistic'] == raw[0] and result['p_value'] == raw[1]
+    assert result['used_lag'] == raw[2] and isinstance(result['used_lag'], int)
+    assert result['n_obs'] == raw[3]
+    assert result['critical_values'] == raw[4]
+    assert result['is_stationary'] is True
+    assert result['conclusion'] == '时间序列是平稳的'
+    assert result['interpretation'] == format_interpretation(raw[0], raw[1], raw[4], null_is_stationary=False)
+
+
+def test_kpss_result_uses_stationary_null(values):
+    raw = kpss(values, nlags='auto')
+    
+    result = KPSSResult.from_statsmodels(raw)
+    
+    assert result['critical_values'] == raw[3]
+    assert result['is_stationary'] is bool(raw[1] > 0.05)
+    assert '无法拒绝原假设，序列是平稳的' in result['interpretation']
+
+
+def test_ljung_box_result_keeps_full_table(values):
+    table = acorr_ljungbox(values, lags=10, return_df=True)
+    
+    result = LjungBoxResult.from_statsmodels(table, 10)
+    
+    assert result['lags'] == 10
+    assert result['p_value'] == table['lb_pvalue'].iloc[-1]
+    assert result['full_results'] is table
+    assert result['is_independent'] is True
+
+
+def test_behaves_like_the_original_dict(values):
+    result = ADFResult.from_statsmodels(adfuller(values))
+    
+    assert list(result) == list(result._keys)
+    assert len(result) == len(result._keys)
+    assert result.get('error') is None and 'error' not in result
+    assert result.to_dict() == dict(result)
+
+
+def test_only_timings_can_be_assigned(values):
+    result = ADFResult.from_statsmodels(adfuller(values))
+    
+    result['timings'] = {'wall_time': 0.1}
+    
+    assert 'timings' in result and result['timings'] == {'wall_time': 0.1}
+    assert list(result)[-1] == 'timings'
+    with pytest.raises(TypeError):
+        result['p_value'] = 0.5
+
+
+def test_results_are_slotted(values):
+    result = ADFResult.from_statsmodels(adfuller(values))
+    with pytest.raises(AttributeError):
+        result.extra = 1
+
+
+def test_pickle_round_trip(values):
+    adf = ADFResult.from_statsmodels(adfuller(values))
+    adf['timings'] = {'wall_time': 0.2}
+    lb = LjungBoxResult.from_statsmodels(acorr_ljungbox(values, lags=5, return_df=True), 5)
+    
+    restored_adf = pickle.loads(pickle.dumps(adf))
+    restored_lb = pickle.loads(pickle.dumps(lb))
+    
+    assert restored_adf.to_dict() == adf.to_dict()
+    pd.testing.assert_frame_equal(restored_lb['full_results'], lb['full_results'])
@@ -0,0 +1,88 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.results_store import SUMMARY_COLUMNS, ResultsStore, to_plain
+from time_series_stationarity_analyzer.stationarity import StationarityAnalyzer
+from time_series_stationarity_analyzer.utils import series_fingerprint
+
+
+def _series(seed=0, n=200, name='value'):
+    index = pd.date_range('2024-01-01', periods=n, freq='D')
+    return pd.Series(np.random.default_rng(seed).normal(size=n).cumsum(), index=index, name=name)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / 'nested' / 'results.db'))
+    yield store
+    store.close()
+
+
+@pytest.fixture(scope='module')
+def result():
+    return StationarityAnalyzer(_series()).comprehensive_test()
+
+
+def test_record_and_lookup_round_trip(store, result):
+    data = _series()
+    
+    run_id = store.record('value', data, result, params={'record_timings': False})
+    
+    stored = store.lookup(series_fingerprint(data), params={'record_timings': False})
+    assert stored == json.loads(json.dumps(to_plain(result)))
+    assert stored['adf_test']['p_value'] == result['adf_test']['p_value']
+    assert store.load_result(run_id) == stored
+    assert store.lookup(series_fingerprint(data), params={'record_timings': True}) is None
+    assert store.lookup('unknown') is None
+
+
+def test_query_returns_summary_columns(store, result):
+    data = _series()
+    store.record('value', data, result)
+    
+    frame = store.query(series_id='value')
+    
+    row = frame.iloc[0]
+    assert list(frame.columns) == SUMMARY_COLUMNS and len(frame) == 1
+    assert row['n_obs'] == len(data) and row['start_time'] == data.index[0].isoformat()
+    assert bool(row['adf_stationary']) == result['adf_test']['is_stationary']
+    assert row['overall_conclusion'] == result['overall_conclusion']
+
+
+def test_failed_runs_are_not_reused(store, result):
+    data = _series()
+    fingerprint = series_fingerprint(data)
+    store.record('value', data, result, created_at=datetime(2024, 1, 1))
+    store.record('value', data, {'error': '检验失败'}, created_at=datetime(2024, 1, 2))
+    
+    assert store.lookup(fingerprint)['overall_conclusion'] == result['overall_conclusion']
+    errors = store.query(fingerprint=fingerprint)['error']
+    assert errors.iloc[0] == '检验失败' and pd.isna(errors.iloc[1])
+
+
+def test_batch_records_and_time_filters(store, result):
+    start = datetime(2024, 1, 1)
+    store.record_many([(f"s{i}", _series(i), result) for i in range(3)], created_at=start)
+    store.record('s0', _series(0), result, created_at=start + timedelta(days=1))
+    
+    assert store.series_ids()['series_id'].tolist()[0] == 's0'
+    assert store.series_ids().set_index('series_id').loc['s0', 'runs'] == 2
+    assert len(store.query(since=start + timedelta(hours=1))) == 1
+    assert len(store.query(until=start)) == 3
+    assert store.query(ascending=True, limit=2)['created_at'].tolist() == [pd.Timestamp(start)] * 2
+    
+    assert store.delete(before=start + timedelta(hours=1)) == 3
+    assert store.query()['series_id'].tolist() == ['s0']
+
+
+def test_to_plain_handles_numpy_and_missing_values():
+    plain = to_plain({
+        'a': np.float64('nan'), 'b': np.int64(3), 'c': np.arange(2),
+        'd': pd.Timestamp('2024-01-01'), 'e': pd.DataFrame({'x': [1.0, np.inf]})
+    })
+    
+    assert plain == {'a': None, 'b': 3, 'c': [0, 1], 'd': '2024-01-01T00:00:00', 'e': {'x': [1.0, None]}}
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from time_series_stationarity_analyzer.rolling import RollingStatistics, _compensated_prefix_sum
+
+
+def _series(n=3000, seed=0, level=0.0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='min')
+    return pd.Series(level + rng.normal(size=n).cumsum(), index=index, name='value')
+
+
+@pytest.mark.parametrize('window', [1, 2, 7, 50, 2999, 3000])
+def test_mean_and_std_match_pandas(window):
+    data = _series()
+    engine = RollingStatistics(data, block_size=64)
+    
+    pd.testing.assert_series_equal(engine.mean(window), data.rolling(window).mean(),
+                                   check_names=False, rtol=1e-9, atol=1e-9)
+    pd.testing.assert_series_equal(engine.std(window), data.rolling(window).std(),
+                                   check_names=False, rtol=1e-7, atol=1e-6)
+
+
+def test_ddof_zero_matches_pandas():
+    data = _series()
+    pd.testing.assert_series_equal(RollingStatistics(data).var(20, ddof=0), data.rolling(20).var(ddof=0),
+                                   check_names=False, rtol=1e-7, atol=1e-9)
+
+
+def test_missing_values_give_nan_windows():
+    data = _series()
+    data.iloc[[10, 500, 501]] = np.nan
+    engine = RollingStatistics(data)
+    
+    pd.testing.assert_series_equal(engine.mean(30), data.rolling(30).mean(),
+                                   check_names=False, rtol=1e-9, atol=1e-9)
+    pd.testing.assert_series_equal(engine.std(30), data.rolling(30).std(),
+                                   check_names=False, rtol=1e-7, atol=1e-6)
+
+
+def test_large_offset_keeps_precision():
+    # 均值远大于波动时，朴素的 E[x²] - E[x]² 会因抵消误差失去全部有效位
+    rng = np.random.default_rng(0)
+    values = 1e9 + 1e-3 * rng.normal(size=3000)
+    expected = sliding_window_view(values, 25).std(axis=1, ddof=1)
+    
+    result = RollingStatistics(pd.Series(values)).std(25).to_numpy()
+    
+    np.testing.assert_allclose(result[24:], expected, rtol=1e-6)
+
+
+def test_window_longer_than_series_is_all_nan():
+    assert RollingStatistics(_series(n=10)).mean(11).isna().all()
+
+
+def test_invalid_window_raises():
+    with pytest.raises(ValueError):
+        RollingStatistics(_series(n=10)).mean(0)
+
+
+def test_window_statistics_for_several_windows():
+    data = _series()
+    
+    stats = RollingStatistics(data).window_statistics([5, 60])
+    
+    assert set(stats) == {5, 60}
+    pd.testing.assert_series_equal(stats[60]['mean'], data.rolling(60).mean(),
+                                   check_names=False, rtol=1e-9, atol=1e-9)
+
+
+def test_diagnostics_match_definitions():
+    data = _series()
+    window = 40
+    var = data.rolling(window).var()
+    mean = data.rolling(window).mean()
+    engine = RollingStatistics(data)
+    
+    pd.testing.assert_series_equal(engine.variance_ratio(window), var / var.shift(window),
+                                   check_names=False, rtol=1e-6)
+    expected_shift = (mean - mean.shift(window)) / np.sqrt((var + var.shift(window)) / window)
+    pd.testing.assert_series_equal(engine.mean_shift(window), expected_shift,
+                                   check_names=False, rtol=1e-6, atol=1e-9)
+
+
+def test_compensated_prefix_sum_beats_plain_cumsum():
+    values = np.full(1_000_000, 0.1)
+    exact = math.fsum(values)
+    
+    hi, lo = _compensated_prefix_sum(values)
+    
+    assert abs((hi + lo)[-1] - exact) < 1e-8 < abs(np.cumsum(values)[-1] - exact)
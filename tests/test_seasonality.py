@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer import seasonality
+from time_series_stationarity_analyzer.seasonality import decompose_series, detect_seasonal_periods
+
+
+def _seasonal(n, period, seed=0, noise=0.1):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    index = pd.date_range('2020-01-01', periods=n, freq='h')
+    values = np.sin(2 * np.pi * t / period) + 1e-4 * t + rng.normal(scale=noise, size=n)
+    return pd.Series(values, index=index, name='load')
+
+
+def test_detects_planted_period():
+    candidates = detect_seasonal_periods(_seasonal(2000, 24))
+    
+    assert candidates[0]['period'] == 24
+    assert candidates[0]['acf'] > 0.5
+
+
+def test_white_noise_has_no_period():
+    rng = np.random.default_rng(3)
+    assert detect_seasonal_periods(pd.Series(rng.normal(size=2000))) == []
+
+
+def test_detection_result_is_cached():
+    series = _seasonal(1000, 12)
+    assert detect_seasonal_periods(series) is detect_seasonal_periods(series)
+
+
+def test_short_series_uses_classical_decomposition():
+    series = _seasonal(1000, 24)
+    
+    result = decompose_series(series, periods=[24])
+    
+    assert result['method'] == 'classical'
+    assert result['periods'] == [24] and result['window'] == len(series)
+    total = result['trend'] + result['seasonal'] + result['resid']
+    pd.testing.assert_series_equal(total.dropna(), series[total.notna()], check_names=False)
+
+
+def test_long_series_is_downsampled_by_a_divisor_of_the_period():
+    series = _seasonal(60_000, 240)
+    
+    result = decompose_series(series, periods=[240], max_points=5000)
+    
+    assert result['downsample_factor'] > 1 and 240 % result['downsample_factor'] == 0
+    assert result['periods'] == [240]
+    assert len(result['trend']) == len(series)
+
+
+def test_short_period_on_long_series_uses_tail_window():
+    series = _seasonal(100_000, 24)
+    
+    result = decompose_series(series, periods=[24], max_points=5000)
+    
+    assert result['periods'] == [24] and result['dropped_periods'] == []
+    assert result['window'] == 5000 and result['downsample_factor'] == 1
+    assert result['trend'].index.equals(series.index[-5000:])
+    expected = np.sin(2 * np.pi * np.arange(len(series) - 5000, len(series)) / 24)
+    assert np.corrcoef(result['seasonal'].to_numpy(), expected)[0, 1] > 0.99
+
+
+def test_unrepresentable_periods_are_reported():
+    series = _seasonal(60_000, 240)
+    
+    result = decompose_series(series, periods=[5, 240], max_points=5000)
+    
+    assert result['periods'] == [240]
+    assert result['dropped_periods'] == [5]
+
+
+def test_period_longer_than_series_raises():
+    with pytest.raises(ValueError):
+        decompose_series(_seasonal(30, 24), periods=[24])
+
+
+def test_period_cache_is_safe_across_threads(monkeypatch):
+    # 缓存容量设为1，使各线程不断淘汰彼此的结果
+    monkeypatch.setattr(seasonality, '_PERIOD_CACHE_SIZE', 1)
+    series_list = [_seasonal(500, period, seed=period) for period in (6, 8, 10, 12)]
+    expected = [detect_seasonal_periods(series) for series in series_list]
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: detect_seasonal_periods(series_list[i % 4]), range(400)))
+    
+    assert results == [expected[i % 4] for i in range(400)]
+    assert len(seasonality._PERIOD_CACHE) == 1
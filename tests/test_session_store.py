@@ -0,0 +1,102 @@
+import gc
+import os
+
+import numpy as np
+import pandas as pd
+
+from time_series_stationarity_analyzer.session_store import ArtifactRegistry, ArtifactStore, estimate_size
+
+
+def _frame(n=1_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'a': rng.normal(size=n), 'b': rng.normal(size=n)})
+
+
+def test_estimate_size_of_containers():
+    frame = _frame()
+    array = np.zeros(1_000)
+    
+    assert estimate_size(frame) == frame.memory_usage(deep=True).sum()
+    assert estimate_size(array) == array.nbytes
+    assert estimate_size({'x': array, 'y': [array, array]}) > 3 * array.nbytes
+
+
+def test_spilled_artifact_reloads_unchanged(tmp_path):
+    frame = _frame()
+    store = ArtifactStore(session_budget=None, spill_dir=str(tmp_path))
+    store.put('frame', frame, spillable=True)
+    
+    assert store.evict('frame')
+    
+    entry = store.stats()['artifacts'][0]
+    assert entry['state'] == 'disk' and entry['policy'] == 'spill'
+    assert store.memory_bytes == 0 and len(os.listdir(tmp_path)) == 1
+    pd.testing.assert_frame_equal(store.get('frame'), frame)
+    assert store.stats_counts['reloads'] == 1 and store.memory_bytes == estimate_size(frame)
+
+
+def test_recomputable_artifact_is_dropped_and_recomputed():
+    calls = []
+    store = ArtifactStore(session_budget=None)
+    store.put('diff', _frame(), recompute=lambda: calls.append(1) or _frame())
+    
+    store.evict('diff')
+    
+    assert store.stats()['artifacts'][0]['state'] == 'dropped'
+    pd.testing.assert_frame_equal(store.get('diff'), _frame())
+    assert calls == [1] and store.stats_counts['recomputes'] == 1
+    store.get('diff')
+    assert calls == [1] and store.stats_counts['hits'] == 1
+
+
+def test_pinned_artifact_is_never_evicted():
+    store = ArtifactStore(session_budget=1)
+    store.put('pinned', _frame())
+    store.put('other', _frame(seed=1), spillable=True)
+    
+    assert not store.evict('pinned')
+    assert store.stats()['artifacts'][0]['state'] == 'memory'
+
+
+def test_session_budget_evicts_least_recently_used(tmp_path):
+    size = estimate_size(_frame())
+    store = ArtifactStore(session_budget=2 * size, spill_dir=str(tmp_path))
+    for name in ('first', 'second'):
+        store.put(name, _frame(), spillable=True)
+    store.get('first')
+    
+    store.put('third', _frame(), spillable=True)
+    
+    states = {entry['name']: entry['state'] for entry in store.stats()['artifacts']}
+    assert states == {'first': 'memory', 'second': 'disk', 'third': 'memory'}
+    assert store.memory_bytes <= 2 * size
+
+
+def test_global_budget_spans_stores():
+    size = estimate_size(_frame())
+    registry = ArtifactRegistry(global_budget=int(1.5 * size))
+    first = ArtifactStore(session_budget=None, registry=registry)
+    second = ArtifactStore(session_budget=None, registry=registry)
+    
+    first.put('a', _frame(), recompute=_frame)
+    second.put('b', _frame(), recompute=_frame)
+    
+    assert first.stats()['artifacts'][0]['state'] == 'dropped'
+    assert registry.total_bytes == size and registry.evictions == 1
+    
+    del second
+    gc.collect()
+    assert registry.total_bytes == 0
+
+
+def test_replacing_and_clearing_remove_spill_files(tmp_path):
+    store = ArtifactStore(session_budget=None, spill_dir=str(tmp_path))
+    store.put('frame', _frame(), spillable=True)
+    store.evict('frame')
+    spill_dir = os.path.join(tmp_path, os.listdir(tmp_path)[0])
+    
+    store.put('frame', _frame(seed=1), spillable=True)
+    
+    assert os.listdir(spill_dir) == []
+    store.clear()
+    assert os.listdir(tmp_path) == [] and 'frame' not in store
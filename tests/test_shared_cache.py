@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer import shared_cache
+from time_series_stationarity_analyzer.session_store import estimate_size
+from time_series_stationarity_analyzer.shared_cache import SharedCache
+
+
+def test_concurrent_requests_compute_once():
+    cache = SharedCache()
+    calls = []
+    lock = threading.Lock()
+    
+    def compute():
+        with lock:
+            calls.append(1)
+        time.sleep(0.1)
+        return pd.Series(np.arange(10.0))
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get_or_compute('series', 'key', compute), range(8)))
+    
+    assert len(calls) == 1
+    for result in results:
+        pd.testing.assert_series_equal(result, results[0])
+    counts = cache.stats()['namespaces']['series']
+    assert counts['misses'] == 1 and counts['hits'] == 7
+
+
+def test_failed_compute_is_not_cached():
+    cache = SharedCache()
+    
+    def fail():
+        raise RuntimeError('boom')
+    
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('ns', 'key', fail)
+    
+    assert cache.get_or_compute('ns', 'key', lambda: 1) == 1
+    assert cache.get_or_compute('ns', 'missing', lambda: None) is None
+    assert cache.stats()['namespaces']['ns']['entries'] == 1
+
+
+def test_cached_values_cannot_be_modified():
+    cache = SharedCache()
+    frame = pd.DataFrame({'a': [1.0, 2.0, 3.0]})
+    cache.put('frames', 'f', {'frame': frame, 'array': np.arange(3.0)})
+    
+    first = cache.get('frames', 'f')
+    first['frame'].loc[0, 'a'] = 100.0
+    
+    second = cache.get('frames', 'f')
+    assert second['frame'].loc[0, 'a'] == 1.0
+    with pytest.raises(TypeError):
+        second['extra'] = 1
+    with pytest.raises(ValueError):
+        second['array'][0] = 1.0
+
+
+def test_copies_are_deep_without_copy_on_write(monkeypatch):
+    # 未启用写时复制时浅拷贝与缓存共用数据，必须深拷贝
+    monkeypatch.setattr(shared_cache, '_copy_on_write', lambda: False)
+    cache = SharedCache()
+    cache.put('series', 's', pd.Series([1.0, 2.0]))
+    
+    copy = cache.get('series', 's')
+    copy.iloc[0] = 100.0
+    
+    assert cache.get('series', 's').iloc[0] == 1.0
+
+
+def test_entries_are_evicted_by_size():
+    value = np.zeros(1_000)
+    cache = SharedCache(max_bytes=int(2.5 * estimate_size(value)))
+    for key in ('a', 'b', 'c'):
+        cache.put('arrays', key, np.zeros(1_000))
+    
+    assert cache.get('arrays', 'a') is None
+    assert cache.get('arrays', 'c') is not None
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.stats()['namespaces']['arrays']['evictions'] == 1
+    
+    cache.put('arrays', 'huge', np.zeros(10_000))
+    assert cache.get('arrays', 'huge') is None
@@ -0,0 +1,125 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.sqlite_source import SQLiteSource, column_affinity
+
+EPOCH_NS = 1_700_000_000_123_456_789
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'data.db')
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE ticks (ts INTEGER, value REAL, label TEXT)")
+    connection.executemany("INSERT INTO ticks VALUES (?, ?, ?)",
+                           [(EPOCH_NS + 1_000 * i, float(i), f"x{i}") for i in range(1_000)])
+    connection.execute("CREATE TABLE daily (day TEXT, value NUMERIC)")
+    connection.executemany("INSERT INTO daily VALUES (?, ?)",
+                           [(f"2024-01-{day:02d}", day) for day in range(1, 32)])
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _add_table(path, sql, rows):
+    connection = sqlite3.connect(path)
+    connection.execute(sql)
+    connection.executemany(f"INSERT INTO t VALUES ({', '.join('?' * len(rows[0]))})", rows)
+    connection.commit()
+    connection.close()
+
+
+@pytest.mark.parametrize('declared, affinity', [
+    ('BIGINT', 'INTEGER'), ('VARCHAR(10)', 'TEXT'), ('', 'BLOB'), ('DOUBLE', 'REAL'), ('DECIMAL', 'NUMERIC'),
+])
+def test_column_affinity(declared, affinity):
+    assert column_affinity(declared) == affinity
+
+
+def test_metadata(db_path):
+    source = SQLiteSource(db_path)
+    
+    assert source.list_tables() == ['daily', 'ticks']
+    assert [column['affinity'] for column in source.list_columns('ticks')] == ['INTEGER', 'REAL', 'TEXT']
+    assert source.time_range('daily', 'day') == ('2024-01-01', '2024-01-31')
+    with pytest.raises(ValueError):
+        source.list_columns('missing')
+    with pytest.raises(FileNotFoundError):
+        SQLiteSource(db_path + '.missing')
+
+
+def test_nanosecond_epochs_are_read_exactly(db_path):
+    source = SQLiteSource(db_path)
+    
+    frame = source.read('ticks', ['ts', 'value'], chunk_size=64)
+    
+    assert frame['ts'].dtype == np.int64
+    np.testing.assert_array_equal(frame['ts'].to_numpy(), EPOCH_NS + 1_000 * np.arange(1_000))
+    parsed = source.read('ticks', ['ts', 'value'], time_col='ts', epoch_unit='auto')
+    assert parsed['ts'].nunique() == 1_000
+    np.testing.assert_array_equal(parsed['ts'].to_numpy().astype(np.int64), frame['ts'].to_numpy())
+
+
+def test_nanosecond_range_is_pushed_down_exactly(db_path):
+    source = SQLiteSource(db_path)
+    start = pd.Timestamp(EPOCH_NS + 100_000, unit='ns')
+    end = pd.Timestamp(EPOCH_NS + 200_000, unit='ns')
+    
+    frame = source.read('ticks', ['ts', 'value'], time_col='ts', start=start, end=end, epoch_unit='ns')
+    
+    assert source.count_rows('ticks', 'ts', start=start, end=end, epoch_unit='ns') == 101
+    assert len(frame) == 101 and frame['value'].tolist() == [float(i) for i in range(100, 201)]
+
+
+def test_text_times_are_filtered_in_sql(db_path):
+    source = SQLiteSource(db_path)
+    
+    frame = source.read('daily', ['day', 'value'], time_col='day', start='2024-01-10', end='2024-01-12 12:00')
+    
+    # 条件按推断出的格式（只含日期）下推，精确过滤在解析后进行
+    assert source.count_rows('daily', 'day', start='2024-01-10', end='2024-01-12 12:00') == 3
+    assert frame['day'].tolist() == list(pd.date_range('2024-01-10', periods=3))
+    assert frame['value'].tolist() == [10, 11, 12]
+
+
+def test_integer_columns_with_nulls_become_nullable(db_path):
+    _add_table(db_path, "CREATE TABLE t (ts INTEGER, value REAL)",
+               [(EPOCH_NS, 1.0), (None, 2.0), (EPOCH_NS + 1, None)])
+    
+    frame = SQLiteSource(db_path).read('t', ['ts', 'value'])
+    
+    assert str(frame['ts'].dtype) == 'Int64'
+    assert frame['ts'][2] - frame['ts'][0] == 1 and frame['ts'].isna().tolist() == [False, True, False]
+    assert np.isnan(frame['value'][2])
+
+
+def test_integer_columns_holding_reals_or_text(db_path):
+    _add_table(db_path, "CREATE TABLE t (a INTEGER, b INTEGER)", [(1, 1), (2.5, 2), (3, 'x')])
+    
+    frame = SQLiteSource(db_path).read('t', ['a', 'b'])
+    
+    # 存有小数的整数列不能截断，存有文本的列按对象读取
+    assert frame['a'].tolist() == [1.0, 2.5, 3.0]
+    assert frame['b'].tolist() == [1, 2, 'x']
+
+
+def test_time_column_must_be_selected(db_path):
+    with pytest.raises(ValueError):
+        SQLiteSource(db_path).read('ticks', ['value'], time_col='ts')
+    with pytest.raises(ValueError):
+        SQLiteSource(db_path).read('ticks', ['missing'])
+
+
+def test_schema_changes_invalidate_metadata(db_path):
+    source = SQLiteSource(db_path)
+    assert len(source.list_columns('ticks')) == 3
+    
+    connection = sqlite3.connect(db_path)
+    connection.execute("ALTER TABLE ticks ADD COLUMN extra REAL")
+    connection.commit()
+    connection.close()
+    
+    assert [column['name'] for column in source.list_columns('ticks')][-1] == 'extra'
@@ -0,0 +1,99 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from time_series_stationarity_analyzer.instrumentation import Instrumentation, timings_table
+from time_series_stationarity_analyzer.stationarity import (
+    COMPREHENSIVE_TESTS, StationarityAnalyzer, batch_find_difference_order, find_difference_order
+)
+
+
+def _random_walk(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='D')
+    return pd.Series(rng.normal(size=n).cumsum(), index=index, name='walk')
+
+
+def test_random_walk_needs_one_difference():
+    result = find_difference_order(_random_walk())
+    
+    assert result['order'] == 1
+    assert result['seasonal_order'] == 0
+    assert result['is_stationary']
+    assert [row['order'] for row in result['order_results']] == [0, 1]
+    np.testing.assert_allclose(result['differenced'].to_numpy(), np.diff(_random_walk().to_numpy()))
+
+
+def test_stationary_series_stops_at_order_zero():
+    rng = np.random.default_rng(1)
+    result = find_difference_order(pd.Series(rng.normal(size=500)))
+    
+    assert result['order'] == 0
+    assert len(result['order_results']) == 1
+
+
+def test_batch_search_omits_series_by_default():
+    walk = _random_walk()
+    results = batch_find_difference_order({'a': walk, 'b': walk * 2})
+    
+    assert set(results) == {'a', 'b'}
+    assert all(result['order'] == 1 and result['differenced'] is None for result in results.values())
+
+
+def test_incremental_difference_matches_numpy():
+    walk = _random_walk()
+    analyzer = StationarityAnalyzer(walk)
+    
+    for order in (2, 1, 3):
+        np.testing.assert_allclose(analyzer.difference_series(order).to_numpy(),
+                                   np.diff(walk.to_numpy(), n=order))
+
+
+def test_difference_series_returns_copy():
+    walk = _random_walk()
+    analyzer = StationarityAnalyzer(walk)
+    
+    first = analyzer.difference_series(1)
+    first.iloc[:] = 0.0
+    analyzer.difference_series(0).iloc[:] = 0.0
+    
+    np.testing.assert_allclose(analyzer.difference_series(1).to_numpy(), np.diff(walk.to_numpy()))
+    np.testing.assert_allclose(analyzer.difference_series(2).to_numpy(), np.diff(walk.to_numpy(), n=2))
+
+
+def test_parallel_matches_serial():
+    walk = _random_walk()
+    
+    serial = StationarityAnalyzer(walk).comprehensive_test()
+    parallel = StationarityAnalyzer(walk).comprehensive_test(parallel=True)
+    
+    for name in COMPREHENSIVE_TESTS:
+        assert parallel[name]['p_value'] == serial[name]['p_value']
+    assert parallel['overall_conclusion'] == serial['overall_conclusion']
+
+
+def test_async_api_matches_serial():
+    walk = _random_walk()
+    
+    result = asyncio.run(StationarityAnalyzer(walk).comprehensive_test_async())
+    
+    assert result['adf_test']['p_value'] == StationarityAnalyzer(walk).adf_test()['p_value']
+
+
+def test_parallel_with_memory_tracing_runs_serially():
+    analyzer = StationarityAnalyzer(_random_walk(), instrumentation=Instrumentation())
+    
+    result = analyzer.comprehensive_test(parallel=True)
+    
+    assert result['timings']['execution'] == 'serial'
+    assert all(result[name]['timings']['peak_memory'] is not None for name in COMPREHENSIVE_TESTS)
+    assert not any(row['memory_concurrent'] for row in timings_table(result['timings']))
+
+
+def test_parallel_without_memory_tracing_stays_parallel():
+    analyzer = StationarityAnalyzer(_random_walk(), instrumentation=Instrumentation(trace_memory=False))
+    
+    result = analyzer.comprehensive_test(parallel=True)
+    
+    assert result['timings']['execution'] == 'parallel'
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series_stationarity_analyzer.fractional import frac_diff_ffd
+from time_series_stationarity_analyzer.transforms import TransformCache, TransformPipeline
+
+
+def _series(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='D')
+    return pd.Series(np.exp(rng.normal(scale=0.01, size=n).cumsum()) * 100, index=index, name='price')
+
+
+class _NoData:
+    """代替原始数据，一旦被访问就说明没有复用缓存"""
+    
+    def dropna(self):
+        raise AssertionError("原始数据不应被重新读取")
+
+
+def test_steps_match_direct_computation():
+    data = _series()
+    pipeline = TransformPipeline(data).log().difference(2)
+    
+    expected = np.diff(np.log(data.to_numpy()), n=2)
+    
+    np.testing.assert_allclose(pipeline.evaluate().to_numpy(), expected)
+    assert pipeline.describe() == "对数变换 → 2阶差分"
+
+
+def test_seasonal_and_fractional_steps():
+    data = _series()
+    seasonal = TransformPipeline(data).seasonal_difference(7).evaluate()
+    fractional = TransformPipeline(data).frac_difference(0.4, threshold=1e-3).evaluate()
+    
+    np.testing.assert_allclose(seasonal.to_numpy(), data.to_numpy()[7:] - data.to_numpy()[:-7])
+    pd.testing.assert_series_equal(fractional, frac_diff_ffd(data, 0.4, 1e-3))
+
+
+def test_missing_values_are_dropped_before_first_step():
+    data = _series()
+    data.iloc[5] = np.nan
+    
+    result = TransformPipeline(data).difference().evaluate()
+    
+    np.testing.assert_allclose(result.to_numpy(), np.diff(data.dropna().to_numpy()))
+
+
+def test_shared_prefix_is_reused():
+    cache = TransformCache()
+    base = TransformPipeline(_series(), cache=cache).log()
+    
+    base.difference().evaluate()
+    assert (cache.hits, cache.misses) == (0, 2)
+    
+    base.detrend().evaluate()
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_cached_prefix_skips_raw_data():
+    data = _series()
+    first = TransformPipeline(data).log().difference()
+    expected = first.evaluate()
+    
+    again = TransformPipeline(_NoData(), first.steps, first.cache, first.fingerprint)
+    
+    pd.testing.assert_series_equal(again.evaluate(), expected)
+
+
+def test_cache_result_false_keeps_only_intermediates():
+    pipeline = TransformPipeline(_series()).log().difference()
+    
+    pipeline.evaluate(cache_result=False)
+    
+    assert len(pipeline.cache) == 1
+    assert pipeline.cache.total_bytes > 0
+
+
+def test_cache_evicts_by_count_and_bytes():
+    value = pd.Series(np.zeros(1000))
+    by_count = TransformCache(max_entries=2, max_bytes=None)
+    for key in 'abc':
+        by_count.put(key, value)
+    assert 'a' not in by_count and len(by_count) == 2
+    
+    size = by_count.total_bytes // 2
+    by_bytes = TransformCache(max_entries=10, max_bytes=int(size * 1.5))
+    by_bytes.put('a', value)
+    by_bytes.put('b', value)
+    assert 'a' not in by_bytes and 'b' in by_bytes
+    assert by_bytes.total_bytes == size
+    
+    by_bytes.put('big', pd.Series(np.zeros(10_000)))
+    assert 'big' not in by_bytes
+
+
+def test_log_rejects_non_positive_values():
+    with pytest.raises(ValueError):
+        TransformPipeline(_series() - 200).log().evaluate()
@@ -0,0 +1,320 @@
+"""
+高频数据聚合模块
+在检验之前将逐笔（tick）数据按固定周期聚合为K线，
+在有序的整数时间戳上一次遍历分组，并支持分块处理超出内存的文件
+"""
+
+from typing import Dict, Any, Optional, List, Union
+
+import numpy as np
+import pandas as pd
+
+from .utils import parse_datetime_column
+
+# 支持的聚合方式
+AGGREGATIONS = ('last', 'first', 'mean', 'sum', 'count', 'vwap', 'ohlc')
+
+# 每根K线保存的中间量，分块处理时可以逐项合并
+_BAR_FIELDS = ('open', 'high', 'low', 'close', 'sum', 'count', 'weight', 'weighted_sum')
+
+
+def _empty_bars() -> Dict[str, np.ndarray]:
+    bars = {field: np.empty(0) for field in _BAR_FIELDS}
+    bars['bar'] = np.empty(0, dtype=np.int64)
+    bars['count'] = np.empty(0, dtype=np.int64)
+    return bars
+
+
+def _reduce_bars(bar_ids: np.ndarray, values: np.ndarray,
+                 weights: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    按有序的K线编号分组计算各根K线的中间量
+    
+    编号单调不减，因此只需找出编号变化的位置，再用 reduceat 在各区段上归约，
+    不需要哈希分组
+    """
+    n = len(bar_ids)
+    if n == 0:
+        return _empty_bars()
+    starts = np.flatnonzero(np.concatenate(([True], bar_ids[1:] != bar_ids[:-1])))
+    ends = np.append(starts[1:], n)
+    
+    bars = {
+        'bar': bar_ids[starts],
+        'open': values[starts],
+        'high': np.maximum.reduceat(values, starts),
+        'low': np.minimum.reduceat(values, starts),
+        'close': values[ends - 1],
+        'sum': np.add.reduceat(values, starts),
+        'count': ends - starts,
+    }
+    if weights is not None:
+        bars['weight'] = np.add.reduceat(weights, starts)
+        bars['weighted_sum'] = np.add.reduceat(values * weights, starts)
+    else:
+        bars['weight'] = bars['count'].astype(float)
+        # 各字段必须是独立的数组：合并跨块的K线时会逐字段原地累加
+        bars['weighted_sum'] = bars['sum'].copy()
+    return bars
+
+
+def _merge_first(pending: Dict[str, np.ndarray], bars: Dict[str, np.ndarray]) -> None:
+    """将上一块末尾未完成的K线并入本块的第一根K线（原地修改 bars）"""
+    bars['open'][0] = pending['open'][0]
+    bars['high'][0] = max(bars['high'][0], pending['high'][0])
+    bars['low'][0] = min(bars['low'][0], pending['low'][0])
+    for field in ('sum', 'count', 'weight', 'weighted_sum'):
+        bars[field][0] += pending[field][0]
+
+
+def _take(bars: Dict[str, np.ndarray], selector) -> Dict[str, np.ndarray]:
+    """按切片取出部分K线（复制，避免与本块的数组共用内存）"""
+    return {field: values[selector].copy() for field, values in bars.items()}
+
+
+class TickAggregator:
+    """
+    分块K线聚合器
+    
+    每次 update() 处理一块按时间排列的逐笔数据，完成的K线保留在内存中，
+    块末尾可能尚未结束的K线暂存，与下一块的开头合并。K线数量通常远小于
+    逐笔数据量，因此可以处理超出内存的数据。K线左端对齐到1970-01-01
+    （带时区时为UTC）起的整数个周期。
+    """
+    
+    def __init__(self, bar: Union[str, pd.Timedelta], how: str = 'last', name: Optional[str] = None):
+        """
+        初始化聚合器
+        
+        Args:
+            bar: K线周期，如 '1min'、'5s'、'1h'
+            how: 聚合方式：'last'、'first'、'mean'、'sum'、'count'、'vwap'（按权重加权平均）
+                 或 'ohlc'（返回开高低收）
+            name: 结果序列名称
+        """
+        if how not in AGGREGATIONS:
+            raise ValueError(f"不支持的聚合方式: {how}")
+        self.bar = pd.Timedelta(bar)
+        if self.bar <= pd.Timedelta(0):
+            raise ValueError("K线周期必须为正")
+        self.how = how
+        self.name = name
+        self.n_ticks = 0
+        self._unit: Optional[str] = None
+        self._tz = None
+        self._bar_size: Optional[int] = None
+        self._weighted = False
+        self._completed: List[Dict[str, np.ndarray]] = []
+        self._pending: Optional[Dict[str, np.ndarray]] = None
+    
+    def update(self, timestamps: pd.DatetimeIndex, values: np.ndarray,
+               weights: Optional[np.ndarray] = None) -> None:
+        """
+        处理一块逐笔数据
+        
+        Args:
+            timestamps: 时间戳；块内无序时会先排序，但各块之间必须按时间递增
+            values: 数值（如成交价）
+            weights: 权重（如成交量），'vwap' 方式必须提供
+        
+        Raises:
+            ValueError: 缺少权重，或本块数据早于上一块的最后一根K线
+        """
+        if self.how == 'vwap' and weights is None:
+            raise ValueError("'vwap' 聚合方式需要提供权重")
+        timestamps = pd.DatetimeIndex(timestamps)
+        values = np.asarray(values, dtype=float)
+        weights = np.asarray(weights, dtype=float) if weights is not None else None
+        
+        if self._unit is None:
+            self._unit, self._tz = timestamps.unit, timestamps.tz
+            self._weighted = weights is not None
+            self._bar_size = int(self.bar / pd.Timedelta(1, unit=self._unit))
+            if self._bar_size == 0:
+                raise ValueError(f"K线周期小于时间戳精度 ({self._unit})")
+        elif timestamps.unit != self._unit:
+            timestamps = timestamps.as_unit(self._unit)
+        
+        # 去掉时间或数值缺失的记录
+        valid = ~timestamps.isna() & ~np.isnan(values)
+        if weights is not None:
+            valid &= ~np.isnan(weights)
+        if not valid.all():
+            timestamps, values = timestamps[valid], values[valid]
+            weights = weights[valid] if weights is not None else None
+        if len(values) == 0:
+            return
+        
+        ticks = timestamps.asi8
+        if not timestamps.is_monotonic_increasing:
+            order = np.argsort(ticks, kind='stable')
+            ticks, values = ticks[order], values[order]
+            weights = weights[order] if weights is not None else None
+        
+        bars = _reduce_bars(ticks // self._bar_size, values, weights)
+        self.n_ticks += len(values)
+        
+        if self._pending is not None:
+            pending_bar = self._pending['bar'][0]
+            if bars['bar'][0] < pending_bar:
+                raise ValueError("分块数据必须按时间递增排列")
+            if bars['bar'][0] == pending_bar:
+                _merge_first(self._pending, bars)
+            else:
+                self._completed.append(self._pending)
+        
+        self._completed.append(_take(bars, slice(None, -1)))
+        self._pending = _take(bars, slice(-1, None))
+    
+    def result(self) -> Union[pd.Series, pd.DataFrame]:
+        """
+        获取聚合结果（包含最后一根K线）
+        
+        Returns:
+            'ohlc' 方式返回包含 open、high、low、close、count（及 volume）的DataFrame，
+            其余方式返回以K线起始时间为索引的序列
+        """
+        parts = self._completed + ([self._pending] if self._pending is not None else [])
+        if parts:
+            bars = {field: np.concatenate([part[field] for part in parts]) for field in parts[0]}
+        else:
+            bars = _empty_bars()
+        
+        if self._bar_size is not None:
+            index = pd.to_datetime(bars['bar'] * self._bar_size, unit=self._unit)
+            if self._tz is not None:
+                index = index.tz_localize('UTC').tz_convert(self._tz)
+        else:
+            index = pd.DatetimeIndex([])
+        
+        if self.how == 'ohlc':
+            frame = pd.DataFrame({
+                'open': bars['open'], 'high': bars['high'], 'low': bars['low'],
+                'close': bars['close'], 'count': bars['count']
+            }, index=index)
+            if self._weighted:
+                frame['volume'] = bars['weight']
+            return frame
+        
+        if self.how == 'mean':
+            values = bars['sum'] / bars['count']
+        elif self.how == 'vwap':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values = bars['weighted_sum'] / bars['weight']
+        elif self.how == 'last':
+            values = bars['close']
+        elif self.how == 'first':
+            values = bars['open']
+        else:
+            values = bars[self.how]
+        return pd.Series(values, index=index, name=self.name)
+
+
+def aggregate_ticks(timestamps: pd.DatetimeIndex, values: np.ndarray, bar: Union[str, pd.Timedelta],
+                    how: str = 'last', weights: Optional[np.ndarray] = None,
+                    name: Optional[str] = None) -> Union[pd.Series, pd.DataFrame]:
+    """
+    将内存中的逐笔数据聚合为K线
+    
+    Args:
+        timestamps: 时间戳
+        values: 数值
+        bar: K线周期，如 '1min'
+        how: 聚合方式（见 TickAggregator）
+        weights: 权重（'vwap' 方式必须提供）
+        name: 结果序列名称
+    
+    Returns:
+        聚合后的序列（'ohlc' 方式为DataFrame）
+    """
+    aggregator = TickAggregator(bar, how, name=name)
+    aggregator.update(timestamps, values, weights)
+    return aggregator.result()
+
+
+def aggregate_series(data: pd.Series, bar: Union[str, pd.Timedelta], how: str = 'last',
+                     weights: Optional[pd.Series] = None) -> Union[pd.Series, pd.DataFrame]:
+    """
+    将以时间为索引的逐笔序列聚合为K线
+    
+    Args:
+        data: 逐笔序列
+        bar: K线周期
+        how: 聚合方式（见 TickAggregator）
+        weights: 与 data 对齐的权重序列
+    
+    Returns:
+        聚合后的序列（'ohlc' 方式为DataFrame）
+    """
+    return aggregate_ticks(
+        data.index, data.to_numpy(dtype=float), bar, how,
+        weights.to_numpy(dtype=float) if weights is not None else None, name=data.name
+    )
+
+
+def _update_from_frame(aggregator: TickAggregator, df: pd.DataFrame, time_col: str, value_col: str,
+                       weight_col: Optional[str], epoch_unit: Optional[str]) -> None:
+    timestamps = parse_datetime_column(df[time_col], epoch_unit=epoch_unit)
+    values = pd.to_numeric(df[value_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    weights = None
+    if weight_col is not None:
+        weights = pd.to_numeric(df[weight_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    aggregator.update(timestamps, values, weights)
+
+
+def aggregate_frame(df: pd.DataFrame, time_col: str, value_col: str, bar: Union[str, pd.Timedelta],
+                    how: str = 'last', weight_col: Optional[str] = None,
+                    epoch_unit: Optional[str] = None) -> Union[pd.Series, pd.DataFrame]:
+    """
+    将数据框中的逐笔数据聚合为K线
+    
+    时间列的解析方式与 validate_time_series_data 相同，缺失的时间、数值或权重被忽略，
+    同一时间戳的多笔数据全部参与聚合
+    
+    Args:
+        df: 数据框
+        time_col: 时间列名
+        value_col: 数值列名
+        bar: K线周期
+        how: 聚合方式（见 TickAggregator）
+        weight_col: 权重列名（'vwap' 方式必须提供）
+        epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
+    
+    Returns:
+        聚合后的序列（'ohlc' 方式为DataFrame）
+    """
+    aggregator = TickAggregator(bar, how, name=value_col)
+    _update_from_frame(aggregator, df, time_col, value_col, weight_col, epoch_unit)
+    return aggregator.result()
+
+
+def aggregate_csv(path_or_buffer: Any, time_col: str, value_col: str, bar: Union[str, pd.Timedelta],
+                  how: str = 'last', weight_col: Optional[str] = None,
+                  epoch_unit: Optional[str] = None, chunksize: int = 1_000_000,
+                  **read_csv_kwargs) -> Union[pd.Series, pd.DataFrame]:
+    """
+    分块读取CSV文件中的逐笔数据并聚合为K线
+    
+    只读取需要的列，每次读入 chunksize 行，内存占用取决于块大小和K线数量，
+    与文件大小无关。文件须按时间排列（块内的局部乱序可以接受）
+    
+    Args:
+        path_or_buffer: 文件路径或文件对象
+        time_col: 时间列名
+        value_col: 数值列名
+        bar: K线周期
+        how: 聚合方式（见 TickAggregator）
+        weight_col: 权重列名
+        epoch_unit: 数值时间列的时间戳单位
+        chunksize: 每块的行数
+        **read_csv_kwargs: 传递给 pd.read_csv 的其他参数（如 encoding）
+    
+    Returns:
+        聚合后的序列（'ohlc' 方式为DataFrame）
+    """
+    columns = [time_col, value_col] + ([weight_col] if weight_col is not None else [])
+    aggregator = TickAggregator(bar, how, name=value_col)
+    with pd.read_csv(path_or_buffer, usecols=columns, chunksize=chunksize, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            _update_from_frame(aggregator, chunk, time_col, value_col, weight_col, epoch_unit)
+    return aggregator.result()
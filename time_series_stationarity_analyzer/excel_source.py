@@ -0,0 +1,301 @@
+"""
+Excel数据源模块
+只读取工作表名和表头即可列出工作表和列；数据按所选列读取，安装了 python-calamine
+时使用 calamine 引擎，否则以 openpyxl 只读模式逐行流式读取。读取结果按列缓存为
+Parquet文件，相同文件再次分析时不再解析Excel
+"""
+
+import hashlib
+import importlib.util
+import io
+import os
+import tempfile
+import zipfile
+from itertools import islice
+from xml.etree import ElementTree
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+# 支持的Excel文件扩展名
+EXCEL_EXTENSIONS = ('xlsx', 'xlsm', 'xls')
+
+# 列式缓存的默认目录
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'tssa_excel_cache')
+# 缓存目录的总大小上限（字节），超出时按最近使用时间删除最旧的缓存文件
+DEFAULT_CACHE_BYTES = 1024 * 1024 * 1024
+
+# 预览读取的数据行数（用于选择列和判断列类型）
+PREVIEW_ROWS = 100
+
+# xlsx 工作簿XML的命名空间
+_SPREADSHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+# 文件内容（字节）或文件路径
+ExcelSource = Union[bytes, str]
+
+
+def excel_engine(extension: str = 'xlsx') -> str:
+    """
+    选择读取引擎：优先使用 calamine，其次 openpyxl（.xls 使用 xlrd）
+    
+    Args:
+        extension: 文件扩展名
+    
+    Returns:
+        引擎名称
+    """
+    if importlib.util.find_spec('python_calamine') is not None:
+        return 'calamine'
+    return 'xlrd' if extension.lower() == 'xls' else 'openpyxl'
+
+
+def _open(source: ExcelSource):
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def _source_key(source: ExcelSource) -> str:
+    """文件内容的指纹（路径按大小和修改时间计算）"""
+    hasher = hashlib.blake2b(digest_size=16)
+    if isinstance(source, (bytes, bytearray)):
+        hasher.update(source)
+    else:
+        stat = os.stat(source)
+        hasher.update(f"{os.path.abspath(source)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return hasher.hexdigest()
+
+
+def _header_names(row: Tuple) -> List[Any]:
+    """与 pandas 一致地命名表头：空表头为 'Unnamed: i'，重复表头追加 .1、.2"""
+    names, seen = [], {}
+    for position, value in enumerate(row):
+        name = f"Unnamed: {position}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _openpyxl_rows(source: ExcelSource, sheet: Optional[str]) -> Iterator[Tuple]:
+    """以只读模式逐行读取工作表的单元格值"""
+    import openpyxl
+    
+    workbook = openpyxl.load_workbook(_open(source), read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        yield from worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def list_sheets(source: ExcelSource, extension: str = 'xlsx') -> List[str]:
+    """
+    列出工作表名（只读取工作簿结构）
+    
+    Args:
+        source: 文件内容或路径
+        extension: 文件扩展名
+    
+    Returns:
+        工作表名列表
+    """
+    engine = excel_engine(extension)
+    if engine == 'openpyxl':
+        # 直接读取压缩包中的工作簿XML，不解析任何工作表
+        with zipfile.ZipFile(_open(source)) as archive:
+            root = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        return [sheet.get('name') for sheet in root.iter(f'{_SPREADSHEET_NS}sheet')]
+    with pd.ExcelFile(_open(source), engine=engine) as workbook:
+        return [str(name) for name in workbook.sheet_names]
+
+
+def read_preview(source: ExcelSource, sheet: Optional[str] = None, extension: str = 'xlsx',
+                 nrows: int = PREVIEW_ROWS) -> pd.DataFrame:
+    """
+    读取表头和前 nrows 行
+    
+    Args:
+        source: 文件内容或路径
+        sheet: 工作表名，默认为第一个工作表
+        extension: 文件扩展名
+        nrows: 读取的数据行数
+    
+    Returns:
+        预览数据框
+    """
+    engine = excel_engine(extension)
+    if engine != 'openpyxl':
+        return pd.read_excel(_open(source), sheet_name=sheet or 0, nrows=nrows, engine=engine)
+    
+    rows = _openpyxl_rows(source, sheet)
+    try:
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        names = _header_names(header)
+        width = len(names)
+        records = [tuple(row[:width]) + (None,) * (width - len(row)) for row in islice(rows, nrows)]
+    finally:
+        rows.close()
+    return pd.DataFrame.from_records(records, columns=names)
+
+
+def _read_columns(source: ExcelSource, sheet: Optional[str], extension: str,
+                  columns: Optional[List[Any]]) -> pd.DataFrame:
+    """从Excel中读取指定列（None 表示全部列）"""
+    engine = excel_engine(extension)
+    if engine != 'openpyxl':
+        frame = pd.read_excel(_open(source), sheet_name=sheet or 0, usecols=columns, engine=engine)
+        return frame if columns is None else frame[columns]
+    
+    rows = _openpyxl_rows(source, sheet)
+    try:
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame(columns=columns)
+        names = _header_names(header)
+        if columns is None:
+            columns = names
+        missing = [col for col in columns if col not in names]
+        if missing:
+            raise ValueError(f"列 {missing} 不存在")
+        positions = [names.index(col) for col in columns]
+        width = max(positions) + 1
+        # 逐行只保留所选列，不在内存中保留整行
+        records = [
+            tuple(row[position] for position in positions) if len(row) >= width
+            else tuple(row[position] if position < len(row) else None for position in positions)
+            for row in rows
+        ]
+    finally:
+        rows.close()
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def _parquet_available() -> bool:
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def _read_cache(path: str, wanted: List[str]) -> Tuple[Optional[pd.DataFrame], List[str]]:
+    """
+    读取缓存文件
+    
+    Returns:
+        (已缓存的数据, 缺少的列)；缓存文件不存在或无法读取时视为未命中
+    """
+    import pyarrow.parquet as pq
+    
+    try:
+        cached_columns = pq.read_schema(path).names
+        missing = [col for col in wanted if col not in cached_columns]
+        if not missing:
+            frame = pd.read_parquet(path, columns=wanted)
+        else:
+            frame = pd.read_parquet(path)
+    except FileNotFoundError:
+        return None, wanted
+    except Exception:
+        # 损坏或写了一半的缓存文件当作未命中，随后会被重写
+        return None, wanted
+    try:
+        # 更新访问时间，清理缓存目录时按最近使用时间淘汰
+        os.utime(path)
+    except OSError:
+        pass
+    return frame, missing
+
+
+def _write_cache(path: str, frame: pd.DataFrame, cache_dir: str, max_bytes: Optional[int]) -> None:
+    """写入缓存文件（先写入唯一的临时文件再原子替换），失败时忽略"""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            frame.to_parquet(handle, index=False)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return
+    if max_bytes is not None:
+        _prune_cache(cache_dir, max_bytes, keep=path)
+
+
+def _prune_cache(cache_dir: str, max_bytes: int, keep: str) -> None:
+    """缓存目录超过大小上限时按最近使用时间删除最旧的缓存文件"""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.parquet') and entry.path != keep:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    try:
+        total = os.path.getsize(keep) + sum(size for _, size, _ in entries)
+    except OSError:
+        return
+    for _, size, entry_path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(entry_path)
+        except OSError:
+            continue
+        total -= size
+
+
+def read_excel_columns(source: ExcelSource, sheet: Optional[str] = None, columns: Optional[List[Any]] = None,
+                       extension: str = 'xlsx', cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                       max_cache_bytes: Optional[int] = DEFAULT_CACHE_BYTES) -> pd.DataFrame:
+    """
+    读取工作表中的指定列，并按列缓存为Parquet文件
+    
+    每个 (文件内容, 工作表) 对应一个缓存文件，其中保存已经读取过的列；
+    请求的列都已缓存时直接从Parquet按列读取，否则只从Excel读取缺少的列
+    并合并写回缓存。列名不全是字符串、未安装 pyarrow 或数据无法写入
+    Parquet（如同一列混有数字和文本）时不使用缓存。无法读取的缓存文件
+    视为未命中，缓存目录超过 max_cache_bytes 时删除最久未使用的文件
+    
+    Args:
+        source: 文件内容或路径
+        sheet: 工作表名，默认为第一个工作表
+        columns: 需要读取的列，默认为全部列
+        extension: 文件扩展名
+        cache_dir: 缓存目录，None 表示不缓存
+        max_cache_bytes: 缓存目录的总大小上限，None 表示不限制
+    
+    Returns:
+        数据框（列顺序与 columns 一致）
+    """
+    if sheet is None:
+        sheet = list_sheets(source, extension)[0]
+    columns = list(dict.fromkeys(columns)) if columns is not None else None
+    
+    wanted = columns if columns is not None else list(read_preview(source, sheet, extension, nrows=0).columns)
+    if cache_dir is None or not _parquet_available() or not all(isinstance(col, str) for col in wanted):
+        return _read_columns(source, sheet, extension, columns)
+    
+    sheet_key = hashlib.blake2b(str(sheet).encode(), digest_size=8).hexdigest()
+    path = os.path.join(cache_dir, f"{_source_key(source)}_{sheet_key}.parquet")
+    
+    cached, missing = _read_cache(path, wanted)
+    if cached is not None and not missing:
+        return cached
+    
+    frame = _read_columns(source, sheet, extension, missing)
+    if cached is not None:
+        if len(cached) == len(frame):
+            frame = pd.concat([cached, frame], axis=1)
+        else:
+            # 缓存与文件不一致时丢弃缓存，重新读取全部所需的列
+            frame = _read_columns(source, sheet, extension, wanted)
+    
+    _write_cache(path, frame, cache_dir, max_cache_bytes)
+    return frame[wanted]
@@ -0,0 +1,202 @@
+"""
+分数阶差分模块
+提供固定窗口分数阶差分 (FFD) 及最小平稳差分阶数搜索
+"""
+
+import pandas as pd
+import numpy as np
+from functools import lru_cache
+from scipy.signal import oaconvolve
+from typing import Dict, Any, Optional, List
+
+from .stationarity import StationarityAnalyzer
+
+
+@lru_cache(maxsize=256)
+def _cached_ffd_weights(d: float, threshold: float, max_width: Optional[int]) -> np.ndarray:
+    """按 (d, threshold, max_width) 缓存的FFD权重"""
+    weights = [1.0]
+    k = 1
+    while max_width is None or k < max_width:
+        w = -weights[-1] * (d - k + 1) / k
+        if abs(w) < threshold:
+            break
+        weights.append(w)
+        k += 1
+    
+    result = np.array(weights)
+    result.setflags(write=False)
+    return result
+
+
+def get_ffd_weights(d: float, threshold: float = 1e-4,
+                    max_width: Optional[int] = None) -> np.ndarray:
+    """
+    计算固定窗口分数阶差分的权重
+    
+    权重按 w_k = -w_{k-1} * (d - k + 1) / k 递推，绝对值低于阈值时截断
+    
+    Args:
+        d: 差分阶数（可为小数）
+        threshold: 权重截断阈值
+        max_width: 最大窗口宽度，None表示仅按阈值截断
+    
+    Returns:
+        权重数组（只读），第0个元素对应当前时刻
+    """
+    # 非正阈值下权重永远不会低于阈值，必须由窗口宽度截断
+    if threshold <= 0 and max_width is None:
+        raise ValueError("threshold 必须大于0，或指定 max_width")
+    # 对d取整到固定精度，避免浮点误差导致缓存失效
+    return _cached_ffd_weights(round(float(d), 10), float(threshold), max_width)
+
+
+def frac_diff_ffd(data: pd.Series, d: float, threshold: float = 1e-4,
+                  max_width: Optional[int] = None) -> pd.Series:
+    """
+    固定窗口分数阶差分
+    
+    使用FFT重叠相加卷积计算，复杂度为 O(n log n)
+    
+    Args:
+        data: 时间序列数据
+        d: 差分阶数（可为小数）
+        threshold: 权重截断阈值
+        max_width: 最大窗口宽度
+    
+    Returns:
+        分数阶差分后的序列，前 (窗口宽度-1) 个点被舍弃
+    """
+    series = data.dropna()
+    weights = get_ffd_weights(d, threshold, max_width)
+    width = len(weights)
+    
+    if len(series) < width:
+        return pd.Series(dtype=float, name=series.name)
+    
+    values = series.to_numpy(dtype=float)
+    differenced = oaconvolve(values, weights, mode='valid')
+    return pd.Series(differenced, index=series.index[width - 1:], name=series.name)
+
+
+def frac_diff_ffd_frame(df: pd.DataFrame, d: float, threshold: float = 1e-4,
+                        max_width: Optional[int] = None) -> pd.DataFrame:
+    """
+    对DataFrame的每一列进行固定窗口分数阶差分
+    
+    各列均无缺失值时，所有列在一次二维FFT卷积中完成
+    
+    Args:
+        df: 数值型DataFrame，每列为一个序列
+        d: 差分阶数（可为小数）
+        threshold: 权重截断阈值
+        max_width: 最大窗口宽度
+    
+    Returns:
+        分数阶差分后的DataFrame
+    """
+    weights = get_ffd_weights(d, threshold, max_width)
+    width = len(weights)
+    
+    if df.isna().to_numpy().any():
+        return pd.DataFrame({
+            col: frac_diff_ffd(df[col], d, threshold, max_width) for col in df.columns
+        })
+    
+    if len(df) < width:
+        return pd.DataFrame(columns=df.columns, dtype=float)
+    
+    values = df.to_numpy(dtype=float)
+    differenced = oaconvolve(values, weights[:, None], mode='valid', axes=0)
+    return pd.DataFrame(differenced, index=df.index[width - 1:], columns=df.columns)
+
+
+def find_min_ffd_order(data: pd.Series, threshold: float = 1e-4,
+                       max_d: float = 1.0, tolerance: float = 0.01,
+                       p_value: float = 0.05, regression: str = 'c',
+                       max_width: Optional[int] = None) -> Dict[str, Any]:
+    """
+    搜索使序列通过ADF检验的最小分数阶差分阶数
+    
+    ADF的p值随d单调下降，因此在 [0, max_d] 上二分搜索，精度为 tolerance
+    
+    Args:
+        data: 时间序列数据
+        threshold: 权重截断阈值
+        max_d: 搜索上限
+        tolerance: 搜索精度
+        p_value: ADF检验显著性水平
+        regression: ADF回归类型
+        max_width: 最大窗口宽度
+    
+    Returns:
+        搜索结果字典，d为None表示在搜索范围内未找到
+    """
+    series = data.dropna()
+    evaluated: Dict[float, Dict[str, Any]] = {}
+    
+    def evaluate(d: float) -> bool:
+        differenced = frac_diff_ffd(series, d, threshold, max_width)
+        if len(differenced) < 10:
+            evaluated[d] = {'d': d, 'p_value': None, 'test_statistic': None,
+                            'n_obs': len(differenced), 'is_stationary': False}
+            return False
+        adf = StationarityAnalyzer(differenced).adf_test(regression=regression)
+        passed = adf.get('p_value') is not None and adf['p_value'] < p_value
+        evaluated[d] = {
+            'd': d,
+            'p_value': adf.get('p_value'),
+            'test_statistic': adf.get('test_statistic'),
+            'n_obs': len(differenced),
+            'is_stationary': passed
+        }
+        return passed
+    
+    if evaluate(0.0):
+        best = 0.0
+    elif not evaluate(max_d):
+        best = None
+    else:
+        low, high = 0.0, max_d
+        while high - low > tolerance:
+            mid = round((low + high) / 2, 10)
+            if evaluate(mid):
+                high = mid
+            else:
+                low = mid
+        best = high
+    
+    history: List[Dict[str, Any]] = [evaluated[d] for d in sorted(evaluated)]
+    return {
+        'd': best,
+        'threshold': threshold,
+        'window_width': len(get_ffd_weights(best, threshold, max_width)) if best is not None else None,
+        'adf_result': evaluated[best] if best is not None else None,
+        'history': history
+    }
+
+
+def batch_find_min_ffd_order(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """
+    批量搜索DataFrame各列的最小分数阶差分阶数
+    
+    Args:
+        df: 数值型DataFrame，每列为一个序列
+        **kwargs: 传递给 find_min_ffd_order 的参数
+    
+    Returns:
+        每列一行的汇总表
+    """
+    rows = []
+    for col in df.columns:
+        search = find_min_ffd_order(df[col], **kwargs)
+        adf = search['adf_result'] or {}
+        rows.append({
+            'series': col,
+            'd': search['d'],
+            'window_width': search['window_width'],
+            'adf_p_value': adf.get('p_value'),
+            'adf_statistic': adf.get('test_statistic'),
+            'n_evaluations': len(search['history'])
+        })
+    return pd.DataFrame(rows).set_index('series')
@@ -0,0 +1,285 @@
+"""
+时间频率分析模块
+在时间索引的整数视图上推断主导采样间隔，一次遍历检测缺口和不规则区间，
+并可将序列规整为等间隔序列后再进行检验
+"""
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 分析结果缓存：(索引指纹, 参数) -> 分析结果
+_FREQUENCY_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_FREQUENCY_CACHE_SIZE = 32
+_FREQUENCY_CACHE_LOCK = threading.Lock()
+
+# 推断主导间隔时的样本大小
+DEFAULT_STEP_SAMPLE_SIZE = 2048
+
+# 主导间隔在全部间隔中的占比低于该值时，认为样本不具代表性
+_MIN_STEP_SHARE = 0.5
+
+# 按月计的采样：主导间隔不短于28天且占比不高时改为按日历月比较
+_CALENDAR_MIN_DAYS = 28
+_CALENDAR_MAX_SHARE = 0.9
+
+# 规整时缺失值的填充方式
+FILL_METHODS = ('interpolate', 'ffill', 'none')
+
+# 月末频率的别名：pandas 2.2 起为 'ME'，此前为 'M'
+_MONTH_END_ALIAS = 'ME' if tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2) else 'M'
+
+
+# 索引对象 -> 指纹；索引不可变，同一对象（如页面重新运行时的会话数据）无需重新哈希
+_INDEX_KEYS: Dict[int, Tuple["weakref.ref[pd.Index]", str]] = {}
+
+
+def _index_key(index: pd.DatetimeIndex) -> str:
+    """时间索引的内容指纹"""
+    entry = _INDEX_KEYS.get(id(index))
+    if entry is not None and entry[0]() is index:
+        return entry[1]
+    
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{len(index)}|{index.dtype}".encode())
+    hasher.update(np.ascontiguousarray(index.asi8).tobytes())
+    key = hasher.hexdigest()
+    _INDEX_KEYS[id(index)] = (weakref.ref(index), key)
+    weakref.finalize(index, _INDEX_KEYS.pop, id(index), None)
+    return key
+
+
+def _frequency_label(step_days: float) -> str:
+    """按间隔天数给出频率类别（与 infer_frequency 的类别一致）"""
+    if step_days <= 1:
+        return "Daily"
+    elif step_days <= 7:
+        return "Weekly"
+    elif step_days <= 31:
+        return "Monthly"
+    elif step_days <= 92:
+        return "Quarterly"
+    elif step_days <= 366:
+        return "Yearly"
+    return "Irregular"
+
+
+def dominant_step(steps: np.ndarray, sample_size: int = DEFAULT_STEP_SAMPLE_SIZE) -> Tuple[int, float]:
+    """
+    求主导间隔
+    
+    先在随机抽取的间隔样本上求众数，再在全部间隔上统计该值的占比加以验证；
+    占比过低时说明样本不具代表性，改为在全部间隔上求众数
+    
+    Args:
+        steps: 相邻时间戳之差（整数）
+        sample_size: 样本大小
+    
+    Returns:
+        (主导间隔, 在全部间隔中的占比)，没有正间隔时返回 (0, 0.0)
+    """
+    if len(steps) == 0:
+        return 0, 0.0
+    
+    if len(steps) > sample_size:
+        sample = steps[np.random.default_rng(0).integers(0, len(steps), sample_size)]
+    else:
+        sample = steps
+    sample = sample[sample > 0]
+    if sample.size == 0:
+        sample = steps[steps > 0]
+        if sample.size == 0:
+            return 0, 0.0
+    
+    values, counts = np.unique(sample, return_counts=True)
+    step = values[np.argmax(counts)]
+    share = np.count_nonzero(steps == step) / len(steps)
+    
+    if share < _MIN_STEP_SHARE and len(steps) > sample_size:
+        values, counts = np.unique(steps[steps > 0], return_counts=True)
+        step = values[np.argmax(counts)]
+        share = counts.max() / len(steps)
+    return int(step), float(share)
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """布尔数组中连续为True的区段: (起始位置, 结束位置（不含）)"""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def analyze_frequency(index: pd.Index, sample_size: int = DEFAULT_STEP_SAMPLE_SIZE,
+                      max_spans: int = 1000) -> Dict[str, Any]:
+    """
+    分析时间索引的采样频率、缺口和不规则区间
+    
+    在索引的整数视图（索引自身的时间单位）上计算相邻间隔，主导间隔由抽样求众数
+    并在全部间隔上验证得到；按月及更长周期采样时改为按日历月比较。
+    随后一次向量化遍历将每个间隔分为正常、重复、缺口（主导间隔的整数倍）
+    和不规则四类。结果按索引指纹缓存。
+    
+    Args:
+        index: 时间索引
+        sample_size: 推断主导间隔时的样本大小
+        max_spans: 返回的缺口和不规则区段的最大数量（计数不受限制）
+    
+    Returns:
+        包含 label、freq、step、regularity、n_gaps、missing_points、gaps、
+        n_irregular、irregular_spans、n_duplicates、is_regular 等字段的字典
+    """
+    result: Dict[str, Any] = {
+        'label': 'Unknown',
+        'freq': None,
+        'step': None,
+        'calendar': False,
+        'n_points': len(index),
+        'regularity': None,
+        'n_duplicates': 0,
+        'n_gaps': 0,
+        'missing_points': 0,
+        'largest_gap': None,
+        'gaps': pd.DataFrame(columns=['start', 'end', 'missing_points']),
+        'n_irregular': 0,
+        'irregular_spans': pd.DataFrame(columns=['start', 'end', 'n_intervals']),
+        'is_regular': False
+    }
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return result
+    
+    key = (_index_key(index), sample_size, max_spans)
+    with _FREQUENCY_CACHE_LOCK:
+        cached = _FREQUENCY_CACHE.get(key)
+        if cached is not None:
+            _FREQUENCY_CACHE.move_to_end(key)
+            return cached
+    
+    if index.hasnans:
+        index = index[~index.isna()]
+    if not index.is_monotonic_increasing:
+        index = index.sort_values()
+    if len(index) < 2:
+        return result
+    
+    ticks = index.asi8
+    steps = np.diff(ticks)
+    step, share = dominant_step(steps, sample_size)
+    if step == 0:
+        result['n_duplicates'] = len(steps)
+        return result
+    
+    per_day = np.timedelta64(1, 'D') // np.timedelta64(1, index.unit)
+    step_days = step / per_day
+    result.update(step=pd.Timedelta(step, unit=index.unit))
+    
+    if step_days >= _CALENDAR_MIN_DAYS and share < _CALENDAR_MAX_SHARE:
+        # 月度、季度、年度数据的间隔天数不固定，按日历月序号比较
+        local = index.tz_localize(None) if index.tz is not None else index
+        months = local.values.astype('datetime64[M]').astype(np.int64)
+        month_steps = np.diff(months)
+        month_step, month_share = dominant_step(month_steps, sample_size)
+        if month_step > 0 and month_share > share:
+            steps, step, share = month_steps, month_step, month_share
+            step_days = month_step * 30.44
+            anchor = 'MS' if index.is_month_start.all() else (_MONTH_END_ALIAS if index.is_month_end.all() else None)
+            result.update(
+                step=pd.DateOffset(months=month_step),
+                calendar=True,
+                freq=f"{month_step if month_step > 1 else ''}{anchor}" if anchor else None
+            )
+    
+    if not result['calendar']:
+        if step % per_day == 0:
+            days = step // per_day
+            result['freq'] = f"{days if days > 1 else ''}D"
+        else:
+            result['freq'] = pd.tseries.frequencies.to_offset(result['step']).freqstr
+    
+    # 一次遍历划分各间隔
+    duplicates = steps == 0
+    multiples = steps % step == 0
+    gaps = multiples & (steps > step)
+    irregular = ~multiples & ~duplicates
+    missing = steps[gaps] // step - 1
+    largest = int(np.argmax(np.where(gaps, steps, 0)))
+    
+    gap_positions = np.flatnonzero(gaps)[:max_spans]
+    irregular_starts, irregular_ends = _runs(irregular)
+    n_irregular_spans = len(irregular_starts)
+    irregular_starts, irregular_ends = irregular_starts[:max_spans], irregular_ends[:max_spans]
+    
+    result.update(
+        label=_frequency_label(step_days),
+        regularity=share,
+        n_duplicates=int(np.count_nonzero(duplicates)),
+        n_gaps=int(np.count_nonzero(gaps)),
+        missing_points=int(missing.sum()),
+        largest_gap=index[largest + 1] - index[largest] if gaps.any() else None,
+        gaps=pd.DataFrame({
+            'start': index[gap_positions],
+            'end': index[gap_positions + 1],
+            'missing_points': missing[:max_spans]
+        }),
+        n_irregular=n_irregular_spans,
+        irregular_spans=pd.DataFrame({
+            'start': index[irregular_starts],
+            'end': index[irregular_ends],
+            'n_intervals': irregular_ends - irregular_starts
+        }),
+    )
+    result['is_regular'] = result['n_gaps'] == 0 and result['n_irregular'] == 0 \
+        and result['n_duplicates'] == 0
+    
+    with _FREQUENCY_CACHE_LOCK:
+        _FREQUENCY_CACHE[key] = result
+        _FREQUENCY_CACHE.move_to_end(key)
+        while len(_FREQUENCY_CACHE) > _FREQUENCY_CACHE_SIZE:
+            _FREQUENCY_CACHE.popitem(last=False)
+    return result
+
+
+def regularize_series(data: pd.Series, fill: str = 'interpolate',
+                      frequency: Optional[Dict[str, Any]] = None) -> pd.Series:
+    """
+    将序列规整为按主导间隔等间隔采样的序列
+    
+    按主导间隔（自第一个时间点起）重采样，同一区间内的多个值取平均，
+    缺口处按 fill 填充
+    
+    Args:
+        data: 时间序列数据
+        fill: 缺失值填充方式：'interpolate' 按时间线性插值，'ffill' 沿用前值，
+              'none' 保留缺失值
+        frequency: 已有的 analyze_frequency 结果，默认重新分析
+    
+    Returns:
+        规整后的序列（已经等间隔时返回原序列）
+    """
+    if fill not in FILL_METHODS:
+        raise ValueError(f"不支持的填充方式: {fill}")
+    
+    frequency = frequency if frequency is not None else analyze_frequency(data.index)
+    if frequency['step'] is None:
+        raise ValueError("无法确定主导采样间隔，不能规整")
+    if frequency['is_regular']:
+        return data
+    
+    series = data[~data.index.isna()]
+    if not series.index.is_monotonic_increasing:
+        series = series.sort_index(kind='stable')
+    
+    if frequency['calendar']:
+        rule = frequency['freq'] or f"{frequency['step'].months}MS"
+        resampled = series.resample(rule).mean()
+    else:
+        resampled = series.resample(frequency['step'], origin=series.index[0]).mean()
+    
+    if fill == 'interpolate':
+        resampled = resampled.interpolate(method='time', limit_area='inside')
+    elif fill == 'ffill':
+        resampled = resampled.ffill()
+    return resampled.rename(data.name)
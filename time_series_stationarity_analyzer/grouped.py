@@ -0,0 +1,314 @@
+"""
+分组分析模块
+对长表格式数据（实体列、时间列、数值列）按 (实体, 时间) 只排序一次，
+各实体的序列为排序后数组上连续区段的零拷贝视图；宽表格式数据的全部数值列
+共用一次解析和排序后的时间索引。各序列在工作池中并发执行综合检验
+"""
+
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Tuple, Optional, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from .stationarity import StationarityAnalyzer
+from .utils import parse_datetime_column, normalize_time_index
+
+# 逐实体结果表的列
+GROUP_COLUMNS = ['entity', 'n_obs', 'start', 'end', 'overall_conclusion', 'is_stationary',
+                 'adf_statistic', 'adf_p_value', 'adf_stationary', 'kpss_p_value', 'kpss_stationary',
+                 'ljung_box_p_value', 'ljung_box_independent', 'error']
+
+# 结果表中的检验: (结果键, 列名前缀, 判断字段)
+_SUMMARY_TESTS = (
+    ('adf_test', 'adf', 'is_stationary'),
+    ('kpss_test', 'kpss', 'is_stationary'),
+    ('ljung_box_test', 'ljung_box', 'is_independent'),
+)
+
+# 每个实体参与检验所需的最少数据点
+MIN_GROUP_POINTS = 10
+
+
+def split_groups(df: pd.DataFrame, entity_col: str, time_col: str, value_col: str,
+                 duplicates: str = 'last', epoch_unit: Optional[str] = None) -> List[Tuple[Hashable, pd.Series]]:
+    """
+    将长表拆分为各实体的时间序列
+    
+    实体列经 factorize 编码后与时间戳一起 lexsort，整张表只排序一次；
+    同一实体的行在排序后连续，各序列直接引用排序后数组的对应区段，不再复制。
+    缺失实体、时间或数值的行被丢弃，重复时间戳按 duplicates 处理
+    （lexsort 是稳定排序，'first'/'last' 对应原表中的先后顺序）
+    
+    Args:
+        df: 长表格式数据框
+        entity_col: 实体列名
+        time_col: 时间列名
+        value_col: 数值列名
+        duplicates: 重复时间戳的处理方式（见 normalize_time_index）
+        epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
+    
+    Returns:
+        [(实体, 时间序列), ...]，按实体排序
+    """
+    for col in (entity_col, time_col, value_col):
+        if col not in df.columns:
+            raise ValueError(f"列 '{col}' 不存在")
+    
+    codes, entities = pd.factorize(df[entity_col], sort=True)
+    times = parse_datetime_column(df[time_col], epoch_unit=epoch_unit)
+    values = pd.to_numeric(df[value_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    ticks = times.asi8
+    
+    valid = (codes >= 0) & ~times.isna() & ~np.isnan(values)
+    if not valid.all():
+        codes, ticks, values = codes[valid], ticks[valid], values[valid]
+    if len(codes) == 0:
+        return []
+    
+    order = np.lexsort((ticks, codes))
+    codes, ticks, values = codes[order], ticks[order], values[order]
+    
+    bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(codes)]))
+    
+    groups = []
+    for start, end in zip(starts, ends):
+        index = pd.DatetimeIndex(ticks[start:end], dtype=times.dtype, name=time_col, copy=False)
+        series = pd.Series(values[start:end], index=index, name=value_col, copy=False)
+        groups.append((entities[codes[start]], normalize_time_index(series, duplicates)))
+    return groups
+
+
+def _analyze_group(series: pd.Series, min_points: int) -> Dict[str, Any]:
+    """对单个实体执行综合检验，失败时返回包含 error 的结果"""
+    if len(series) < min_points:
+        return {'error': f"有效数据点太少（少于{min_points}个）", 'is_stationary': None}
+    try:
+        return StationarityAnalyzer(series).comprehensive_test()
+    except Exception as e:
+        return {'error': f"综合检验失败: {str(e)}", 'is_stationary': None}
+
+
+def _summary_row(entity: Hashable, series: pd.Series, result: Dict[str, Any]) -> Dict[str, Any]:
+    """提取一个序列的结果表行"""
+    row = {
+        'entity': entity,
+        'n_obs': len(series),
+        'start': series.index[0] if len(series) else pd.NaT,
+        'end': series.index[-1] if len(series) else pd.NaT,
+        'overall_conclusion': result.get('overall_conclusion'),
+        'is_stationary': result.get('is_stationary'),
+        'adf_statistic': np.nan,
+        'error': result.get('error')
+    }
+    adf = result.get('adf_test')
+    if adf is not None and 'error' not in adf:
+        row['adf_statistic'] = adf['test_statistic']
+    for key, prefix, flag in _SUMMARY_TESTS:
+        test = result.get(key)
+        valid = test is not None and 'error' not in test
+        row[f"{prefix}_p_value"] = test['p_value'] if valid else np.nan
+        row[f"{prefix}_{flag[len('is_'):]}"] = test[flag] if valid else None
+    return row
+
+
+def _dispatch(groups: List[Tuple[Hashable, pd.Series]], min_points: int, max_workers: Optional[int],
+              executor: Optional[Executor], keep_results: bool,
+              progress: Optional[Callable[[int, int], None]]) -> Dict[str, Any]:
+    """在工作池中并发执行各序列的综合检验并汇总结果表"""
+    results: List[Optional[Dict[str, Any]]] = [None] * len(groups)
+    
+    def run(pool: Executor) -> None:
+        futures = {
+            pool.submit(_analyze_group, series, min_points): position
+            for position, (_, series) in enumerate(groups)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(groups))
+    
+    if groups:
+        if executor is None:
+            workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="group-analysis") as pool:
+                run(pool)
+        else:
+            run(executor)
+    
+    summary = pd.DataFrame(
+        [_summary_row(entity, series, result) for (entity, series), result in zip(groups, results)],
+        columns=GROUP_COLUMNS
+    )
+    output = {
+        'summary': summary,
+        'n_groups': len(groups),
+        'n_stationary': int(summary['is_stationary'].eq(True).sum()),
+        'n_failed': int(summary['error'].notna().sum())
+    }
+    if keep_results:
+        output['results'] = {entity: result for (entity, _), result in zip(groups, results)}
+        output['series'] = dict(groups)
+    return output
+
+
+def analyze_groups(df: pd.DataFrame, entity_col: str, time_col: str, value_col: str,
+                   duplicates: str = 'last', epoch_unit: Optional[str] = None,
+                   min_points: int = MIN_GROUP_POINTS, max_workers: Optional[int] = None,
+                   executor: Optional[Executor] = None, keep_results: bool = False,
+                   progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    分组综合检验
+    
+    按 split_groups 拆分后，将各实体的综合检验分派到工作池中并发执行
+    （主要耗时在会释放GIL的数值计算中），汇总为逐实体结果表
+    
+    Args:
+        df: 长表格式数据框
+        entity_col: 实体列名
+        time_col: 时间列名
+        value_col: 数值列名
+        duplicates: 重复时间戳的处理方式（见 normalize_time_index）
+        epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
+        min_points: 实体参与检验所需的最少数据点，不足时在结果表中记录错误
+        max_workers: 默认线程池的工作线程数
+        executor: 执行器，默认为本次调用新建的线程池；也可传入进程池
+        keep_results: 是否在返回值中保留各实体的序列和完整检验结果
+        progress: 进度回调，参数为 (已完成数, 总数)
+    
+    Returns:
+        包含 summary（逐实体结果表）、n_groups、n_stationary、n_failed
+        以及 results、series（keep_results 为 True 时）的字典
+    """
+    groups = split_groups(df, entity_col, time_col, value_col, duplicates, epoch_unit)
+    return _dispatch(groups, min_points, max_workers, executor, keep_results, progress)
+
+
+def numeric_columns(df: pd.DataFrame, exclude: Tuple[str, ...] = ()) -> List[str]:
+    """
+    获取数据框中的数值列（布尔列除外）
+    
+    Args:
+        df: 数据框
+        exclude: 需要排除的列名
+    
+    Returns:
+        数值列名列表
+    """
+    return [
+        col for col in df.columns
+        if col not in exclude and pd.api.types.is_numeric_dtype(df[col])
+        and not pd.api.types.is_bool_dtype(df[col])
+    ]
+
+
+def split_columns(df: pd.DataFrame, time_col: str, value_cols: Optional[List[str]] = None,
+                  duplicates: str = 'last', epoch_unit: Optional[str] = None) -> List[Tuple[str, pd.Series]]:
+    """
+    将宽表的多个数值列拆分为共用时间索引的时间序列
+    
+    时间列只解析一次；全部数值列一次转换为二维数组，只在时间无序时按时间
+    整体重排一次。不含缺失值的列直接引用二维数组的对应列并共用同一个时间索引，
+    其余列去掉缺失值后再按 duplicates 处理重复时间戳，
+    结果与逐列调用 validate_time_series_data 一致
+    
+    Args:
+        df: 宽表格式数据框
+        time_col: 时间列名
+        value_cols: 数值列名列表，默认为全部数值列
+        duplicates: 重复时间戳的处理方式（见 normalize_time_index）
+        epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
+    
+    Returns:
+        [(列名, 时间序列), ...]，按 value_cols 的顺序
+    """
+    if time_col not in df.columns:
+        raise ValueError(f"时间列 '{time_col}' 不存在")
+    if value_cols is None:
+        value_cols = numeric_columns(df, exclude=(time_col,))
+    missing = [col for col in value_cols if col not in df.columns]
+    if missing:
+        raise ValueError(f"列 {missing} 不存在")
+    if not value_cols:
+        return []
+    
+    index = parse_datetime_column(df[time_col], epoch_unit=epoch_unit)
+    block = df[value_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    
+    rows = None
+    if index.hasnans:
+        rows = np.flatnonzero(~index.isna())
+        index = index[rows]
+    if not index.is_monotonic_increasing:
+        order = np.argsort(index.asi8, kind='stable')
+        rows = order if rows is None else rows[order]
+        index = index[order]
+    if rows is not None:
+        block = block[rows]
+    # 按列存储，各列为连续内存
+    block = np.asfortranarray(block)
+    
+    columns = []
+    for position, col in enumerate(value_cols):
+        values = block[:, position]
+        present = ~np.isnan(values)
+        if present.all():
+            series = pd.Series(values, index=index, name=col, copy=False)
+        else:
+            series = pd.Series(values[present], index=index[present], name=col, copy=False)
+        columns.append((col, normalize_time_index(series, duplicates)))
+    return columns
+
+
+def analyze_columns(df: pd.DataFrame, time_col: str, value_cols: Optional[List[str]] = None,
+                    duplicates: str = 'last', epoch_unit: Optional[str] = None,
+                    min_points: int = MIN_GROUP_POINTS, max_workers: Optional[int] = None,
+                    executor: Optional[Executor] = None, keep_results: bool = False,
+                    progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    多列综合检验
+    
+    按 split_columns 拆分后，将各列的综合检验分派到工作池中并发执行，
+    汇总为逐列结果表（entity 列为列名）
+    
+    Args:
+        df: 宽表格式数据框
+        time_col: 时间列名
+        value_cols: 数值列名列表，默认为全部数值列
+        duplicates: 重复时间戳的处理方式（见 normalize_time_index）
+        epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
+        min_points: 参与检验所需的最少数据点，不足时在结果表中记录错误
+        max_workers: 默认线程池的工作线程数
+        executor: 执行器，默认为本次调用新建的线程池；也可传入进程池
+        keep_results: 是否在返回值中保留各列的序列和完整检验结果
+        progress: 进度回调，参数为 (已完成数, 总数)
+    
+    Returns:
+        与 analyze_groups 相同结构的字典
+    """
+    columns = split_columns(df, time_col, value_cols, duplicates, epoch_unit)
+    return _dispatch(columns, min_points, max_workers, executor, keep_results, progress)
+
+
+def analyze_series(series: List[Tuple[Hashable, pd.Series]], min_points: int = MIN_GROUP_POINTS,
+                   max_workers: Optional[int] = None, executor: Optional[Executor] = None,
+                   keep_results: bool = False,
+                   progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    对已整理好的多个序列执行综合检验（如多文件上传时逐文件检验）
+    
+    Args:
+        series: [(名称, 时间序列), ...]，各序列应已按时间排序
+        min_points: 参与检验所需的最少数据点，不足时在结果表中记录错误
+        max_workers: 默认线程池的工作线程数
+        executor: 执行器，默认为本次调用新建的线程池；也可传入进程池
+        keep_results: 是否在返回值中保留各序列和完整检验结果
+        progress: 进度回调，参数为 (已完成数, 总数)
+    
+    Returns:
+        与 analyze_groups 相同结构的字典（entity 列为序列名称）
+    """
+    return _dispatch(list(series), min_points, max_workers, executor, keep_results, progress)
@@ -0,0 +1,259 @@
+"""
+性能监测模块
+记录各检验及其内部阶段的耗时、CPU时间和峰值内存，并支持通过钩子导出
+"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Callable, Iterator, Tuple
+
+# tracemalloc 是进程级的：所有监测器共用一个引用计数来启停跟踪，
+# 并统计正在记录内存的区间数，用于判断能否安全地重置峰值
+_tracing_lock = threading.Lock()
+_tracing_refs = 0
+_tracing_owned = False
+_active_spans = 0
+
+
+class Span:
+    """一个计时区间（检验或阶段）"""
+    
+    __slots__ = ('name', 'parent', 'attributes', 'start_time', 'wall_time', 'cpu_time',
+                 'peak_memory', 'children', '_wall_start', '_cpu_start', '_mem_start', '_max_peak',
+                 '_exclusive')
+    
+    def __init__(self, name: str, parent: Optional['Span'] = None, **attributes):
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.wall_time: Optional[float] = None
+        self.cpu_time: Optional[float] = None
+        self.peak_memory: Optional[int] = None
+        self.children: List['Span'] = []
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._mem_start = 0
+        self._max_peak = 0
+        # 是否独占了峰值统计（None 表示未记录内存）
+        self._exclusive: Optional[bool] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典
+        
+        Returns:
+            包含 wall_time、cpu_time、peak_memory 以及各子阶段 phases 的字典；
+            因与其他区间并发而无法测量峰值内存时 memory_concurrent 为True
+        """
+        result = {
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'peak_memory': self.peak_memory
+        }
+        if self._exclusive is False:
+            result['memory_concurrent'] = True
+        if self.children:
+            result['phases'] = {child.name: child.to_dict() for child in self.children}
+        return result
+    
+    def to_record(self) -> Dict[str, Any]:
+        """
+        转换为导出给外部追踪系统的扁平记录
+        
+        Returns:
+            区间记录字典
+        """
+        return {
+            'name': self.name,
+            'parent': self.parent.name if self.parent is not None else None,
+            'start_time': self.start_time,
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'peak_memory': self.peak_memory,
+            'attributes': dict(self.attributes)
+        }
+
+
+class Instrumentation:
+    """
+    性能监测器
+    
+    通过 span() 上下文管理器记录区间的墙钟时间、当前线程CPU时间以及
+    tracemalloc 峰值内存（相对区间开始时的增量）。区间可以嵌套，
+    每个区间结束时依次调用已注册的钩子，便于导出到外部追踪系统。
+    
+    tracemalloc 是进程级的：跟踪按进程内的引用计数启停，只有当前正在记录内存的区间
+    都是本区间的上层区间时才重置峰值。其他线程中已有无关区间在运行时不重置峰值，
+    本区间的 peak_memory 记为 None 并标记 memory_concurrent（并发时无法单独测量）；
+    先开始的区间不受影响，但其峰值会包含并发区间的内存分配。
+    """
+    
+    def __init__(self, trace_memory: bool = True,
+                 hooks: Optional[List[Callable[[Dict[str, Any]], None]]] = None):
+        """
+        初始化监测器
+        
+        Args:
+            trace_memory: 是否使用tracemalloc记录峰值内存
+            hooks: 区间结束时调用的钩子列表，参数为区间记录字典
+        """
+        self.trace_memory = trace_memory
+        self.hooks: List[Callable[[Dict[str, Any]], None]] = list(hooks or [])
+        self._local = threading.local()
+    
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        注册区间结束钩子
+        
+        Args:
+            hook: 接收区间记录字典的回调函数
+        """
+        self.hooks.append(hook)
+    
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+    
+    @contextmanager
+    def attach(self, parent: Optional[Span]) -> Iterator[None]:
+        """
+        在当前线程中以已有区间作为父区间
+        
+        用于工作线程：线程内新建的区间会挂到调用方线程的区间之下
+        
+        Args:
+            parent: 父区间，为 None 时不做任何处理
+        """
+        if parent is None:
+            yield
+            return
+        stack = self._stack()
+        stack.append(parent)
+        try:
+            yield
+        finally:
+            stack.pop()
+    
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """
+        记录一个区间
+        
+        Args:
+            name: 区间名称
+            **attributes: 附加属性，会随记录一起传给钩子
+        
+        Yields:
+            区间对象，退出上下文后其计时字段被填充
+        """
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        current = Span(name, parent, **attributes)
+        if parent is not None:
+            parent.children.append(current)
+        
+        if self.trace_memory:
+            mem_now, current._exclusive = _enter_memory_span(stack)
+            current._mem_start = mem_now
+            current._max_peak = mem_now
+        
+        stack.append(current)
+        current._wall_start = time.perf_counter()
+        current._cpu_start = time.thread_time()
+        try:
+            yield current
+        finally:
+            current.wall_time = time.perf_counter() - current._wall_start
+            current.cpu_time = time.thread_time() - current._cpu_start
+            stack.pop()
+            
+            if self.trace_memory:
+                mem_peak = _exit_memory_span()
+                current._max_peak = max(current._max_peak, mem_peak)
+                if current._exclusive:
+                    current.peak_memory = current._max_peak - current._mem_start
+                for ancestor in stack:
+                    ancestor._max_peak = max(ancestor._max_peak, mem_peak)
+            
+            record = current.to_record()
+            for hook in self.hooks:
+                try:
+                    hook(record)
+                except Exception:
+                    pass
+
+
+def _enter_memory_span(stack: List[Span]) -> Tuple[int, bool]:
+    """
+    开始记录一个区间的内存：按需启动tracemalloc，并在安全时重置峰值
+    
+    Args:
+        stack: 当前线程的区间栈（新区间的上层区间）
+    
+    Returns:
+        (当前已分配内存, 是否重置了峰值)
+    """
+    global _tracing_refs, _tracing_owned, _active_spans
+    with _tracing_lock:
+        if _tracing_refs == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_refs += 1
+        
+        mem_now, mem_peak = tracemalloc.get_traced_memory()
+        # 正在记录内存的区间都在本线程的区间栈中时，重置峰值不会影响其他区间
+        exclusive = _active_spans == sum(1 for span in stack if span._exclusive is not None)
+        if exclusive:
+            # 重置峰值前先把目前的峰值记入各上层区间
+            for ancestor in stack:
+                ancestor._max_peak = max(ancestor._max_peak, mem_peak)
+            tracemalloc.reset_peak()
+        _active_spans += 1
+    return mem_now, exclusive
+
+
+def _exit_memory_span() -> int:
+    """
+    结束记录一个区间的内存，最后一个区间结束时停止由本模块启动的跟踪
+    
+    Returns:
+        当前的峰值内存
+    """
+    global _tracing_refs, _tracing_owned, _active_spans
+    with _tracing_lock:
+        mem_peak = tracemalloc.get_traced_memory()[1]
+        _active_spans -= 1
+        _tracing_refs -= 1
+        if _tracing_refs == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+    return mem_peak
+
+
+def timings_table(timings: Dict[str, Any], prefix: str = '') -> List[Dict[str, Any]]:
+    """
+    将嵌套的timings字典展开为表格行
+    
+    Args:
+        timings: 结果中的timings字典
+        prefix: 阶段名称前缀
+    
+    Returns:
+        每个阶段一行的列表
+    """
+    rows = []
+    for name, item in timings.get('phases', {}).items():
+        full_name = f"{prefix}{name}"
+        rows.append({
+            'stage': full_name,
+            'wall_time': item.get('wall_time'),
+            'cpu_time': item.get('cpu_time'),
+            'peak_memory': item.get('peak_memory'),
+            'memory_concurrent': item.get('memory_concurrent', False)
+        })
+        rows.extend(timings_table(item, prefix=f"{full_name} / "))
+    return rows
@@ -0,0 +1,342 @@
+"""
+后台分析任务模块
+将综合平稳性检验提交到工作线程池执行，跟踪每项检验的进度，
+支持读取部分结果、取消任务，并对相同的进行中任务去重；
+去重后的任务按订阅方计数，只有全部订阅方都取消时才真正取消
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from typing import Dict, Any, Optional, Callable, Hashable, Set
+
+import pandas as pd
+
+from .instrumentation import Instrumentation
+from .stationarity import StationarityAnalyzer, COMPREHENSIVE_TESTS
+from .utils import series_fingerprint
+
+# 任务状态
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class AnalysisJob:
+    """
+    一次后台综合检验任务
+    
+    各项检验的状态记录在 progress 中，完成的检验结果立即写入 partial_results，
+    全部完成后 result 为与 comprehensive_test 相同格式的综合结果。
+    所有字段由工作线程更新，读取时请使用 snapshot() 获取一致的副本。
+    任务结束后释放 analyzer（及其引用的序列），已结束的任务只保留结果。
+    """
+    
+    def __init__(self, key: Hashable, analyzer: StationarityAnalyzer):
+        self.key = key
+        self.analyzer = analyzer
+        self.status = PENDING
+        self.progress: Dict[str, str] = {name: PENDING for name in COMPREHENSIVE_TESTS}
+        self.partial_results: Dict[str, Any] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._futures: Dict[str, Future] = {}
+        # 等待该任务结果的订阅方（如各个会话）
+        self._subscribers: Set[Hashable] = set()
+    
+    @property
+    def finished(self) -> bool:
+        """任务是否已结束（完成、失败或取消）"""
+        return self.status in (DONE, FAILED, CANCELLED)
+    
+    @property
+    def cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+    
+    def fraction_done(self) -> float:
+        """已结束检验的比例"""
+        with self._lock:
+            done = sum(state in (DONE, FAILED) for state in self.progress.values())
+        return done / len(self.progress)
+    
+    def cancel(self) -> bool:
+        """
+        请求取消任务
+        
+        任务立即标记为已取消；尚未开始的检验不再执行，已在运行的检验无法中断，
+        其结果会被丢弃
+        
+        Returns:
+            任务是否处于可取消的状态
+        """
+        with self._lock:
+            if self.finished:
+                return False
+            self._cancel_event.set()
+            for name, future in self._futures.items():
+                if future.cancel():
+                    self.progress[name] = CANCELLED
+            for name, state in self.progress.items():
+                if state == PENDING:
+                    self.progress[name] = CANCELLED
+            self.status = CANCELLED
+            self.finished_at = time.time()
+        return True
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取任务当前状态的副本
+        
+        Returns:
+            包含 status、progress、partial_results、result、error、elapsed 的字典
+        """
+        with self._lock:
+            end = self.finished_at if self.finished_at is not None else time.time()
+            return {
+                'key': self.key,
+                'status': self.status,
+                'progress': dict(self.progress),
+                'partial_results': dict(self.partial_results),
+                'result': self.result,
+                'error': self.error,
+                'elapsed': end - self.submitted_at
+            }
+    
+    def _set_status(self, status: str) -> bool:
+        """更新状态；任务已取消时不再更新并返回False"""
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.status = status
+            if self.finished:
+                self.finished_at = time.time()
+            return True
+
+
+class AnalysisJobManager:
+    """
+    后台分析任务管理器
+    
+    每个任务由一个协调线程负责，其中的各项检验提交到独立的检验线程池并发执行
+    （记录性能数据时依次执行，以便单独测量各检验的峰值内存），
+    两个线程池分开可避免协调线程占满工作线程导致死锁。相同键的任务在运行中或
+    已完成时直接返回已有任务，页面重新运行时不会重复提交。管理器在会话间共享时，
+    提交方以 subscriber 标识自己，取消时只退订，最后一个订阅方退订时才取消任务。
+    任务完成时的后续处理（如写入结果存储）由 on_complete 在协调线程中执行一次，
+    与订阅方的数量无关。
+    """
+    
+    def __init__(self, max_jobs: int = 2, max_test_workers: int = 4, max_finished: int = 16,
+                 on_complete: Optional[Callable[[AnalysisJob, pd.Series], None]] = None):
+        """
+        初始化任务管理器
+        
+        Args:
+            max_jobs: 同时运行的任务数
+            max_test_workers: 检验线程池大小
+            max_finished: 保留的已结束任务数量
+            on_complete: 任务成功完成、状态变为 DONE 之前调用的回调，参数为任务和
+                         被检验的序列；回调中的异常被忽略
+        """
+        self._job_pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="analysis-job")
+        self._test_pool = ThreadPoolExecutor(max_workers=max_test_workers, thread_name_prefix="analysis-test")
+        self._jobs: "OrderedDict[Hashable, AnalysisJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_finished = max_finished
+        self.on_complete = on_complete
+    
+    @staticmethod
+    def make_key(data: pd.Series, record_timings: bool = False) -> Hashable:
+        """
+        计算任务去重键
+        
+        Args:
+            data: 时间序列数据
+            record_timings: 是否记录性能数据
+        
+        Returns:
+            由序列指纹和选项组成的键
+        """
+        return (series_fingerprint(data), record_timings)
+    
+    def submit(self, data: pd.Series, record_timings: bool = False,
+               subscriber: Optional[Hashable] = None) -> AnalysisJob:
+        """
+        提交综合检验任务
+        
+        Args:
+            data: 时间序列数据
+            record_timings: 是否记录性能数据（结果附带 timings 字段）
+            subscriber: 提交方标识（如会话ID），用于取消时只退订自己；
+                        None 表示不登记订阅
+        
+        Returns:
+            新建的任务，或键相同且未失败/取消的已有任务
+        """
+        key = self.make_key(data, record_timings)
+        with self._lock:
+            existing = self._jobs.get(key)
+            if existing is not None and existing.status not in (FAILED, CANCELLED):
+                self._jobs.move_to_end(key)
+                if subscriber is not None:
+                    with existing._lock:
+                        existing._subscribers.add(subscriber)
+                return existing
+            
+            instrumentation = Instrumentation() if record_timings else None
+            job = AnalysisJob(key, StationarityAnalyzer(data, instrumentation=instrumentation))
+            if subscriber is not None:
+                job._subscribers.add(subscriber)
+            self._jobs[key] = job
+            self._evict_finished()
+        
+        self._job_pool.submit(self._run_job, job)
+        return job
+    
+    def get(self, key: Hashable) -> Optional[AnalysisJob]:
+        """
+        按键获取任务
+        
+        Args:
+            key: 任务键
+        
+        Returns:
+            任务，不存在时返回None
+        """
+        with self._lock:
+            return self._jobs.get(key)
+    
+    def cancel(self, key: Hashable, subscriber: Optional[Hashable] = None) -> bool:
+        """
+        取消任务
+        
+        指定 subscriber 时只退订该提交方，其他订阅方仍在等待时任务继续运行；
+        未指定时直接取消任务
+        
+        Args:
+            key: 任务键
+            subscriber: 退订的提交方标识
+        
+        Returns:
+            任务是否被取消
+        """
+        job = self.get(key)
+        if job is None:
+            return False
+        if subscriber is not None:
+            with job._lock:
+                job._subscribers.discard(subscriber)
+                if job._subscribers:
+                    return False
+        return job.cancel()
+    
+    def active_jobs(self) -> Dict[Hashable, AnalysisJob]:
+        """当前未结束的任务"""
+        with self._lock:
+            return {key: job for key, job in self._jobs.items() if not job.finished}
+    
+    def shutdown(self) -> None:
+        """取消所有任务并关闭线程池"""
+        for job in self.active_jobs().values():
+            job.cancel()
+        self._job_pool.shutdown(wait=False, cancel_futures=True)
+        self._test_pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _evict_finished(self) -> None:
+        """超出保留数量时移除最早结束的任务（调用方持有锁）"""
+        finished = [key for key, job in self._jobs.items() if job.finished]
+        for key in finished[:max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[key]
+    
+    def _run_test(self, job: AnalysisJob, analyzer: StationarityAnalyzer, name: str, parent_span) -> Any:
+        """在检验线程中执行单项检验，任务已取消时返回None"""
+        if job.cancelled:
+            return None
+        with job._lock:
+            job.progress[name] = RUNNING
+        
+        instrumentation = analyzer.instrumentation
+        with instrumentation.attach(parent_span) if instrumentation is not None else nullcontext():
+            return getattr(analyzer, name)()
+    
+    def _run_job(self, job: AnalysisJob, poll_interval: float = 0.2) -> None:
+        """在协调线程中执行任务：并发提交各项检验并按完成顺序收集结果"""
+        if not job._set_status(RUNNING):
+            job.analyzer = None
+            return
+        analyzer = job.analyzer
+        # 记录峰值内存时各检验依次提交（tracemalloc 无法区分并发检验的内存）
+        serial = analyzer.traces_memory
+        
+        try:
+            with analyzer._span('comprehensive_test') as span:
+                queue = list(COMPREHENSIVE_TESTS)
+                names: Dict[Future, str] = {}
+                
+                def submit_next(count: int) -> Set[Future]:
+                    """提交队列中的下 count 项检验（调用方持有任务锁）"""
+                    submitted = set()
+                    for name in queue[:count]:
+                        future = self._test_pool.submit(self._run_test, job, analyzer, name, span)
+                        job._futures[name] = future
+                        names[future] = name
+                        submitted.add(future)
+                    del queue[:count]
+                    return submitted
+                
+                with job._lock:
+                    pending = submit_next(1 if serial else len(queue))
+                
+                # 定期检查取消请求，取消后不再等待仍在运行的检验
+                while pending and not job.cancelled:
+                    done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.cancelled():
+                            continue
+                        result = future.result()
+                        if result is None:
+                            # 检验开始前任务已被取消
+                            continue
+                        with job._lock:
+                            if not job.cancelled:
+                                job.partial_results[names[future]] = result
+                                job.progress[names[future]] = FAILED if 'error' in result else DONE
+                    if done and queue:
+                        with job._lock:
+                            if not job.cancelled:
+                                pending |= submit_next(1)
+                
+                if job.cancelled:
+                    return
+                
+                with analyzer._span('basic_statistics'):
+                    basic_stats = analyzer._calculate_basic_stats()
+                result = analyzer._combine_results(job.partial_results, basic_stats)
+            
+            analyzer._attach_timings(result, span, execution='serial' if serial else 'parallel')
+            analyzer.results['comprehensive'] = result
+            with job._lock:
+                job.result = result
+            if self.on_complete is not None and not job.cancelled:
+                try:
+                    self.on_complete(job, analyzer.data)
+                except Exception:
+                    pass
+            job._set_status(DONE)
+        
+        except Exception as e:
+            with job._lock:
+                job.error = f'分析失败: {str(e)}'
+            job._set_status(FAILED)
+        finally:
+            # 已结束的任务只保留结果，释放检验器引用的完整序列
+            job.analyzer = None
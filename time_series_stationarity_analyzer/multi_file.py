@@ -0,0 +1,272 @@
+"""
+多文件数据源模块
+多个上传文件及ZIP压缩包中的文件按相同的列映射在工作池中并发解析，每个文件
+各自整理为按时间排序的序列并记录解析耗时。合并为一个序列时利用各文件已经有序：
+时间区间互不重叠时按起始时间直接拼接，否则只归并各文件的有序区段，不再整体重排
+"""
+
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Tuple, Optional, Callable
+
+import numpy as np
+import pandas as pd
+
+from .excel_source import EXCEL_EXTENSIONS, PREVIEW_ROWS, read_excel_columns, read_preview
+from .utils import parse_datetime_column, normalize_time_index
+
+# 可以解析的文件扩展名（ZIP压缩包中的其他文件会被忽略）
+TABLE_EXTENSIONS = ('csv', *EXCEL_EXTENSIONS)
+
+# CSV文件依次尝试的编码
+CSV_ENCODINGS = ('utf-8', 'gbk', 'gb2312', 'latin-1')
+
+# 单个压缩包最多包含的条目数，以及所有压缩包展开后的总大小上限（字节）
+MAX_ARCHIVE_MEMBERS = 10_000
+MAX_ARCHIVE_BYTES = 2 * 1024 * 1024 * 1024
+
+# 逐文件解析报告的列
+FILE_COLUMNS = ['file', 'n_rows', 'n_obs', 'start', 'end', 'parse_time', 'error']
+
+# 时间戳单位从粗到细
+_TIME_UNITS = ('s', 'ms', 'us', 'ns')
+
+
+def file_extension(name: str) -> str:
+    """文件扩展名（小写，不含点）"""
+    return name.lower().rsplit('.', 1)[-1] if '.' in name else ''
+
+
+def _unique_name(name: str, seen: Dict[str, int]) -> str:
+    """重名的文件在扩展名前追加 #2、#3，保证各文件名（实体名）互不相同"""
+    if name not in seen:
+        seen[name] = 1
+        return name
+    stem, dot, extension = name.rpartition('.') if '.' in name.rsplit('/', 1)[-1] else (name, '', '')
+    while True:
+        seen[name] += 1
+        candidate = f"{stem}#{seen[name]}{dot}{extension}"
+        if candidate not in seen:
+            seen[candidate] = 1
+            return candidate
+
+
+def expand_archives(files: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """
+    展开ZIP压缩包
+    
+    压缩包中的CSV和Excel文件按路径排序后依次展开，名称为 "压缩包名/文件路径"；
+    目录、隐藏文件（包括 macOS 生成的 __MACOSX 目录）和其他格式的文件被忽略。
+    读取前按目录中记录的条目数和解压后大小检查上限，超出上限或包含嵌套的
+    压缩包时拒绝整个上传。重名的文件在扩展名前追加 #2、#3 以区分
+    
+    Args:
+        files: [(文件名, 文件内容), ...]
+    
+    Returns:
+        展开后的 [(文件名, 文件内容), ...]，保持上传顺序
+    """
+    expanded, seen = [], {}
+    total_bytes = 0
+    for name, content in files:
+        if file_extension(name) != 'zip':
+            expanded.append((_unique_name(name, seen), content))
+            continue
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            infos = archive.infolist()
+            if len(infos) > MAX_ARCHIVE_MEMBERS:
+                raise ValueError(f"压缩包 {name} 包含 {len(infos)} 个条目，超过上限 {MAX_ARCHIVE_MEMBERS}")
+            members = sorted(
+                (info for info in infos
+                 if not info.is_dir()
+                 and not any(part.startswith(('.', '__MACOSX')) for part in info.filename.split('/'))
+                 and file_extension(info.filename) in TABLE_EXTENSIONS + ('zip',)),
+                key=lambda info: info.filename
+            )
+            nested = [info.filename for info in members if file_extension(info.filename) == 'zip']
+            if nested:
+                raise ValueError(f"压缩包 {name} 中包含嵌套的压缩包: {nested[0]}")
+            # 解压后的大小取自压缩包目录，读取时解压出的数据不会超过记录的大小
+            total_bytes += sum(info.file_size for info in members)
+            if total_bytes > MAX_ARCHIVE_BYTES:
+                raise ValueError(f"压缩包解压后的总大小超过上限 {MAX_ARCHIVE_BYTES // (1024 * 1024)} MB")
+            expanded.extend((_unique_name(f"{name}/{info.filename}", seen), archive.read(info)) for info in members)
+    return expanded
+
+
+def read_table(name: str, content: bytes, columns: Optional[List[str]] = None,
+               nrows: Optional[int] = None) -> pd.DataFrame:
+    """
+    读取单个CSV或Excel文件（Excel读取第一个工作表）
+    
+    Args:
+        name: 文件名，用于判断格式
+        content: 文件内容
+        columns: 需要读取的列，默认为全部列
+        nrows: 只读取前 nrows 行（用于预览）
+    
+    Returns:
+        数据框
+    """
+    extension = file_extension(name)
+    if extension in EXCEL_EXTENSIONS:
+        if nrows is not None:
+            frame = read_preview(content, extension=extension, nrows=nrows)
+            return frame if columns is None else frame[columns]
+        return read_excel_columns(content, columns=columns, extension=extension)
+    if extension != 'csv':
+        raise ValueError(f"不支持的文件格式: {extension}")
+    
+    for encoding in CSV_ENCODINGS:
+        try:
+            return pd.read_csv(io.BytesIO(content), usecols=columns, nrows=nrows, encoding=encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("无法读取CSV文件，请检查文件编码")
+
+
+def preview_files(files: List[Tuple[str, bytes]], nrows: int = PREVIEW_ROWS) -> pd.DataFrame:
+    """
+    读取第一个文件的前几行，用于选择各文件共用的列映射
+    
+    Args:
+        files: [(文件名, 文件内容), ...]
+        nrows: 读取的数据行数
+    
+    Returns:
+        预览数据框
+    """
+    if not files:
+        raise ValueError("没有可解析的CSV或Excel文件")
+    name, content = files[0]
+    return read_table(name, content, nrows=nrows)
+
+
+def parse_file(name: str, content: bytes, time_col: str, value_col: str,
+               duplicates: str = 'last', epoch_unit: Optional[str] = None) -> Tuple[Dict[str, Any], pd.Series]:
+    """
+    解析单个文件为按时间排序的序列
+    
+    只读取时间列和数值列，去掉缺失的时间和数值后按 duplicates 处理重复时间戳。
+    为模块级函数，可以提交到进程池
+    
+    Args:
+        name: 文件名
+        content: 文件内容
+        time_col: 时间列名
+        value_col: 数值列名
+        duplicates: 重复时间戳的处理方式（见 normalize_time_index）
+        epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
+    
+    Returns:
+        (解析报告行, 时间序列)，解析失败时报告行包含 error，序列为空
+    """
+    started = time.perf_counter()
+    row = {'file': name, 'n_rows': 0, 'n_obs': 0, 'start': pd.NaT, 'end': pd.NaT,
+           'parse_time': np.nan, 'error': None}
+    series = pd.Series(dtype=float, name=value_col)
+    try:
+        frame = read_table(name, content, [time_col, value_col])
+        index = parse_datetime_column(frame[time_col], epoch_unit=epoch_unit)
+        values = pd.to_numeric(frame[value_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        keep = ~np.isnan(values) & ~index.isna()
+        series = normalize_time_index(pd.Series(values[keep], index=index[keep], name=value_col), duplicates)
+        row['n_rows'] = len(frame)
+    except Exception as e:
+        row['error'] = f"文件解析失败: {str(e)}"
+    row['parse_time'] = time.perf_counter() - started
+    if len(series):
+        row.update(n_obs=len(series), start=series.index[0], end=series.index[-1])
+    return row, series
+
+
+def parse_files(files: List[Tuple[str, bytes]], time_col: str, value_col: str,
+                duplicates: str = 'last', epoch_unit: Optional[str] = None,
+                max_workers: Optional[int] = None, executor: Optional[Executor] = None,
+                progress: Optional[Callable[[int, int], None]] = None) -> Tuple[pd.DataFrame, List[pd.Series]]:
+    """
+    在工作池中并发解析多个文件
+    
+    CSV分词和时间解析的主要耗时在会释放GIL的C代码中，默认使用线程池；
+    也可以传入进程池（各文件内容会被复制到工作进程）
+    
+    Args:
+        files: [(文件名, 文件内容), ...]
+        time_col: 时间列名
+        value_col: 数值列名
+        duplicates: 各文件内重复时间戳的处理方式（见 normalize_time_index）
+        epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
+        max_workers: 默认线程池的工作线程数
+        executor: 执行器，默认为本次调用新建的线程池
+        progress: 进度回调，参数为 (已完成数, 总数)
+    
+    Returns:
+        (逐文件解析报告, 各文件的序列列表)，均按 files 的顺序
+    """
+    parsed: List[Optional[Tuple[Dict[str, Any], pd.Series]]] = [None] * len(files)
+    
+    def run(pool: Executor) -> None:
+        futures = {
+            pool.submit(parse_file, name, content, time_col, value_col, duplicates, epoch_unit): position
+            for position, (name, content) in enumerate(files)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            parsed[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(files))
+    
+    if files:
+        if executor is None:
+            workers = max_workers or min(32, (os.cpu_count() or 1) + 4, len(files))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-parsing") as pool:
+                run(pool)
+        else:
+            run(executor)
+    
+    report = pd.DataFrame([row for row, _ in parsed], columns=FILE_COLUMNS)
+    return report, [series for _, series in parsed]
+
+
+def merge_sorted(series_list: List[pd.Series], duplicates: str = 'last') -> pd.Series:
+    """
+    合并多个已按时间排序的序列
+    
+    各序列按起始时间排列后，若前一个的结束时间不晚于后一个的开始时间则直接拼接，
+    不需要排序；否则对拼接后的时间戳做稳定排序，timsort 识别出各序列本身的有序区段后
+    只需逐段归并。跨文件的重复时间戳在合并后按 duplicates 处理，起始时间相同的
+    序列保持传入顺序（'last' 保留靠后的文件中的值）
+    
+    Args:
+        series_list: 已按时间排序的序列列表
+        duplicates: 重复时间戳的处理方式（见 normalize_time_index）
+    
+    Returns:
+        合并后的序列
+    """
+    parts = [series for series in series_list if len(series)]
+    if not parts:
+        raise ValueError("没有可合并的数据")
+    
+    # 统一时间戳单位（取最细的单位），保证整数时间戳可以直接比较
+    unit = max((series.index.unit for series in parts), key=_TIME_UNITS.index)
+    indexes = [series.index.as_unit(unit) for series in parts]
+    if len({index.dtype for index in indexes}) > 1:
+        raise ValueError("各文件的时间列时区不一致")
+    
+    order = sorted(range(len(parts)), key=lambda position: indexes[position][0])
+    ticks = np.concatenate([indexes[position].asi8 for position in order])
+    values = np.concatenate([parts[position].to_numpy(dtype=float) for position in order])
+    bounds = np.cumsum([len(parts[position]) for position in order])[:-1]
+    
+    if (ticks[bounds - 1] > ticks[bounds]).any():
+        rows = np.argsort(ticks, kind='stable')
+        ticks, values = ticks[rows], values[rows]
+    
+    index = pd.DatetimeIndex(ticks.view(f'M8[{unit}]'), name=parts[0].index.name)
+    if indexes[0].tz is not None:
+        index = index.tz_localize('UTC').tz_convert(indexes[0].tz)
+    merged = pd.Series(values, index=index, name=parts[0].name, copy=False)
+    return normalize_time_index(merged, duplicates)
@@ -0,0 +1,440 @@
+"""
+批量报告模块
+逐个读取多个序列的综合检验结果，以流式方式将合并报告写入磁盘。
+汇总表（结论计数、p值分布）在单次遍历中累计，内存占用与序列数量无关
+"""
+
+import html
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Tuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .utils import format_number
+
+# p值分布的默认分箱边界
+P_VALUE_BINS = (0.0, 0.01, 0.05, 0.10, 0.25, 0.50, 0.75, 1.0)
+
+# 报告中的检验: (结果键, 显示名称, 判断字段)
+REPORT_TESTS = (
+    ('adf_test', 'ADF检验', 'is_stationary'),
+    ('kpss_test', 'KPSS检验', 'is_stationary'),
+    ('ljung_box_test', 'Ljung-Box检验', 'is_independent'),
+)
+
+# 逐序列结果表的列
+SERIES_COLUMNS = ['序列', '综合结论', 'ADF p值', 'KPSS p值', 'Ljung-Box p值', '数据点数量']
+
+REPORT_FORMATS = ('markdown', 'html')
+
+
+class BatchSummary:
+    """
+    批量检验结果的汇总统计
+    
+    每次 update() 只累加计数和直方图，不保留结果本身
+    """
+    
+    def __init__(self, bins: Sequence[float] = P_VALUE_BINS):
+        """
+        初始化汇总
+        
+        Args:
+            bins: p值分布的分箱边界（递增，覆盖 [0, 1]）
+        """
+        self.bins = np.asarray(bins, dtype=float)
+        self.n_series = 0
+        self.n_errors = 0
+        self.verdicts = {'平稳': 0, '非平稳': 0, '无法判断': 0}
+        self.conclusions: Dict[str, int] = {}
+        self.test_counts = {key: {'pass': 0, 'fail': 0, 'error': 0} for key, *_ in REPORT_TESTS}
+        self.histograms = {key: np.zeros(len(self.bins) - 1, dtype=np.int64) for key, *_ in REPORT_TESTS}
+        # 各检验p值的 [数量, 总和, 最小值, 最大值]
+        self.p_value_moments = {key: [0, 0.0, np.inf, -np.inf] for key, *_ in REPORT_TESTS}
+    
+    def update(self, result: Mapping[str, Any]) -> None:
+        """
+        累加一个序列的综合检验结果
+        
+        Args:
+            result: comprehensive_test 的返回值
+        """
+        self.n_series += 1
+        if 'error' in result:
+            self.n_errors += 1
+            self.verdicts['无法判断'] += 1
+            for key, *_ in REPORT_TESTS:
+                self.test_counts[key]['error'] += 1
+            return
+        
+        is_stationary = result.get('is_stationary')
+        verdict = '无法判断' if is_stationary is None else ('平稳' if is_stationary else '非平稳')
+        self.verdicts[verdict] += 1
+        conclusion = result.get('overall_conclusion', 'N/A')
+        self.conclusions[conclusion] = self.conclusions.get(conclusion, 0) + 1
+        
+        for key, _, flag in REPORT_TESTS:
+            test = result.get(key)
+            if test is None or 'error' in test:
+                self.test_counts[key]['error'] += 1
+                continue
+            self.test_counts[key]['pass' if test[flag] else 'fail'] += 1
+            
+            p_value = test['p_value']
+            if p_value is None or np.isnan(p_value):
+                continue
+            # 右端点归入最后一个分箱
+            index = min(int(np.searchsorted(self.bins, p_value, side='right')) - 1, len(self.bins) - 2)
+            if index >= 0:
+                self.histograms[key][index] += 1
+            moments = self.p_value_moments[key]
+            moments[0] += 1
+            moments[1] += p_value
+            moments[2] = min(moments[2], p_value)
+            moments[3] = max(moments[3], p_value)
+    
+    def verdict_table(self) -> pd.DataFrame:
+        """
+        各检验的结论计数表
+        
+        Returns:
+            每行一个检验，列为通过、未通过和失败的序列数
+        """
+        rows = [{
+            '检验': '综合结论',
+            '平稳/独立': self.verdicts['平稳'],
+            '非平稳/存在自相关': self.verdicts['非平稳'],
+            '失败/无法判断': self.verdicts['无法判断']
+        }]
+        for key, label, _ in REPORT_TESTS:
+            counts = self.test_counts[key]
+            rows.append({
+                '检验': label,
+                '平稳/独立': counts['pass'],
+                '非平稳/存在自相关': counts['fail'],
+                '失败/无法判断': counts['error']
+            })
+        return pd.DataFrame(rows)
+    
+    def p_value_table(self) -> pd.DataFrame:
+        """
+        各检验的p值分布表
+        
+        Returns:
+            每行一个p值区间，每列一个检验的序列数
+        """
+        labels = [f"[{low:.2f}, {high:.2f}{']' if i == len(self.bins) - 2 else ')'}"
+                  for i, (low, high) in enumerate(zip(self.bins[:-1], self.bins[1:]))]
+        table = pd.DataFrame({'p值区间': labels})
+        for key, label, _ in REPORT_TESTS:
+            table[label] = self.histograms[key]
+        return table
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典
+        
+        Returns:
+            包含序列数、结论计数、各检验计数、p值直方图和p值统计的字典
+        """
+        p_value_stats = {}
+        for key, *_ in REPORT_TESTS:
+            count, total, low, high = self.p_value_moments[key]
+            p_value_stats[key] = {
+                'count': count,
+                'mean': total / count if count else None,
+                'min': low if count else None,
+                'max': high if count else None
+            }
+        return {
+            'n_series': self.n_series,
+            'n_errors': self.n_errors,
+            'verdicts': dict(self.verdicts),
+            'conclusions': dict(self.conclusions),
+            'test_counts': {key: dict(counts) for key, counts in self.test_counts.items()},
+            'p_value_bins': self.bins.tolist(),
+            'p_value_histograms': {key: counts.tolist() for key, counts in self.histograms.items()},
+            'p_value_stats': p_value_stats
+        }
+
+
+def _p_value(result: Mapping[str, Any], key: str) -> str:
+    test = result.get(key)
+    if test is None or 'error' in test:
+        return 'N/A'
+    return format_number(test['p_value'])
+
+
+def _series_row(name: str, result: Mapping[str, Any]) -> List[str]:
+    """单个序列在汇总表中的一行"""
+    if 'error' in result:
+        return [name, result['error'], 'N/A', 'N/A', 'N/A', 'N/A']
+    count = result.get('basic_statistics', {}).get('count', 'N/A')
+    return [name, result.get('overall_conclusion', 'N/A')] + \
+        [_p_value(result, key) for key, *_ in REPORT_TESTS] + [str(count)]
+
+
+def _test_details(result: Mapping[str, Any]) -> List[Tuple[str, List[Tuple[str, str]]]]:
+    """单个序列各项检验的详细指标: [(检验名称, [(指标, 值)])]"""
+    details = []
+    for key, label, _ in REPORT_TESTS:
+        test = result.get(key)
+        if test is None:
+            continue
+        if 'error' in test:
+            details.append((label, [('错误', test['error'])]))
+            continue
+        items = [
+            ('检验统计量', format_number(test['test_statistic'])),
+            ('p值', format_number(test['p_value']))
+        ]
+        if 'used_lag' in test:
+            items.append(('使用滞后期', str(test['used_lag'])))
+        if 'lags' in test:
+            items.append(('滞后期', str(test['lags'])))
+        if 'critical_values' in test:
+            items.append(('临界值', ', '.join(
+                f"{level}: {value:.4f}" for level, value in test['critical_values'].items()
+            )))
+        items.append(('结论', test['conclusion']))
+        details.append((label, items))
+    return details
+
+
+class _MarkdownRenderer:
+    """Markdown格式的报告片段"""
+    
+    @staticmethod
+    def _cell(value: Any) -> str:
+        return str(value).replace('|', '\\|').replace('\n', ' ')
+    
+    def header(self, title: str) -> str:
+        return f"# {title}\n**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    
+    def heading(self, text: str, level: int) -> str:
+        return f"{'#' * level} {text}\n\n"
+    
+    def paragraph(self, text: str) -> str:
+        return f"{text}\n\n"
+    
+    def table(self, frame: pd.DataFrame) -> str:
+        lines = [self.table_start(list(frame.columns))]
+        lines += [self.table_row(list(row)) for row in frame.itertuples(index=False)]
+        return ''.join(lines) + self.table_end()
+    
+    def table_start(self, columns: List[str]) -> str:
+        return (f"| {' | '.join(columns)} |\n"
+                f"|{'|'.join(['---'] * len(columns))}|\n")
+    
+    def table_row(self, cells: List[Any]) -> str:
+        return f"| {' | '.join(self._cell(cell) for cell in cells)} |\n"
+    
+    def table_end(self) -> str:
+        return "\n"
+    
+    def series_details(self, name: str, result: Mapping[str, Any]) -> str:
+        if 'error' in result:
+            return f"### {name}\n- **错误**: {result['error']}\n\n"
+        parts = [f"### {name}\n**综合结论**: {result.get('overall_conclusion', 'N/A')}\n\n"]
+        for label, items in _test_details(result):
+            parts.append(f"#### {label}\n")
+            parts += [f"- **{field}**: {value}\n" for field, value in items]
+            parts.append("\n")
+        return ''.join(parts)
+    
+    def footer(self) -> str:
+        return ""
+
+
+class _HTMLRenderer:
+    """HTML格式的报告片段"""
+    
+    def header(self, title: str) -> str:
+        title = html.escape(title)
+        return (
+            "<!DOCTYPE html>\n<html lang=\"zh-CN\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{title}</title>\n"
+            "<style>body{font-family:sans-serif;margin:2rem}"
+            "table{border-collapse:collapse;margin-bottom:1.5rem}"
+            "th,td{border:1px solid #ccc;padding:0.25rem 0.6rem;text-align:left}"
+            "th{background:#f0f2f6}</style>\n</head>\n<body>\n"
+            f"<h1>{title}</h1>\n"
+            f"<p><strong>生成时间</strong>: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>\n"
+        )
+    
+    def heading(self, text: str, level: int) -> str:
+        return f"<h{level}>{html.escape(text)}</h{level}>\n"
+    
+    def paragraph(self, text: str) -> str:
+        return f"<p>{html.escape(text)}</p>\n"
+    
+    def table(self, frame: pd.DataFrame) -> str:
+        lines = [self.table_start(list(frame.columns))]
+        lines += [self.table_row(list(row)) for row in frame.itertuples(index=False)]
+        return ''.join(lines) + self.table_end()
+    
+    def table_start(self, columns: List[str]) -> str:
+        cells = ''.join(f"<th>{html.escape(str(column))}</th>" for column in columns)
+        return f"<table>\n<thead><tr>{cells}</tr></thead>\n<tbody>\n"
+    
+    def table_row(self, cells: List[Any]) -> str:
+        return f"<tr>{''.join(f'<td>{html.escape(str(cell))}</td>' for cell in cells)}</tr>\n"
+    
+    def table_end(self) -> str:
+        return "</tbody>\n</table>\n"
+    
+    def series_details(self, name: str, result: Mapping[str, Any]) -> str:
+        parts = [f"<h3>{html.escape(name)}</h3>\n"]
+        if 'error' in result:
+            parts.append(f"<p><strong>错误</strong>: {html.escape(result['error'])}</p>\n")
+            return ''.join(parts)
+        parts.append(f"<p><strong>综合结论</strong>: "
+                     f"{html.escape(str(result.get('overall_conclusion', 'N/A')))}</p>\n")
+        for label, items in _test_details(result):
+            parts.append(f"<h4>{html.escape(label)}</h4>\n<ul>\n")
+            parts += [f"<li><strong>{html.escape(field)}</strong>: {html.escape(value)}</li>\n"
+                      for field, value in items]
+            parts.append("</ul>\n")
+        return ''.join(parts)
+    
+    def footer(self) -> str:
+        return "</body>\n</html>\n"
+
+
+class BatchReportWriter:
+    """
+    流式批量报告写入器
+    
+    每个序列的结果在 add() 时立即写入临时文件并更新汇总统计，随后即可释放；
+    close() 时先写出标题和汇总表，再拼接临时文件中的逐序列内容，
+    因此汇总表位于报告开头，但整个过程只遍历一次结果
+    """
+    
+    def __init__(self, path: str, file_format: str = 'markdown', details: bool = False,
+                 title: str = "时间序列平稳性批量分析报告",
+                 bins: Sequence[float] = P_VALUE_BINS):
+        """
+        初始化写入器
+        
+        Args:
+            path: 输出文件路径
+            file_format: 'markdown' 或 'html'
+            details: 是否为每个序列输出各项检验的详细指标（否则每个序列一行）
+            title: 报告标题
+            bins: p值分布的分箱边界
+        """
+        if file_format not in REPORT_FORMATS:
+            raise ValueError(f"不支持的报告格式: {file_format}")
+        self.path = path
+        self.details = details
+        self.title = title
+        self.summary = BatchSummary(bins)
+        self._renderer = _MarkdownRenderer() if file_format == 'markdown' else _HTMLRenderer()
+        self._body = tempfile.NamedTemporaryFile(
+            'w+', encoding='utf-8', suffix='.part', delete=False,
+            dir=os.path.dirname(os.path.abspath(path))
+        )
+        if not details:
+            self._body.write(self._renderer.table_start(SERIES_COLUMNS))
+    
+    def add(self, name: str, result: Mapping[str, Any]) -> None:
+        """
+        写入一个序列的结果
+        
+        Args:
+            name: 序列名称
+            result: comprehensive_test 的返回值
+        """
+        self.summary.update(result)
+        if self.details:
+            self._body.write(self._renderer.series_details(str(name), result))
+        else:
+            self._body.write(self._renderer.table_row(_series_row(str(name), result)))
+    
+    def close(self) -> Dict[str, Any]:
+        """
+        写出完整报告并删除临时文件
+        
+        Returns:
+            汇总统计字典，附带 path 字段
+        """
+        renderer = self._renderer
+        try:
+            if not self.details:
+                self._body.write(renderer.table_end())
+            self._body.flush()
+            self._body.seek(0)
+            
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(renderer.header(self.title))
+                f.write(renderer.heading("汇总", 2))
+                f.write(renderer.paragraph(
+                    f"共 {self.summary.n_series} 个序列，其中 {self.summary.n_errors} 个分析失败"
+                ))
+                f.write(renderer.heading("结论计数", 3))
+                f.write(renderer.table(self.summary.verdict_table()))
+                if self.summary.conclusions:
+                    f.write(renderer.heading("综合结论分布", 3))
+                    f.write(renderer.table(pd.DataFrame(
+                        sorted(self.summary.conclusions.items(), key=lambda item: -item[1]),
+                        columns=['综合结论', '序列数']
+                    )))
+                f.write(renderer.heading("p值分布", 3))
+                f.write(renderer.table(self.summary.p_value_table()))
+                f.write(renderer.heading("各序列结果", 2))
+                shutil.copyfileobj(self._body, f)
+                f.write(renderer.footer())
+        finally:
+            self._discard_body()
+        return {'path': self.path, **self.summary.to_dict()}
+    
+    def abort(self) -> None:
+        """放弃写入并删除临时文件"""
+        self._discard_body()
+    
+    def _discard_body(self) -> None:
+        if not self._body.closed:
+            self._body.close()
+        if os.path.exists(self._body.name):
+            os.remove(self._body.name)
+
+
+def write_batch_report(results: Iterable[Any], path: str, file_format: str = 'markdown',
+                       details: bool = False, **kwargs) -> Dict[str, Any]:
+    """
+    将多个序列的综合检验结果流式写入一份合并报告
+    
+    结果逐个消费，可以传入生成器，例如边分析边写入：
+    ((name, StationarityAnalyzer(s).comprehensive_test()) for name, s in df.items())
+    
+    Args:
+        results: (序列名称, 综合检验结果) 的可迭代对象、名称->结果 的映射，
+                 或仅包含结果的可迭代对象（按顺序命名）
+        path: 输出文件路径
+        file_format: 'markdown' 或 'html'
+        details: 是否为每个序列输出各项检验的详细指标
+        **kwargs: 传递给 BatchReportWriter 的其他参数（title、bins）
+    
+    Returns:
+        汇总统计字典，附带 path 字段
+    """
+    if isinstance(results, Mapping):
+        results = results.items()
+    
+    writer = BatchReportWriter(path, file_format=file_format, details=details, **kwargs)
+    try:
+        for i, item in enumerate(results):
+            if isinstance(item, tuple) and len(item) == 2:
+                name, result = item
+            else:
+                name, result = f"序列 {i + 1}", item
+            writer.add(name, result)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
@@ -0,0 +1,272 @@
+"""
+检验结果模块
+提供紧凑的检验结果类型：数值字段存放在单个数组中，解释文本在访问时才生成。
+结果类型实现了 Mapping 接口，可以像原来的结果字典一样按键访问。
+"""
+
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+def format_interpretation(stat: float, p_value: float, critical_values: Dict[str, float],
+                          null_is_stationary: bool) -> str:
+    """
+    生成检验结果的文字解释
+    
+    Args:
+        stat: 检验统计量
+        p_value: p值
+        critical_values: 各显著性水平的临界值
+        null_is_stationary: 原假设是否为序列平稳（KPSS为True，ADF为False）
+    
+    Returns:
+        多行解释文本
+    """
+    interpretation = f"检验统计量: {stat:.4f}\n"
+    interpretation += f"p值: {p_value:.4f}\n"
+    interpretation += "临界值:\n"
+    
+    for key, value in critical_values.items():
+        comparison = "通过" if stat < value else "未通过"
+        interpretation += f"  {key}: {value:.4f} ({comparison})\n"
+    
+    if null_is_stationary:
+        if p_value > 0.05:
+            interpretation += "\n结论: 无法拒绝原假设，序列是平稳的"
+        else:
+            interpretation += "\n结论: 拒绝原假设，序列是非平稳的"
+    else:
+        if p_value < 0.05:
+            interpretation += "\n结论: 拒绝原假设，序列是平稳的"
+        else:
+            interpretation += "\n结论: 无法拒绝原假设，序列可能存在单位根（非平稳）"
+    
+    return interpretation
+
+
+class TestResult(Mapping):
+    """
+    检验结果基类
+    
+    子类通过 _fields 声明数值字段，其值与临界值一起存放在一个 float64 数组中；
+    is_stationary、conclusion、interpretation 等派生字段在访问时计算。
+    """
+    
+    __slots__ = ('_values', 'timings')
+    
+    test_name: str = ''
+    _fields: Tuple[str, ...] = ()
+    _int_fields: Tuple[str, ...] = ()
+    _keys: Tuple[str, ...] = ()
+    
+    def __init__(self, values: np.ndarray):
+        self._values = values
+        self.timings: Optional[Dict[str, Any]] = None
+    
+    def _numeric(self, name: str):
+        value = self._values[self._fields.index(name)]
+        return int(value) if name in self._int_fields else float(value)
+    
+    def _derived(self, name: str):
+        raise KeyError(name)
+    
+    def __getitem__(self, key: str):
+        if key == 'timings' and self.timings is not None:
+            return self.timings
+        if key not in self._keys:
+            raise KeyError(key)
+        if key == 'test_name':
+            return self.test_name
+        if key in self._fields:
+            return self._numeric(key)
+        return self._derived(key)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key != 'timings':
+            raise TypeError(f"检验结果字段 '{key}' 为只读")
+        self.timings = value
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys or (key == 'timings' and self.timings is not None)
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from self._keys
+        if self.timings is not None:
+            yield 'timings'
+    
+    def __len__(self) -> int:
+        return len(self._keys) + (self.timings is not None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为普通字典
+        
+        Returns:
+            与原结果字典格式相同的字典
+        """
+        return {key: self[key] for key in self}
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={self._numeric(name)}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+    
+    def __getstate__(self):
+        return {'_values': self._values, 'timings': self.timings}
+    
+    def __setstate__(self, state):
+        self._values = state['_values']
+        self.timings = state['timings']
+
+
+class _UnitRootTestResult(TestResult):
+    """带临界值的单位根/平稳性检验结果（ADF、KPSS）"""
+    
+    __slots__ = ()
+    
+    # 原假设是否为序列平稳
+    _null_is_stationary = False
+    # 临界值的显著性水平，按此顺序存放在数值字段之后
+    _critical_levels: Tuple[str, ...] = ()
+    
+    @property
+    def critical_values(self) -> Dict[str, float]:
+        """各显著性水平的临界值"""
+        offset = len(self._fields)
+        return {level: float(self._values[offset + i]) for i, level in enumerate(self._critical_levels)}
+    
+    @property
+    def is_stationary(self) -> bool:
+        """是否平稳"""
+        p_value = self._values[self._fields.index('p_value')]
+        return bool(p_value > 0.05) if self._null_is_stationary else bool(p_value < 0.05)
+    
+    @property
+    def interpretation(self) -> str:
+        """详细解释（访问时生成）"""
+        return format_interpretation(
+            self._numeric('test_statistic'), self._numeric('p_value'),
+            self.critical_values, self._null_is_stationary
+        )
+    
+    def _derived(self, name: str):
+        if name == 'critical_values':
+            return self.critical_values
+        if name == 'is_stationary':
+            return self.is_stationary
+        if name == 'conclusion':
+            return '时间序列是平稳的' if self.is_stationary else '时间序列不是平稳的'
+        if name == 'interpretation':
+            return self.interpretation
+        raise KeyError(name)
+    
+    @classmethod
+    def _pack(cls, numeric: Tuple[float, ...], critical_values: Dict[str, float]) -> np.ndarray:
+        values = np.empty(len(cls._fields) + len(cls._critical_levels))
+        values[:len(cls._fields)] = numeric
+        for i, level in enumerate(cls._critical_levels):
+            values[len(cls._fields) + i] = critical_values.get(level, np.nan)
+        return values
+
+
+class ADFResult(_UnitRootTestResult):
+    """ADF检验结果"""
+    
+    __slots__ = ()
+    
+    test_name = 'ADF检验 (增强迪基-富勒检验)'
+    _fields = ('test_statistic', 'p_value', 'used_lag', 'n_obs')
+    _int_fields = ('used_lag', 'n_obs')
+    _keys = ('test_name', 'test_statistic', 'p_value', 'critical_values', 'used_lag',
+             'n_obs', 'is_stationary', 'conclusion', 'interpretation')
+    _null_is_stationary = False
+    _critical_levels = ('1%', '5%', '10%')
+    
+    @classmethod
+    def from_statsmodels(cls, adf_result: Tuple) -> 'ADFResult':
+        """
+        由 adfuller 的返回值构造
+        
+        Args:
+            adf_result: (统计量, p值, 使用的滞后期, 观测值数量, 临界值, ...)
+        """
+        numeric = (adf_result[0], adf_result[1], adf_result[2], adf_result[3])
+        return cls(cls._pack(numeric, adf_result[4]))
+
+
+class KPSSResult(_UnitRootTestResult):
+    """KPSS检验结果"""
+    
+    __slots__ = ()
+    
+    test_name = 'KPSS检验'
+    _fields = ('test_statistic', 'p_value', 'used_lag')
+    _int_fields = ('used_lag',)
+    _keys = ('test_name', 'test_statistic', 'p_value', 'critical_values', 'used_lag',
+             'is_stationary', 'conclusion', 'interpretation')
+    _null_is_stationary = True
+    _critical_levels = ('10%', '5%', '2.5%', '1%')
+    
+    @classmethod
+    def from_statsmodels(cls, kpss_result: Tuple) -> 'KPSSResult':
+        """
+        由 kpss 的返回值构造
+        
+        Args:
+            kpss_result: (统计量, p值, 使用的滞后期, 临界值)
+        """
+        numeric = (kpss_result[0], kpss_result[1], kpss_result[2])
+        return cls(cls._pack(numeric, kpss_result[3]))
+
+
+class LjungBoxResult(TestResult):
+    """Ljung-Box检验结果"""
+    
+    __slots__ = ('full_results',)
+    
+    test_name = 'Ljung-Box检验'
+    _fields = ('test_statistic', 'p_value', 'lags')
+    _int_fields = ('lags',)
+    _keys = ('test_name', 'test_statistic', 'p_value', 'lags', 'is_independent',
+             'conclusion', 'full_results')
+    
+    def __init__(self, values: np.ndarray, full_results: Optional[pd.DataFrame] = None):
+        super().__init__(values)
+        self.full_results = full_results
+    
+    @property
+    def is_independent(self) -> bool:
+        """残差是否独立"""
+        return bool(self._values[1] > 0.05)
+    
+    def _derived(self, name: str):
+        if name == 'is_independent':
+            return self.is_independent
+        if name == 'conclusion':
+            return '残差是独立的' if self.is_independent else '残差存在自相关'
+        if name == 'full_results':
+            return self.full_results
+        raise KeyError(name)
+    
+    @classmethod
+    def from_statsmodels(cls, lb_result: pd.DataFrame, lags: int) -> 'LjungBoxResult':
+        """
+        由 acorr_ljungbox 返回的DataFrame构造
+        
+        Args:
+            lb_result: 各滞后期的检验结果
+            lags: 滞后阶数
+        """
+        # 取最后一个滞后期的结果
+        last_lag = lb_result.iloc[-1]
+        values = np.array([last_lag['lb_stat'], last_lag['lb_pvalue'], lags], dtype=float)
+        return cls(values, lb_result)
+    
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['full_results'] = self.full_results
+        return state
+    
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.full_results = state['full_results']
@@ -0,0 +1,355 @@
+"""
+检验结果存储模块
+将每次综合检验的序列指纹、参数、统计量、p值、结论和耗时写入SQLite数据库，
+按序列和时间建立索引，支持批量写入、按条件查询和按指纹复用历史结果
+"""
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import weakref
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .utils import series_fingerprint
+
+# 结果表中逐项检验的列: (结果键, 列名前缀, 判断字段)
+_STORED_TESTS = (
+    ('adf_test', 'adf', 'is_stationary'),
+    ('kpss_test', 'kpss', 'is_stationary'),
+    ('ljung_box_test', 'ljung_box', 'is_independent'),
+)
+
+# 查询结果中的摘要列（不含完整结果等JSON字段）
+SUMMARY_COLUMNS = [
+    'id', 'series_id', 'fingerprint', 'created_at', 'params', 'n_obs', 'start_time', 'end_time',
+    'overall_conclusion', 'is_stationary',
+    'adf_statistic', 'adf_p_value', 'adf_stationary',
+    'kpss_statistic', 'kpss_p_value', 'kpss_stationary',
+    'ljung_box_statistic', 'ljung_box_p_value', 'ljung_box_independent',
+    'wall_time', 'error'
+]
+
+# 写入的列：摘要列（ID自动生成）和JSON字段
+_INSERT_COLUMNS = SUMMARY_COLUMNS[1:] + ['statistics', 'timings', 'result']
+_INSERT_SQL = (f"INSERT INTO runs ({', '.join(_INSERT_COLUMNS)}) "
+               f"VALUES ({', '.join('?' for _ in _INSERT_COLUMNS)})")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    series_id TEXT NOT NULL,
+    fingerprint TEXT,
+    created_at TEXT NOT NULL,
+    params TEXT NOT NULL,
+    n_obs INTEGER,
+    start_time TEXT,
+    end_time TEXT,
+    overall_conclusion TEXT,
+    is_stationary INTEGER,
+    adf_statistic REAL,
+    adf_p_value REAL,
+    adf_stationary INTEGER,
+    kpss_statistic REAL,
+    kpss_p_value REAL,
+    kpss_stationary INTEGER,
+    ljung_box_statistic REAL,
+    ljung_box_p_value REAL,
+    ljung_box_independent INTEGER,
+    wall_time REAL,
+    error TEXT,
+    statistics TEXT,
+    timings TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_series_time ON runs (series_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_fingerprint ON runs (fingerprint, params, created_at);
+"""
+
+
+def to_plain(value: Any) -> Any:
+    """
+    将检验结果转换为可JSON序列化的普通值
+    
+    映射（包括只读映射和检验结果对象）转换为字典，NumPy标量和数组转换为
+    Python数值和列表，DataFrame按列转换，时间戳转换为ISO字符串，NaN转换为None
+    
+    Args:
+        value: 任意值
+    
+    Returns:
+        普通值
+    """
+    if isinstance(value, Mapping):
+        return {str(key): to_plain(item) for key, item in value.items()}
+    if isinstance(value, pd.DataFrame):
+        return {str(key): to_plain(item) for key, item in value.to_dict(orient='list').items()}
+    if isinstance(value, (pd.Series, pd.Index, np.ndarray, list, tuple)):
+        return [to_plain(item) for item in (value.tolist() if hasattr(value, 'tolist') else value)]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(to_plain(value), ensure_ascii=False, sort_keys=True)
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _optional_bool(value: Any) -> Optional[int]:
+    return None if value is None else int(bool(value))
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    if value is None or pd.isna(value):
+        return None
+    return pd.Timestamp(value).isoformat()
+
+
+def _created(value: Any) -> str:
+    """记录时间的存储格式（定宽，按字典序即按时间排序）"""
+    return pd.Timestamp(value).isoformat(sep=' ', timespec='microseconds')
+
+
+class ResultsStore:
+    """
+    检验结果存储
+    
+    每次检验在 runs 表中占一行：常用字段（p值、结论等）单独成列以便按条件查询，
+    完整结果、基本统计量和耗时以JSON保存。连接在对象生命周期内复用，
+    允许跨线程使用，写入由锁串行化；数据库使用WAL模式，读写互不阻塞。
+    """
+    
+    def __init__(self, path: str, timeout: float = 5.0):
+        """
+        打开（必要时创建）结果数据库
+        
+        Args:
+            path: 数据库文件路径
+            timeout: 数据库被锁定时的等待时间（秒）
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        weakref.finalize(self, self._connection.close)
+        with self._lock:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(_SCHEMA)
+            self._connection.commit()
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._connection.close()
+    
+    def _row(self, series_id: str, data: Optional[pd.Series], result: Mapping[str, Any],
+             params: Optional[Dict[str, Any]], fingerprint: Optional[str],
+             created_at: Optional[datetime]) -> Tuple:
+        """将一次检验转换为 runs 表的一行"""
+        if fingerprint is None and data is not None:
+            fingerprint = series_fingerprint(data)
+        values: Dict[str, Any] = {
+            'series_id': str(series_id),
+            'fingerprint': fingerprint,
+            'created_at': _created(created_at or datetime.now()),
+            'params': _dumps(params or {}),
+            'n_obs': len(data) if data is not None else None,
+            'start_time': _timestamp(data.index[0]) if data is not None and len(data) else None,
+            'end_time': _timestamp(data.index[-1]) if data is not None and len(data) else None,
+            'overall_conclusion': result.get('overall_conclusion'),
+            'is_stationary': _optional_bool(result.get('is_stationary')),
+            'wall_time': _optional_float((result.get('timings') or {}).get('wall_time')),
+            'error': result.get('error'),
+            'statistics': _dumps(result['basic_statistics']) if 'basic_statistics' in result else None,
+            'timings': _dumps(result['timings']) if 'timings' in result else None,
+            'result': _dumps(result)
+        }
+        for key, prefix, flag in _STORED_TESTS:
+            test = result.get(key)
+            valid = test is not None and 'error' not in test
+            values[f"{prefix}_statistic"] = _optional_float(test['test_statistic']) if valid else None
+            values[f"{prefix}_p_value"] = _optional_float(test['p_value']) if valid else None
+            values[f"{prefix}_{flag[len('is_'):]}"] = _optional_bool(test[flag]) if valid else None
+        return tuple(values[column] for column in _INSERT_COLUMNS)
+    
+    def record(self, series_id: str, data: Optional[pd.Series], result: Mapping[str, Any],
+               params: Optional[Dict[str, Any]] = None, fingerprint: Optional[str] = None,
+               created_at: Optional[datetime] = None) -> int:
+        """
+        记录一次综合检验
+        
+        Args:
+            series_id: 序列标识（如列名或实体名）
+            data: 被检验的序列，用于计算指纹和时间范围；为None时需提供 fingerprint
+            result: comprehensive_test 的返回值
+            params: 检验参数（如重复值处理方式、是否记录耗时），查询历史结果时按其匹配
+            fingerprint: 序列指纹，默认由 data 计算
+            created_at: 记录时间，默认为当前时间
+        
+        Returns:
+            记录的ID
+        """
+        row = self._row(series_id, data, result, params, fingerprint, created_at)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(_INSERT_SQL, row)
+            return cursor.lastrowid
+    
+    def record_many(self, runs: Iterable[Tuple[str, Optional[pd.Series], Mapping[str, Any]]],
+                    params: Optional[Dict[str, Any]] = None,
+                    created_at: Optional[datetime] = None) -> int:
+        """
+        在一个事务中批量记录多次检验
+        
+        Args:
+            runs: (序列标识, 序列, 检验结果) 的可迭代对象
+            params: 所有检验共用的参数
+            created_at: 记录时间，默认为当前时间
+        
+        Returns:
+            写入的记录数
+        """
+        created_at = created_at or datetime.now()
+        rows = [self._row(series_id, data, result, params, None, created_at)
+                for series_id, data, result in runs]
+        with self._lock, self._connection:
+            self._connection.executemany(_INSERT_SQL, rows)
+        return len(rows)
+    
+    def query(self, series_id: Optional[str] = None, fingerprint: Optional[str] = None,
+              since: Any = None, until: Any = None, limit: Optional[int] = None,
+              ascending: bool = False) -> pd.DataFrame:
+        """
+        按条件查询检验记录
+        
+        Args:
+            series_id: 序列标识
+            fingerprint: 序列指纹
+            since: 记录时间下限（含）
+            until: 记录时间上限（含）
+            limit: 最多返回的记录数
+            ascending: 是否按记录时间升序排列（默认最新的在前）
+        
+        Returns:
+            每行一次检验的数据框，列见 SUMMARY_COLUMNS
+        """
+        clauses, params = [], []
+        if series_id is not None:
+            clauses.append('series_id = ?')
+            params.append(str(series_id))
+        if fingerprint is not None:
+            clauses.append('fingerprint = ?')
+            params.append(fingerprint)
+        if since is not None:
+            clauses.append('created_at >= ?')
+            params.append(_created(since))
+        if until is not None:
+            clauses.append('created_at <= ?')
+            params.append(_created(until))
+        
+        sql = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM runs"
+        if clauses:
+            sql += f" WHERE {' AND '.join(clauses)}"
+        sql += f" ORDER BY created_at {'ASC' if ascending else 'DESC'}, id {'ASC' if ascending else 'DESC'}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        frame = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+        frame['created_at'] = pd.to_datetime(frame['created_at'], format='ISO8601')
+        for column in ('is_stationary', 'adf_stationary', 'kpss_stationary', 'ljung_box_independent'):
+            frame[column] = frame[column].map({1: True, 0: False})
+        return frame
+    
+    def series_ids(self) -> pd.DataFrame:
+        """
+        列出所有序列标识
+        
+        Returns:
+            包含 series_id、runs（记录数）、last_run（最近记录时间）的数据框
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT series_id, COUNT(*), MAX(created_at) FROM runs "
+                "GROUP BY series_id ORDER BY MAX(created_at) DESC"
+            ).fetchall()
+        frame = pd.DataFrame(rows, columns=['series_id', 'runs', 'last_run'])
+        frame['last_run'] = pd.to_datetime(frame['last_run'], format='ISO8601')
+        return frame
+    
+    def load_result(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """
+        读取一次检验的完整结果
+        
+        Args:
+            run_id: 记录ID
+        
+        Returns:
+            结果字典（普通值），记录不存在时返回None
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT result FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row is not None and row[0] is not None else None
+    
+    def lookup(self, fingerprint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        查找相同序列、相同参数的最近一次成功检验的完整结果，用于避免重复计算
+        
+        Args:
+            fingerprint: 序列指纹
+            params: 检验参数
+        
+        Returns:
+            结果字典（普通值），没有记录时返回None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result FROM runs WHERE fingerprint = ? AND params = ? AND error IS NULL "
+                "ORDER BY created_at DESC, id DESC LIMIT 1",
+                (fingerprint, _dumps(params or {}))
+            ).fetchone()
+        return json.loads(row[0]) if row is not None and row[0] is not None else None
+    
+    def delete(self, series_id: Optional[str] = None, before: Any = None) -> int:
+        """
+        删除检验记录
+        
+        Args:
+            series_id: 只删除该序列的记录
+            before: 只删除早于该时间的记录
+        
+        Returns:
+            删除的记录数
+        """
+        clauses, params = [], []
+        if series_id is not None:
+            clauses.append('series_id = ?')
+            params.append(str(series_id))
+        if before is not None:
+            clauses.append('created_at < ?')
+            params.append(_created(before))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock, self._connection:
+            return self._connection.execute(f"DELETE FROM runs{where}", params).rowcount
+
@@ -0,0 +1,226 @@
+"""
+滚动统计模块
+基于补偿求和前缀和的 O(n) 多窗口滚动统计引擎
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterable, Tuple
+
+
+def _compensated_prefix_sum(values: np.ndarray, block_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算补偿求和的前缀和
+    
+    块内使用向量化累加，块间偏移量使用Kahan求和，最后用TwoSum
+    保留偏移量与块内累加相加时的舍入误差。
+    
+    Args:
+        values: 一维数组
+        block_size: 分块大小
+    
+    Returns:
+        (hi, lo) 两个长度为 n+1 的数组，前缀和约等于 hi + lo
+    """
+    n = len(values)
+    hi = np.zeros(n + 1)
+    lo = np.zeros(n + 1)
+    if n == 0:
+        return hi, lo
+    
+    n_blocks = -(-n // block_size)
+    padded = np.zeros(n_blocks * block_size)
+    padded[:n] = values
+    inner = np.cumsum(padded.reshape(n_blocks, block_size), axis=1)
+    
+    # Kahan求和得到每个块起点的偏移量（total为高位，-compensation为低位）
+    offsets_hi = np.empty(n_blocks)
+    offsets_lo = np.empty(n_blocks)
+    total, compensation = 0.0, 0.0
+    for i, block_total in enumerate(inner[:, -1].tolist()):
+        offsets_hi[i] = total
+        offsets_lo[i] = -compensation
+        y = block_total - compensation
+        t = total + y
+        compensation = (t - total) - y
+        total = t
+    
+    # TwoSum：s = a + b 以及其精确舍入误差
+    a = np.broadcast_to(offsets_hi[:, None], inner.shape)
+    s = a + inner
+    bb = s - a
+    err = (a - (s - bb)) + (inner - bb)
+    
+    hi[1:] = s.ravel()[:n]
+    lo[1:] = (err + offsets_lo[:, None]).ravel()[:n]
+    return hi, lo
+
+
+class RollingStatistics:
+    """
+    滚动统计引擎
+    
+    每个序列只计算一次 x 与 x² 的前缀和（先减去均值以减小抵消误差），
+    之后任意窗口的滚动均值、标准差均可通过前缀数组的切片在 O(n) 内得到，
+    无需重新扫描数据。结果与 pandas 的 rolling(window) 语义一致：
+    窗口内存在缺失值时结果为 NaN。
+    """
+    
+    def __init__(self, data: pd.Series, block_size: int = 1024):
+        """
+        初始化引擎并预计算前缀和
+        
+        Args:
+            data: 时间序列数据
+            block_size: 补偿求和的分块大小
+        """
+        self.data = data
+        self.index = data.index
+        values = data.to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        
+        self._shift = float(values[valid].mean()) if valid.any() else 0.0
+        centered = np.where(valid, values - self._shift, 0.0)
+        
+        self._count = np.concatenate(([0], np.cumsum(valid)))
+        self._sum = _compensated_prefix_sum(centered, block_size)
+        self._sumsq = _compensated_prefix_sum(centered * centered, block_size)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    @staticmethod
+    def _window_difference(prefix: Tuple[np.ndarray, np.ndarray], window: int) -> np.ndarray:
+        """利用前缀和计算所有完整窗口的和"""
+        hi, lo = prefix
+        return (hi[window:] - hi[:-window]) + (lo[window:] - lo[:-window])
+    
+    def _window_moments(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算以每个位置结尾的窗口的均值和方差 (ddof=0，已中心化)
+        
+        Returns:
+            长度为 n 的 (均值, 方差) 数组，前 window-1 个位置及含缺失值的窗口为 NaN
+        """
+        n = len(self)
+        if window < 1:
+            raise ValueError("窗口大小必须为正整数")
+        
+        mean = np.full(n, np.nan)
+        var = np.full(n, np.nan)
+        if window > n:
+            return mean, var
+        
+        count = self._count[window:] - self._count[:-window]
+        complete = count == window
+        s1 = self._window_difference(self._sum, window) / window
+        s2 = self._window_difference(self._sumsq, window) / window
+        
+        mean[window - 1:] = np.where(complete, s1, np.nan)
+        var[window - 1:] = np.where(complete, np.maximum(s2 - s1 * s1, 0.0), np.nan)
+        return mean, var
+    
+    def mean(self, window: int) -> pd.Series:
+        """
+        滚动均值
+        
+        Args:
+            window: 窗口大小
+        
+        Returns:
+            滚动均值序列
+        """
+        mean, _ = self._window_moments(window)
+        return pd.Series(mean + self._shift, index=self.index, name='rolling_mean')
+    
+    def var(self, window: int, ddof: int = 1) -> pd.Series:
+        """
+        滚动方差
+        
+        Args:
+            window: 窗口大小
+            ddof: 自由度修正
+        
+        Returns:
+            滚动方差序列
+        """
+        _, var = self._window_moments(window)
+        if window - ddof <= 0:
+            var = np.full(len(self), np.nan)
+        else:
+            var = var * window / (window - ddof)
+        return pd.Series(var, index=self.index, name='rolling_var')
+    
+    def std(self, window: int, ddof: int = 1) -> pd.Series:
+        """
+        滚动标准差
+        
+        Args:
+            window: 窗口大小
+            ddof: 自由度修正
+        
+        Returns:
+            滚动标准差序列
+        """
+        return np.sqrt(self.var(window, ddof)).rename('rolling_std')
+    
+    def window_statistics(self, windows: Iterable[int], ddof: int = 1) -> Dict[int, pd.DataFrame]:
+        """
+        一次计算多个窗口的滚动均值和标准差
+        
+        Args:
+            windows: 窗口大小列表
+            ddof: 自由度修正
+        
+        Returns:
+            窗口大小 -> 包含 mean、std 两列的DataFrame
+        """
+        return {
+            window: pd.DataFrame({
+                'mean': self.mean(window),
+                'std': self.std(window, ddof)
+            })
+            for window in windows
+        }
+    
+    def variance_ratio(self, window: int) -> pd.Series:
+        """
+        滚动方差比诊断
+        
+        当前窗口方差与紧邻的前一个（不重叠）窗口方差之比，平稳序列应在1附近波动
+        
+        Args:
+            window: 窗口大小
+        
+        Returns:
+            方差比序列
+        """
+        var = self.var(window).to_numpy()
+        ratio = np.full(len(self), np.nan)
+        if len(self) > window:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio[window:] = var[window:] / var[:-window]
+        return pd.Series(ratio, index=self.index, name='variance_ratio')
+    
+    def mean_shift(self, window: int) -> pd.Series:
+        """
+        滚动均值漂移诊断
+        
+        当前窗口与前一个（不重叠）窗口均值之差的标准化统计量，
+        即 (m_t - m_{t-w}) / sqrt((s²_t + s²_{t-w}) / w)，绝对值大于约2时提示均值发生漂移
+        
+        Args:
+            window: 窗口大小
+        
+        Returns:
+            均值漂移统计量序列
+        """
+        mean, _ = self._window_moments(window)
+        var = self.var(window).to_numpy()
+        shift = np.full(len(self), np.nan)
+        if len(self) > window:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                shift[window:] = (mean[window:] - mean[:-window]) / np.sqrt(
+                    (var[window:] + var[:-window]) / window
+                )
+        return pd.Series(shift, index=self.index, name='mean_shift')
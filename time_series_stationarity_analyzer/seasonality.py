@@ -0,0 +1,264 @@
+"""
+季节性分析模块
+提供基于FFT周期图与ACF峰值的季节周期检测，以及适用于长序列的快速分解
+"""
+
+import pandas as pd
+import numpy as np
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Sequence
+
+from .utils import series_fingerprint
+
+# 检测结果缓存：(序列指纹, 参数) -> 候选周期列表
+_PERIOD_CACHE: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+_PERIOD_CACHE_SIZE = 32
+_PERIOD_CACHE_LOCK = threading.Lock()
+
+
+def _fft_autocorrelation(values: np.ndarray) -> np.ndarray:
+    """通过补零FFT计算全部滞后期的自相关函数（values需已中心化）"""
+    n = len(values)
+    n_fft = 1 << int(np.ceil(np.log2(2 * n)))
+    spectrum = np.fft.rfft(values, n=n_fft)
+    autocovariance = np.fft.irfft(spectrum * np.conj(spectrum), n=n_fft)[:n]
+    if autocovariance[0] == 0:
+        return np.zeros(n)
+    return autocovariance / autocovariance[0]
+
+
+def _local_maxima(values: np.ndarray) -> np.ndarray:
+    """返回一维数组中局部极大值的位置"""
+    if len(values) < 3:
+        return np.array([], dtype=int)
+    inner = (values[1:-1] > values[:-2]) & (values[1:-1] >= values[2:])
+    return np.flatnonzero(inner) + 1
+
+
+def detect_seasonal_periods(data: pd.Series, max_candidates: int = 3,
+                            acf_values: Optional[np.ndarray] = None,
+                            min_period: int = 2,
+                            max_period: Optional[int] = None,
+                            min_power_share: float = 0.01) -> List[Dict[str, Any]]:
+    """
+    检测时间序列的季节周期
+    
+    先对去线性趋势后的序列做FFT周期图，取功率最高的若干峰值作为候选周期；
+    再结合ACF在这些滞后期（以及已计算ACF中的峰值）处的取值打分排序。
+    结果按序列指纹缓存。
+    
+    Args:
+        data: 时间序列数据
+        max_candidates: 最多返回的候选周期数
+        acf_values: 已计算的ACF值（可选），用于补充候选周期和打分
+        min_period: 最小周期
+        max_period: 最大周期，默认为序列长度的一半
+        min_power_share: 周期图峰值占总功率的最小比例
+    
+    Returns:
+        候选周期列表，每项包含 period、power、acf、score，按score降序排列
+    """
+    series = data.dropna()
+    n = len(series)
+    max_period = min(max_period or n // 2, n // 2)
+    if n < 2 * min_period or max_period < min_period:
+        return []
+    
+    key = (series_fingerprint(series), max_candidates, min_period, max_period, min_power_share,
+           None if acf_values is None else len(acf_values))
+    with _PERIOD_CACHE_LOCK:
+        cached = _PERIOD_CACHE.get(key)
+        if cached is not None:
+            _PERIOD_CACHE.move_to_end(key)
+            return cached
+    
+    # 去除线性趋势，避免低频泄漏主导周期图
+    values = series.to_numpy(dtype=float)
+    x = np.arange(n)
+    values = values - np.polyval(np.polyfit(x, values, 1), x)
+    
+    # FFT周期图（忽略零频）
+    power = np.abs(np.fft.rfft(values)) ** 2
+    power[0] = 0.0
+    total_power = power.sum()
+    acf_full = _fft_autocorrelation(values)
+    
+    # 周期图峰值：频率分辨率有限，在该频点对应的周期区间内取ACF最大的滞后期
+    candidates: Dict[int, float] = {}
+    peaks = _local_maxima(power)
+    peaks = peaks[np.argsort(power[peaks])[::-1]]
+    for k in peaks[:max_candidates * 4]:
+        share = float(power[k] / total_power) if total_power > 0 else 0.0
+        if share < min_power_share:
+            continue
+        low = max(min_period, int(np.floor(n / (k + 0.5))))
+        high = min(max_period, int(np.ceil(n / (k - 0.5))) if k > 0.5 else max_period)
+        if low > high:
+            continue
+        # 按 n/(n-lag) 修正有偏估计随滞后衰减的影响后再取最大值
+        lags = np.arange(low, high + 1)
+        period = low + int(np.argmax(acf_full[low:high + 1] * n / (n - lags)))
+        candidates[period] = max(candidates.get(period, 0.0), share)
+    
+    # 已计算ACF中的峰值也作为候选
+    if acf_values is not None and len(acf_values) > min_period:
+        acf_array = np.asarray(acf_values, dtype=float)
+        for lag in _local_maxima(acf_array):
+            if min_period <= lag <= max_period and acf_array[lag] > 0:
+                candidates.setdefault(int(lag), 0.0)
+    
+    # 只保留显著且在半周期处明显更低（即ACF真正出现周期性峰值）的候选
+    significance = 1.96 / np.sqrt(n)
+    results = []
+    for period, share in candidates.items():
+        acf_at_period = float(acf_full[period])
+        if acf_at_period <= significance or acf_at_period - acf_full[period // 2] <= significance:
+            continue
+        results.append({
+            'period': period,
+            'power': share,
+            'acf': acf_at_period,
+            'score': share + acf_at_period
+        })
+    
+    # 按得分排序，并去掉与更高得分候选相差不足10%的近似重复周期
+    results.sort(key=lambda item: item['score'], reverse=True)
+    selected: List[Dict[str, Any]] = []
+    for item in results:
+        if all(abs(item['period'] - kept['period']) > 0.1 * kept['period'] for kept in selected):
+            selected.append(item)
+    results = selected[:max_candidates]
+    
+    with _PERIOD_CACHE_LOCK:
+        _PERIOD_CACHE[key] = results
+        _PERIOD_CACHE.move_to_end(key)
+        while len(_PERIOD_CACHE) > _PERIOD_CACHE_SIZE:
+            _PERIOD_CACHE.popitem(last=False)
+    return results
+
+
+def _downsample(values: np.ndarray, factor: int) -> np.ndarray:
+    """按块均值降采样，末尾不足一块的部分单独取均值"""
+    n_full = len(values) // factor * factor
+    blocks = values[:n_full].reshape(-1, factor).mean(axis=1)
+    if n_full < len(values):
+        blocks = np.append(blocks, values[n_full:].mean())
+    return blocks
+
+
+def _downsample_factor(periods: Sequence[int], min_factor: int) -> int:
+    """
+    选择不小于 min_factor 的降采样倍数，使其整除尽可能多的周期
+    
+    降采样后的周期须为整数且至少为2，否则块均值已将该周期抹去或使季节项漂移；
+    整除周期数相同时取较小的倍数
+    """
+    if min_factor <= 1:
+        return 1
+    best, best_count = min_factor, 0
+    for factor in range(min_factor, max(periods) // 2 + 1):
+        count = sum(1 for p in periods if p % factor == 0 and p // factor >= 2)
+        if count > best_count:
+            best, best_count = factor, count
+    return best
+
+
+def decompose_series(data: pd.Series, periods: Optional[Sequence[int]] = None,
+                     method: str = 'auto', max_points: int = 20000) -> Dict[str, Any]:
+    """
+    时间序列季节分解
+    
+    method 为 'auto' 时：序列长度不超过 max_points 且只有一个周期时使用经典加法分解，
+    否则使用 STL（单周期）或 MSTL（多周期）。超长序列先按块均值降采样到
+    max_points 以内再分解，趋势和季节项通过线性插值还原到原始长度。
+    降采样倍数选为尽可能多的周期的约数；不能被整除或短于两个块的周期
+    无法在降采样后的序列上表示。若短于两个块的周期比降采样后能保留的周期更多，
+    则改为按原始分辨率分解末尾 max_points 个点，此时结果只覆盖该窗口。
+    仍无法分解的周期在结果中列出。
+    
+    Args:
+        data: 时间序列数据
+        periods: 季节周期列表，None表示自动检测
+        method: 分解方法 ('auto', 'classical', 'stl', 'mstl')
+        max_points: 直接分解的最大数据点数
+    
+    Returns:
+        分解结果字典，包含 trend、seasonal、resid 序列、实际使用的周期（periods）、
+        被舍弃的周期（dropped_periods）、分解覆盖的点数（window）和方法
+    """
+    from statsmodels.tsa.seasonal import seasonal_decompose, STL, MSTL
+    
+    series = data.dropna()
+    n = len(series)
+    
+    if periods is None:
+        detected = detect_seasonal_periods(series)
+        periods = [detected[0]['period']] if detected else [min(12, n // 2)]
+    periods = sorted({int(p) for p in periods if p >= 2})
+    if not periods:
+        raise ValueError("季节周期必须大于等于2")
+    
+    factor = _downsample_factor(periods, int(np.ceil(n / max_points)) if n > max_points else 1)
+    working_length = int(np.ceil(n / factor))
+    working_periods = [p // factor for p in periods
+                       if p % factor == 0 and p // factor >= 2 and 2 * (p // factor) <= working_length]
+    if factor > 1:
+        # 短于两个块的周期（如长序列上的日内周期）改在末尾窗口上按原始分辨率分解；
+        # 长周期在原始分辨率下分解代价过高，仍只在降采样后的序列上处理
+        window = min(n, max_points)
+        window_periods = [p for p in periods if p < 2 * factor and 2 * p <= window]
+        if len(window_periods) > len(working_periods):
+            series = series.iloc[n - window:]
+            n, factor, working_periods = window, 1, window_periods
+    if not working_periods:
+        raise ValueError("序列长度不足以按指定周期进行分解")
+    used_periods = [p * factor for p in working_periods]
+    
+    if method == 'auto':
+        if len(working_periods) > 1:
+            method = 'mstl'
+        elif factor > 1:
+            method = 'stl'
+        else:
+            method = 'classical'
+    
+    values = series.to_numpy(dtype=float)
+    working = _downsample(values, factor) if factor > 1 else values
+    
+    if method == 'classical':
+        result = seasonal_decompose(working, model='additive', period=working_periods[0])
+        trend, seasonal = result.trend, result.seasonal
+    elif method == 'stl':
+        result = STL(working, period=working_periods[0], robust=False).fit()
+        trend, seasonal = result.trend, result.seasonal
+    elif method == 'mstl':
+        result = MSTL(working, periods=working_periods).fit()
+        trend = result.trend
+        seasonal = np.asarray(result.seasonal)
+        if seasonal.ndim > 1:
+            seasonal = seasonal.sum(axis=1)
+    else:
+        raise ValueError(f"不支持的分解方法: {method}")
+    
+    trend = np.asarray(trend, dtype=float)
+    seasonal = np.asarray(seasonal, dtype=float)
+    
+    if factor > 1:
+        # 以每块的中心位置为插值节点还原到原始长度
+        centers = np.arange(len(working)) * factor + (factor - 1) / 2
+        centers[-1] = min(centers[-1], n - 1)
+        positions = np.arange(n)
+        trend = np.interp(positions, centers, trend)
+        seasonal = np.interp(positions, centers, seasonal)
+    
+    return {
+        'trend': pd.Series(trend, index=series.index, name='trend'),
+        'seasonal': pd.Series(seasonal, index=series.index, name='seasonal'),
+        'resid': pd.Series(values - trend - seasonal, index=series.index, name='resid'),
+        'periods': used_periods,
+        'dropped_periods': [p for p in periods if p not in used_periods],
+        'window': n,
+        'method': method,
+        'downsample_factor': factor
+    }
@@ -0,0 +1,376 @@
+"""
+会话产物存储模块
+记录每个会话中各产物（差分序列、导出文件、报告等）占用的内存，
+按会话预算和全局预算以LRU顺序淘汰：可重新计算的产物直接丢弃，
+其余可落盘的产物写入临时文件，访问时再重新计算或从磁盘加载
+"""
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 默认每个会话的内存预算（字节）
+DEFAULT_SESSION_BUDGET = 256 * 1024 * 1024
+# 默认所有会话合计的内存预算（字节）
+DEFAULT_GLOBAL_BUDGET = 2 * 1024 * 1024 * 1024
+
+
+def estimate_size(obj: Any, _depth: int = 0) -> int:
+    """
+    估算对象占用的内存字节数
+    
+    pandas对象使用 memory_usage(deep=True)，NumPy数组使用 nbytes，
+    字典、列表和检验结果等容器递归累加各元素，其余对象使用 sys.getsizeof
+    
+    Args:
+        obj: 任意对象
+    
+    Returns:
+        估算的字节数
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (str, bytes, bytearray)):
+        return sys.getsizeof(obj)
+    if _depth >= 4:
+        return sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        return sys.getsizeof(obj) + sum(estimate_size(value, _depth + 1) for value in obj.values())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_size(item, _depth + 1) for item in obj)
+    if hasattr(obj, 'to_plotly_json'):
+        # Plotly图表：累加各轨迹中的数组
+        return sys.getsizeof(obj) + sum(
+            estimate_size(value, _depth + 1)
+            for trace in obj.data for value in trace.to_plotly_json().values()
+        )
+    return sys.getsizeof(obj)
+
+
+class _Artifact:
+    """单个产物的存储状态"""
+    
+    __slots__ = ('value', 'size', 'recompute', 'spillable', 'path', 'loaded')
+    
+    def __init__(self, value: Any, size: int, recompute: Optional[Callable[[], Any]], spillable: bool):
+        self.value = value
+        self.size = size
+        self.recompute = recompute
+        self.spillable = spillable
+        # 落盘文件路径；值未被替换前文件保持有效，再次淘汰时无需重写
+        self.path: Optional[str] = None
+        self.loaded = True
+    
+    @property
+    def evictable(self) -> bool:
+        return self.recompute is not None or self.spillable
+
+
+class ArtifactRegistry:
+    """
+    全局产物登记表
+    
+    记录所有会话存储中驻留内存的产物及其大小，合计超过全局预算时
+    按全局LRU顺序通知对应的会话存储淘汰产物。
+    """
+    
+    def __init__(self, global_budget: Optional[int] = DEFAULT_GLOBAL_BUDGET):
+        """
+        初始化登记表
+        
+        Args:
+            global_budget: 全局内存预算（字节），None 表示不限制
+        """
+        self.global_budget = global_budget
+        self.total_bytes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[int, bool]]" = OrderedDict()
+        self._stores: Dict[int, "weakref.ref[ArtifactStore]"] = {}
+    
+    def register_store(self, store: 'ArtifactStore') -> None:
+        """登记会话存储，存储被回收时自动注销其全部产物"""
+        with self._lock:
+            self._stores[id(store)] = weakref.ref(store)
+        weakref.finalize(store, self._unregister_store, id(store))
+    
+    def _unregister_store(self, store_id: int) -> None:
+        with self._lock:
+            self._stores.pop(store_id, None)
+            for key in [key for key in self._entries if key[0] == store_id]:
+                self.total_bytes -= self._entries.pop(key)[0]
+    
+    def touch(self, store: 'ArtifactStore', name: str, size: int, evictable: bool) -> None:
+        """记录产物驻留内存（或被访问），并移到LRU末尾"""
+        key = (id(store), name)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[0]
+            self._entries[key] = (size, evictable)
+            self.total_bytes += size
+    
+    def remove(self, store: 'ArtifactStore', name: str) -> None:
+        """记录产物已离开内存"""
+        with self._lock:
+            previous = self._entries.pop((id(store), name), None)
+            if previous is not None:
+                self.total_bytes -= previous[0]
+    
+    def enforce(self) -> None:
+        """超出全局预算时按LRU顺序淘汰可淘汰的产物"""
+        if self.global_budget is None:
+            return
+        while True:
+            # 仅在登记表锁内挑选候选，淘汰时再获取会话存储的锁，避免锁顺序相反导致死锁
+            with self._lock:
+                if self.total_bytes <= self.global_budget:
+                    return
+                candidates = [
+                    (self._stores.get(store_id), name)
+                    for (store_id, name), (_, evictable) in self._entries.items() if evictable
+                ]
+            evicted = False
+            for ref, name in candidates:
+                store = ref() if ref is not None else None
+                if store is not None and store.evict(name):
+                    self.evictions += 1
+                    evicted = True
+                    break
+            if not evicted:
+                return
+
+
+class ArtifactStore:
+    """
+    会话产物存储
+    
+    put() 时可以提供重新计算函数或允许落盘：超出预算时，有重新计算函数的产物
+    直接丢弃，允许落盘的产物写入临时文件；两者都没有的产物始终驻留内存，
+    但计入预算。get() 时透明地重新计算或加载。
+    """
+    
+    def __init__(self, session_budget: Optional[int] = DEFAULT_SESSION_BUDGET,
+                 registry: Optional[ArtifactRegistry] = None,
+                 spill_dir: Optional[str] = None):
+        """
+        初始化存储
+        
+        Args:
+            session_budget: 会话内存预算（字节），None 表示不限制
+            registry: 全局登记表，提供时同时受全局预算约束
+            spill_dir: 落盘目录的父目录，默认为系统临时目录
+        """
+        self.session_budget = session_budget
+        self.registry = registry
+        self._spill_parent = spill_dir
+        self._spill_dir: Optional[str] = None
+        self._artifacts: "OrderedDict[str, _Artifact]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.memory_bytes = 0
+        self.stats_counts = {'hits': 0, 'reloads': 0, 'recomputes': 0, 'evictions': 0}
+        if registry is not None:
+            registry.register_store(self)
+    
+    def put(self, name: str, value: Any, recompute: Optional[Callable[[], Any]] = None,
+            spillable: bool = False) -> None:
+        """
+        存入产物
+        
+        Args:
+            name: 产物名称
+            value: 产物对象
+            recompute: 重新计算函数，被淘汰后访问时调用
+            spillable: 没有重新计算函数时，是否允许被淘汰时写入磁盘
+        """
+        size = estimate_size(value)
+        with self._lock:
+            self._drop(name)
+            artifact = _Artifact(value, size, recompute, spillable)
+            self._artifacts[name] = artifact
+            self.memory_bytes += size
+            if self.registry is not None:
+                self.registry.touch(self, name, size, artifact.evictable)
+            self._enforce_session_budget(keep=name)
+        if self.registry is not None:
+            self.registry.enforce()
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        读取产物，已被淘汰的产物会被重新计算或从磁盘加载
+        
+        Args:
+            name: 产物名称
+            default: 产物不存在时的返回值
+        
+        Returns:
+            产物对象
+        """
+        with self._lock:
+            artifact = self._artifacts.get(name)
+            if artifact is None:
+                return default
+            self._artifacts.move_to_end(name)
+            
+            was_loaded = artifact.loaded
+            if was_loaded:
+                self.stats_counts['hits'] += 1
+            elif artifact.path is not None:
+                with open(artifact.path, 'rb') as f:
+                    artifact.value = pickle.load(f)
+                artifact.loaded = True
+                self.stats_counts['reloads'] += 1
+            else:
+                artifact.value = artifact.recompute()
+                artifact.size = estimate_size(artifact.value)
+                artifact.loaded = True
+                self.stats_counts['recomputes'] += 1
+            
+            value = artifact.value
+            if self.registry is not None:
+                self.registry.touch(self, name, artifact.size, artifact.evictable)
+            if not was_loaded:
+                self.memory_bytes += artifact.size
+            self._enforce_session_budget(keep=name)
+        if self.registry is not None:
+            self.registry.enforce()
+        return value
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self._artifacts
+    
+    def discard(self, name: str) -> None:
+        """
+        删除产物
+        
+        Args:
+            name: 产物名称
+        """
+        with self._lock:
+            self._drop(name)
+    
+    def evict(self, name: str) -> bool:
+        """
+        将产物移出内存
+        
+        Args:
+            name: 产物名称
+        
+        Returns:
+            是否成功淘汰
+        """
+        with self._lock:
+            artifact = self._artifacts.get(name)
+            if artifact is None or not artifact.loaded or not artifact.evictable:
+                return False
+            
+            if artifact.recompute is None and artifact.path is None:
+                artifact.path = self._spill_path(name)
+                with open(artifact.path, 'wb') as f:
+                    pickle.dump(artifact.value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            artifact.value = None
+            artifact.loaded = False
+            self.memory_bytes -= artifact.size
+            self.stats_counts['evictions'] += 1
+            if self.registry is not None:
+                self.registry.remove(self, name)
+            return True
+    
+    def file_path(self, name: str, suffix: str = '') -> str:
+        """
+        获取由存储管理的文件路径
+        
+        用于直接写入磁盘的大型产物（如导出文件），文件位于落盘目录中，
+        随 clear() 或存储被回收时一起删除。同名路径会被覆盖。
+        
+        Args:
+            name: 文件名称
+            suffix: 文件扩展名，如 '.csv'
+        
+        Returns:
+            文件路径
+        """
+        with self._lock:
+            return self._spill_path(name, prefix='file_', suffix=suffix)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取存储统计
+        
+        Returns:
+            包含 memory_bytes、session_budget、计数和各产物状态的字典
+        """
+        with self._lock:
+            entries: List[Dict[str, Any]] = []
+            for name, artifact in self._artifacts.items():
+                if artifact.loaded:
+                    state = 'memory'
+                elif artifact.path is not None:
+                    state = 'disk'
+                else:
+                    state = 'dropped'
+                entries.append({
+                    'name': name,
+                    'size': artifact.size,
+                    'state': state,
+                    'policy': 'recompute' if artifact.recompute is not None
+                              else ('spill' if artifact.spillable else 'pinned')
+                })
+            return {
+                'memory_bytes': self.memory_bytes,
+                'session_budget': self.session_budget,
+                **self.stats_counts,
+                'artifacts': entries
+            }
+    
+    def clear(self) -> None:
+        """删除全部产物及落盘文件"""
+        with self._lock:
+            for name in list(self._artifacts):
+                self._drop(name)
+            if self._spill_dir is not None:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+    
+    def _drop(self, name: str) -> None:
+        artifact = self._artifacts.pop(name, None)
+        if artifact is None:
+            return
+        if artifact.loaded:
+            self.memory_bytes -= artifact.size
+        if artifact.path is not None and os.path.exists(artifact.path):
+            os.remove(artifact.path)
+        if self.registry is not None:
+            self.registry.remove(self, name)
+    
+    def _enforce_session_budget(self, keep: str) -> None:
+        """超出会话预算时按LRU顺序淘汰，刚写入或访问的产物除外"""
+        if self.session_budget is None:
+            return
+        for name in list(self._artifacts):
+            if self.memory_bytes <= self.session_budget:
+                break
+            if name != keep:
+                self.evict(name)
+    
+    def _spill_path(self, name: str, prefix: str = '', suffix: str = '.pkl') -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='tssa_artifacts_', dir=self._spill_parent)
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        safe_name = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in name)
+        return os.path.join(self._spill_dir, f"{prefix}{safe_name}{suffix}")
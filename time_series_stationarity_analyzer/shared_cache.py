@@ -0,0 +1,228 @@
+"""
+跨会话共享缓存模块
+按内容哈希缓存解析后的数据、验证后的序列和综合检验结果，
+同一服务进程中相同的输入只处理一次
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .session_store import estimate_size
+
+# 默认缓存总大小上限（字节）
+DEFAULT_SHARED_CACHE_BYTES = 1024 * 1024 * 1024
+
+
+def freeze(value: Any) -> Any:
+    """
+    将值转换为只读形式后存入共享缓存
+    
+    字典转换为只读映射（递归处理其中的值），NumPy数组设为不可写；
+    pandas对象在读取时返回副本（启用写时复制时为浅拷贝），保证缓存中的对象不被修改
+    
+    Args:
+        value: 任意值
+    
+    Returns:
+        只读形式的值
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, tuple):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+    return value
+
+
+def _copy_on_write() -> bool:
+    """pandas 是否启用了写时复制（pandas 3 起始终启用，pandas 2 需显式开启）"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+
+def _share(value: Any) -> Any:
+    """
+    读取时为pandas对象创建副本，避免调用方的原地修改影响其他会话
+    
+    启用写时复制时浅拷贝即可（修改时才复制数据）；未启用时浅拷贝与缓存共用
+    数据缓冲区，必须深拷贝
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not _copy_on_write())
+    if isinstance(value, tuple):
+        return tuple(_share(item) for item in value)
+    if isinstance(value, MappingProxyType):
+        return MappingProxyType({key: _share(item) for key, item in value.items()})
+    return value
+
+
+class SharedCache:
+    """
+    进程级共享缓存
+    
+    条目按 (命名空间, 键) 存储，键通常为内容指纹。所有命名空间共用一个
+    字节上限，超出时按LRU顺序淘汰。相同键的并发请求只计算一次，其余
+    请求等待计算结果。各命名空间分别统计命中率。
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_SHARED_CACHE_BYTES):
+        """
+        初始化缓存
+        
+        Args:
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable], Future] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+    
+    def _count(self, namespace: str, field: str) -> None:
+        counts = self._stats.setdefault(namespace, {'hits': 0, 'misses': 0, 'evictions': 0})
+        counts[field] += 1
+    
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        """
+        读取缓存条目
+        
+        Args:
+            namespace: 命名空间
+            key: 键
+            default: 未命中时的返回值
+        
+        Returns:
+            缓存的值（只读），未命中时返回 default
+        """
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                self._count(namespace, 'misses')
+                return default
+            self._entries.move_to_end((namespace, key))
+            self._count(namespace, 'hits')
+        return _share(entry[0])
+    
+    def put(self, namespace: str, key: Hashable, value: Any) -> Any:
+        """
+        写入缓存条目
+        
+        Args:
+            namespace: 命名空间
+            key: 键
+            value: 值，存入前转换为只读形式
+        
+        Returns:
+            只读形式的值
+        """
+        frozen = freeze(value)
+        size = estimate_size(frozen)
+        with self._lock:
+            self._store(namespace, key, frozen, size)
+        return _share(frozen)
+    
+    def get_or_compute(self, namespace: str, key: Hashable, compute: Callable[[], Any],
+                       should_cache: Callable[[Any], bool] = lambda value: value is not None) -> Any:
+        """
+        读取缓存条目，未命中时计算并写入
+        
+        Args:
+            namespace: 命名空间
+            key: 键
+            compute: 计算函数
+            should_cache: 判断计算结果是否应写入缓存（默认不缓存None）
+        
+        Returns:
+            缓存或新计算的值（只读）
+        """
+        full_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                self._entries.move_to_end(full_key)
+                self._count(namespace, 'hits')
+                return _share(entry[0])
+            
+            future = self._inflight.get(full_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[full_key] = future
+                self._count(namespace, 'misses')
+            else:
+                # 其他会话正在计算相同的内容，等待其结果
+                self._count(namespace, 'hits')
+        
+        if not owner:
+            return _share(future.result())
+        
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(full_key, None)
+            future.set_exception(e)
+            raise
+        
+        frozen = freeze(value)
+        with self._lock:
+            self._inflight.pop(full_key, None)
+            if should_cache(value):
+                self._store(namespace, key, frozen, estimate_size(frozen))
+        future.set_result(frozen)
+        return _share(frozen)
+    
+    def _store(self, namespace: str, key: Hashable, frozen: Any, size: int) -> None:
+        """写入条目并按LRU淘汰（调用方持有锁）"""
+        full_key = (namespace, key)
+        previous = self._entries.pop(full_key, None)
+        if previous is not None:
+            self.total_bytes -= previous[1]
+        if size > self.max_bytes:
+            return
+        self._entries[full_key] = (frozen, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            (old_namespace, _), (_, old_size) = self._entries.popitem(last=False)
+            self.total_bytes -= old_size
+            self._count(old_namespace, 'evictions')
+    
+    def clear(self) -> None:
+        """清空缓存（统计信息保留）"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+        
+        Returns:
+            包含总大小、条目数以及各命名空间命中/未命中/淘汰次数和命中率的字典
+        """
+        with self._lock:
+            namespaces = {}
+            for namespace, counts in self._stats.items():
+                lookups = counts['hits'] + counts['misses']
+                namespaces[namespace] = {
+                    **counts,
+                    'hit_rate': counts['hits'] / lookups if lookups else None,
+                    'entries': sum(1 for ns, _ in self._entries if ns == namespace),
+                    'bytes': sum(size for (ns, _), (_, size) in self._entries.items() if ns == namespace)
+                }
+            return {
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'entries': len(self._entries),
+                'namespaces': namespaces
+            }
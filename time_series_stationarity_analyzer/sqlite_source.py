@@ -0,0 +1,374 @@
+"""
+SQLite数据源模块
+直接读取本地SQLite数据库中的时间序列：只查询元数据即可列出表和列，
+时间范围过滤和列投影下推到SQL中执行，结果按块 fetchmany 写入预分配的NumPy数组。
+同一数据源对象复用一个只读连接
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import weakref
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .utils import parse_datetime_column, infer_datetime_format, infer_epoch_unit
+
+# 每次 fetchmany 读取的行数
+DEFAULT_FETCH_SIZE = 50_000
+
+# 推断文本时间列格式时读取的样本行数
+_FORMAT_SAMPLE_ROWS = 200
+
+# 按字典序比较即按时间比较的格式：字段从年到秒依次出现且定宽
+_ORDERED_DIRECTIVES = ['%Y', '%m', '%d', '%H', '%M', '%S']
+
+
+def _quote(identifier: str) -> str:
+    """引用SQL标识符"""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def column_affinity(declared_type: str) -> str:
+    """
+    按SQLite的规则由声明类型确定列的类型亲和性
+    
+    Args:
+        declared_type: 建表时声明的类型
+    
+    Returns:
+        'INTEGER'、'TEXT'、'BLOB'、'REAL' 或 'NUMERIC'
+    """
+    declared = (declared_type or '').upper()
+    if 'INT' in declared:
+        return 'INTEGER'
+    if any(token in declared for token in ('CHAR', 'CLOB', 'TEXT')):
+        return 'TEXT'
+    if not declared or 'BLOB' in declared:
+        return 'BLOB'
+    if any(token in declared for token in ('REAL', 'FLOA', 'DOUB')):
+        return 'REAL'
+    return 'NUMERIC'
+
+
+def _is_numeric_affinity(affinity: str) -> bool:
+    return affinity in ('INTEGER', 'REAL', 'NUMERIC')
+
+
+def _is_ordered_format(fmt: Optional[str]) -> bool:
+    """格式化后的字符串是否按字典序与时间顺序一致"""
+    if not fmt:
+        return False
+    directives = re.findall(r'%.', fmt)
+    return 0 < len(directives) <= len(_ORDERED_DIRECTIVES) \
+        and directives == _ORDERED_DIRECTIVES[:len(directives)]
+
+
+class SQLiteSource:
+    """
+    SQLite数据源
+    
+    以只读模式打开数据库并在对象生命周期内复用连接；表结构信息按
+    schema_version 缓存，数据库结构变化后自动失效。连接允许跨线程使用
+    （Streamlit的多次运行可能位于不同线程），查询由锁串行化。
+    """
+    
+    def __init__(self, path: str, timeout: float = 5.0):
+        """
+        初始化数据源
+        
+        Args:
+            path: 数据库文件路径
+            timeout: 数据库被锁定时的等待时间（秒）
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"数据库文件不存在: {path}")
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self.queries = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._schema_version: Optional[int] = None
+        self._columns: Dict[str, List[Dict[str, Any]]] = {}
+        self._time_formats: Dict[Tuple[str, str], Optional[str]] = {}
+    
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """复用的只读连接（首次访问时打开）"""
+        if self._connection is None:
+            uri = 'file:' + self.path.replace('?', '%3f').replace('#', '%23') + '?mode=ro'
+            self._connection = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+            weakref.finalize(self, self._connection.close)
+        return self._connection
+    
+    def close(self) -> None:
+        """关闭连接，之后的查询会重新打开"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            self.queries += 1
+            return self.connection.execute(sql, params).fetchall()
+    
+    def _check_schema(self) -> None:
+        """数据库结构变化时清空元数据缓存"""
+        version = self._execute('PRAGMA schema_version')[0][0]
+        if version != self._schema_version:
+            self._schema_version = version
+            self._columns.clear()
+            self._time_formats.clear()
+    
+    def list_tables(self) -> List[str]:
+        """
+        列出数据库中的表和视图
+        
+        Returns:
+            表名列表
+        """
+        rows = self._execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )
+        return [row[0] for row in rows]
+    
+    def list_columns(self, table: str) -> List[Dict[str, Any]]:
+        """
+        列出表的列（只读取表结构，不读取数据）
+        
+        Args:
+            table: 表名
+        
+        Returns:
+            每列一个字典：name、type（声明类型）、affinity、notnull、pk
+        """
+        self._check_schema()
+        if table not in self._columns:
+            rows = self._execute(f"PRAGMA table_info({_quote(table)})")
+            if not rows:
+                raise ValueError(f"表 '{table}' 不存在")
+            self._columns[table] = [{
+                'name': name,
+                'type': declared,
+                'affinity': column_affinity(declared),
+                'notnull': bool(notnull),
+                'pk': bool(pk)
+            } for _, name, declared, notnull, _, pk in rows]
+        return self._columns[table]
+    
+    def _column_info(self, table: str, columns: List[str]) -> List[Dict[str, Any]]:
+        info = {column['name']: column for column in self.list_columns(table)}
+        missing = [col for col in columns if col not in info]
+        if missing:
+            raise ValueError(f"列 {missing} 不存在")
+        return [info[col] for col in columns]
+    
+    def time_range(self, table: str, time_col: str) -> Tuple[Any, Any]:
+        """
+        获取时间列的最小值和最大值（在数据库中计算，有索引时无需扫描全表）
+        
+        Args:
+            table: 表名
+            time_col: 时间列名
+        
+        Returns:
+            (最小值, 最大值)，为数据库中的原始值
+        """
+        self._column_info(table, [time_col])
+        return self._execute(f"SELECT MIN({_quote(time_col)}), MAX({_quote(time_col)}) FROM {_quote(table)}")[0]
+    
+    def _time_format(self, table: str, time_col: str) -> Optional[str]:
+        """由样本推断文本时间列的格式"""
+        key = (table, time_col)
+        if key not in self._time_formats:
+            rows = self._execute(
+                f"SELECT {_quote(time_col)} FROM {_quote(table)} "
+                f"WHERE {_quote(time_col)} IS NOT NULL LIMIT {_FORMAT_SAMPLE_ROWS}"
+            )
+            values = np.array([row[0] for row in rows if isinstance(row[0], str)], dtype=object)
+            self._time_formats[key] = infer_datetime_format(values) if len(values) else None
+        return self._time_formats[key]
+    
+    def _resolve_epoch_unit(self, table: str, time_col: str, epoch_unit: Optional[str]) -> Optional[str]:
+        if epoch_unit != 'auto':
+            return epoch_unit
+        magnitude = self._execute(f"SELECT MAX(ABS({_quote(time_col)})) FROM {_quote(table)}")[0][0]
+        return infer_epoch_unit(float(magnitude or 0))
+    
+    def _time_filter(self, table: str, time_info: Dict[str, Any], start: Any, end: Any,
+                     epoch_unit: Optional[str]) -> Tuple[List[str], List[Any]]:
+        """
+        将时间范围转换为SQL条件
+        
+        数值时间列在已知时间戳单位时按时间戳比较；文本时间列只在推断出的格式
+        按字典序有序（如 ISO 8601）时按格式化后的字符串比较。条件只做粗筛，
+        精确过滤在解析时间列之后进行，无法下推的条件留到那时处理
+        """
+        clauses, params = [], []
+        name = _quote(time_info['name'])
+        for bound, operator in ((start, '>='), (end, '<=')):
+            if bound is None:
+                continue
+            if isinstance(bound, (int, float, np.integer, np.floating)):
+                clauses.append(f"{name} {operator} ?")
+                params.append(bound.item() if isinstance(bound, np.generic) else bound)
+                continue
+            bound = pd.Timestamp(bound)
+            if _is_numeric_affinity(time_info['affinity']):
+                if epoch_unit is None:
+                    continue
+                if bound.tzinfo is not None:
+                    bound = bound.tz_convert('UTC').tz_localize(None)
+                # 按整数纳秒计算并绑定为整数，纳秒时间戳超出浮点数的精确范围
+                nanoseconds = (bound - pd.Timestamp(0)).value
+                unit_nanoseconds = pd.Timedelta(1, unit=epoch_unit).value
+                ticks = nanoseconds // unit_nanoseconds if operator == '>=' \
+                    else -(-nanoseconds // unit_nanoseconds)
+                clauses.append(f"{name} {operator} ?")
+                params.append(int(ticks))
+            else:
+                fmt = self._time_format(table, time_info['name'])
+                if _is_ordered_format(fmt):
+                    clauses.append(f"{name} {operator} ?")
+                    params.append(bound.strftime(fmt))
+        return clauses, params
+    
+    def count_rows(self, table: str, time_col: Optional[str] = None, start: Any = None, end: Any = None,
+                   epoch_unit: Optional[str] = None) -> int:
+        """
+        统计满足时间范围条件（仅下推到SQL的部分）的行数
+        
+        Args:
+            table: 表名
+            time_col: 时间列名
+            start: 开始时间（含）
+            end: 结束时间（含）
+            epoch_unit: 数值时间列的时间戳单位
+        
+        Returns:
+            行数
+        """
+        clauses, params = [], []
+        if time_col is not None:
+            info = self._column_info(table, [time_col])[0]
+            epoch_unit = self._resolve_epoch_unit(table, time_col, epoch_unit) \
+                if _is_numeric_affinity(info['affinity']) else epoch_unit
+            clauses, params = self._time_filter(table, info, start, end, epoch_unit)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return self._execute(f"SELECT COUNT(*) FROM {_quote(table)}{where}", tuple(params))[0][0]
+    
+    def read(self, table: str, columns: List[str], time_col: Optional[str] = None,
+             start: Any = None, end: Any = None, epoch_unit: Optional[str] = None,
+             chunk_size: int = DEFAULT_FETCH_SIZE) -> pd.DataFrame:
+        """
+        读取表中的指定列
+        
+        只查询 columns 中的列；时间范围条件下推到SQL。先按相同条件统计行数并
+        预分配结构化数组，再用 fetchmany 按块写入，不生成完整的行列表。
+        整数亲和性的列在只存有整数时为 int64（含NULL时读取后转换为可空的 Int64，
+        保持整数时间戳的精度），其他数值亲和性的列为 float64，其余为 object。
+        指定 time_col 时时间列被解析为 datetime64 并按 [start, end] 精确过滤
+        
+        Args:
+            table: 表名
+            columns: 需要读取的列
+            time_col: 时间列名，需包含在 columns 中
+            start: 开始时间（含），为数值时直接与时间列比较
+            end: 结束时间（含），为数值时直接与时间列比较
+            epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
+            chunk_size: 每次 fetchmany 读取的行数
+        
+        Returns:
+            数据框
+        """
+        columns = list(dict.fromkeys(columns))
+        if time_col is not None and time_col not in columns:
+            raise ValueError(f"时间列 '{time_col}' 需要包含在读取的列中")
+        infos = self._column_info(table, columns)
+        
+        clauses, params = [], []
+        if time_col is not None:
+            time_info = infos[columns.index(time_col)]
+            if _is_numeric_affinity(time_info['affinity']):
+                epoch_unit = self._resolve_epoch_unit(table, time_col, epoch_unit)
+            clauses, params = self._time_filter(table, time_info, start, end, epoch_unit)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        
+        # 统计行数的同时检查整数亲和性的列中是否存有非整数值和NULL
+        integer_columns = [col for col, info in zip(columns, infos) if info['affinity'] == 'INTEGER']
+        checks = ''.join(
+            f", SUM(typeof({_quote(col)}) NOT IN ('integer', 'null')), SUM({_quote(col)} IS NULL)"
+            for col in integer_columns
+        )
+        
+        with self._lock:
+            self.queries += 2
+            cursor = self.connection.execute(f"SELECT COUNT(*){checks} FROM {_quote(table)}{where}",
+                                             tuple(params))
+            capacity, *counts = cursor.fetchone()
+            # 只存有整数的列：无NULL时为 int64，有NULL时先按对象存储
+            integer_kinds = {
+                col: (np.int64 if not nulls else object)
+                for col, non_integers, nulls in zip(integer_columns, counts[::2], counts[1::2])
+                if not non_integers
+            }
+            # 每行对应结构化数组的一条记录，整块行元组在一次赋值中完成转置
+            dtype = np.dtype([
+                (f"f{index}", integer_kinds.get(col, float if _is_numeric_affinity(info['affinity']) else object))
+                for index, (col, info) in enumerate(zip(columns, infos))
+            ])
+            records = np.empty(capacity, dtype=dtype)
+            
+            select = ', '.join(_quote(col) for col in columns)
+            cursor = self.connection.execute(f"SELECT {select} FROM {_quote(table)}{where}", tuple(params))
+            position = 0
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                end_position = position + len(rows)
+                if end_position > capacity:
+                    # 统计行数后有新写入的行
+                    capacity = max(end_position, capacity * 2)
+                    records = np.resize(records, capacity)
+                try:
+                    records[position:end_position] = rows
+                except (ValueError, TypeError):
+                    # 数值亲和性的列中存有文本，全部列改为按对象存储
+                    records = records.astype([(name, object) for name in records.dtype.names])
+                    records[position:end_position] = rows
+                position = end_position
+            cursor.close()
+        
+        frame = pd.DataFrame({
+            col: np.ascontiguousarray(records[name][:position])
+            for col, name in zip(columns, records.dtype.names)
+        }, copy=False)
+        for col in integer_kinds:
+            if frame[col].dtype == object:
+                try:
+                    frame[col] = pd.array(frame[col].to_numpy(), dtype='Int64')
+                except (TypeError, ValueError):
+                    # 统计后有新写入的非整数值
+                    pass
+        if time_col is None:
+            return frame
+        
+        times = parse_datetime_column(frame[time_col], epoch_unit=epoch_unit)
+        keep = np.ones(len(times), dtype=bool)
+        for bound, compare in ((start, np.greater_equal), (end, np.less_equal)):
+            if bound is None or isinstance(bound, (int, float, np.integer, np.floating)):
+                continue
+            bound = pd.Timestamp(bound)
+            if times.tz is not None and bound.tzinfo is None:
+                bound = bound.tz_localize(times.tz)
+            elif times.tz is None and bound.tzinfo is not None:
+                bound = bound.tz_convert('UTC').tz_localize(None)
+            keep &= compare(times, bound)
+        frame[time_col] = times
+        return frame if keep.all() else frame[keep].reset_index(drop=True)
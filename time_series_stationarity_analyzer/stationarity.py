@@ -8,25 +8,38 @@ import numpy as np
 from statsmodels.tsa.stattools import adfuller, kpss, acf, pacf
 from statsmodels.stats.diagnostic import acorr_ljungbox
 from scipy import stats
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, Optional, Mapping, Union
+from contextlib import nullcontext
+from concurrent.futures import Executor, ThreadPoolExecutor
+import asyncio
+import functools
+from .instrumentation import Instrumentation
+from .results import ADFResult, KPSSResult, LjungBoxResult
 import warnings
 warnings.filterwarnings('ignore')
 
+# 综合检验包含的检验方法，名称同时作为综合结果中的键
+COMPREHENSIVE_TESTS = ('adf_test', 'kpss_test', 'ljung_box_test')
+
 
 class StationarityAnalyzer:
     """时间序列平稳性分析器"""
     
-    def __init__(self, data: pd.Series):
+    def __init__(self, data: pd.Series, instrumentation: Optional[Instrumentation] = None):
         """
         初始化分析器
         
         Args:
             data: 时间序列数据
+            instrumentation: 性能监测器，提供时各检验结果会附带 timings 字段
         """
         self.data = data.dropna()
         self.results = {}
+        self.instrumentation = instrumentation
+        # 差分结果缓存：阶数 -> 差分序列，高阶差分在低阶结果上增量计算
+        self._diff_cache = {0: self.data}
     
-    def adf_test(self, maxlag: int = None, regression: str = 'c') -> Dict[str, Any]:
+    def adf_test(self, maxlag: int = None, regression: str = 'c') -> Mapping[str, Any]:
         """
         增强迪基-富勒检验 (Augmented Dickey-Fuller Test)
         
@@ -35,34 +48,31 @@ class StationarityAnalyzer:
             regression: 回归类型 ('c', 'ct', 'ctt', 'nc')
         
         Returns:
-            检验结果字典
+            检验结果（ADFResult，可按原字典键访问；失败时为包含 error 的字典）
         """
-        try:
-            adf_result = adfuller(self.data, maxlag=maxlag, regression=regression)
-            
-            result = {
-                'test_name': 'ADF检验 (增强迪基-富勒检验)',
-                'test_statistic': adf_result[0],
-                'p_value': adf_result[1],
-                'critical_values': adf_result[4],
-                'used_lag': adf_result[2],
-                'n_obs': adf_result[3],
-                'is_stationary': adf_result[1] < 0.05,
-                'conclusion': '时间序列是平稳的' if adf_result[1] < 0.05 else '时间序列不是平稳的',
-                'interpretation': self._interpret_adf(adf_result)
-            }
+        with self._span('adf_test') as span:
+            try:
+                with self._span('prepare'):
+                    values = self.data.to_numpy(dtype=float)
+                
+                with self._span('fit'):
+                    adf_result = adfuller(values, maxlag=maxlag, regression=regression)
+                
+                with self._span('interpret'):
+                    result = ADFResult.from_statsmodels(adf_result)
+                
+                self.results['adf'] = result
             
-            self.results['adf'] = result
-            return result
-            
-        except Exception as e:
-            return {
-                'test_name': 'ADF检验',
-                'error': f'检验失败: {str(e)}',
-                'is_stationary': None
-            }
+            except Exception as e:
+                result = {
+                    'test_name': 'ADF检验',
+                    'error': f'检验失败: {str(e)}',
+                    'is_stationary': None
+                }
+        
+        return self._attach_timings(result, span)
     
-    def kpss_test(self, regression: str = 'c', nlags: str = 'auto') -> Dict[str, Any]:
+    def kpss_test(self, regression: str = 'c', nlags: str = 'auto') -> Mapping[str, Any]:
         """
         KPSS检验 (Kwiatkowski-Phillips-Schmidt-Shin Test)
         
@@ -71,33 +81,31 @@ class StationarityAnalyzer:
             nlags: 滞后阶数选择方法
         
         Returns:
-            检验结果字典
+            检验结果（KPSSResult，可按原字典键访问；失败时为包含 error 的字典）
         """
-        try:
-            kpss_result = kpss(self.data, regression=regression, nlags=nlags)
-            
-            result = {
-                'test_name': 'KPSS检验',
-                'test_statistic': kpss_result[0],
-                'p_value': kpss_result[1],
-                'critical_values': kpss_result[3],
-                'used_lag': kpss_result[2],
-                'is_stationary': kpss_result[1] > 0.05,
-                'conclusion': '时间序列是平稳的' if kpss_result[1] > 0.05 else '时间序列不是平稳的',
-                'interpretation': self._interpret_kpss(kpss_result)
-            }
-            
-            self.results['kpss'] = result
-            return result
+        with self._span('kpss_test') as span:
+            try:
+                with self._span('prepare'):
+                    values = self.data.to_numpy(dtype=float)
+                
+                with self._span('fit'):
+                    kpss_result = kpss(values, regression=regression, nlags=nlags)
+                
+                with self._span('interpret'):
+                    result = KPSSResult.from_statsmodels(kpss_result)
+                
+                self.results['kpss'] = result
             
-        except Exception as e:
-            return {
-                'test_name': 'KPSS检验',
-                'error': f'检验失败: {str(e)}',
-                'is_stationary': None
-            }
+            except Exception as e:
+                result = {
+                    'test_name': 'KPSS检验',
+                    'error': f'检验失败: {str(e)}',
+                    'is_stationary': None
+                }
+        
+        return self._attach_timings(result, span)
     
-    def ljung_box_test(self, lags: int = 10) -> Dict[str, Any]:
+    def ljung_box_test(self, lags: int = 10) -> Mapping[str, Any]:
         """
         Ljung-Box检验 (残差独立性检验)
         
@@ -105,48 +113,109 @@ class StationarityAnalyzer:
             lags: 滞后阶数
         
         Returns:
-            检验结果字典
+            检验结果（LjungBoxResult，可按原字典键访问；失败时为包含 error 的字典）
         """
-        try:
-            lb_result = acorr_ljungbox(self.data, lags=lags, return_df=True)
+        with self._span('ljung_box_test') as span:
+            try:
+                with self._span('prepare'):
+                    values = self.data.to_numpy(dtype=float)
+                
+                with self._span('fit'):
+                    lb_result = acorr_ljungbox(values, lags=lags, return_df=True)
+                
+                with self._span('interpret'):
+                    result = LjungBoxResult.from_statsmodels(lb_result, lags)
+                
+                self.results['ljung_box'] = result
             
-            # 取最后一个滞后期的结果
-            last_lag = lb_result.iloc[-1]
-            
-            result = {
-                'test_name': 'Ljung-Box检验',
-                'test_statistic': last_lag['lb_stat'],
-                'p_value': last_lag['lb_pvalue'],
-                'lags': lags,
-                'is_independent': last_lag['lb_pvalue'] > 0.05,
-                'conclusion': '残差是独立的' if last_lag['lb_pvalue'] > 0.05 else '残差存在自相关',
-                'full_results': lb_result
-            }
+            except Exception as e:
+                result = {
+                    'test_name': 'Ljung-Box检验',
+                    'error': f'检验失败: {str(e)}',
+                    'is_independent': None
+                }
+        
+        return self._attach_timings(result, span)
+    
+    def comprehensive_test(self, parallel: bool = False,
+                           executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        综合平稳性检验
+        
+        tracemalloc 是进程级的，并发检验的峰值内存无法区分，因此记录内存时
+        各检验总是依次执行，timings 的 execution 字段记录实际的执行方式
+        
+        Args:
+            parallel: 是否并发执行各项检验（各检验相互独立，主要耗时在会释放GIL的数值计算中）
+            executor: 并发执行使用的执行器，默认为每次调用新建的线程池
+        
+        Returns:
+            综合检验结果
+        """
+        parallel = parallel and not self.traces_memory
+        with self._span('comprehensive_test') as span:
+            # 执行各种检验
+            if parallel:
+                test_results = self._run_tests_concurrently(span, executor)
+            else:
+                test_results = {name: getattr(self, name)() for name in COMPREHENSIVE_TESTS}
             
-            self.results['ljung_box'] = result
-            return result
+            # 计算基本统计量
+            with self._span('basic_statistics'):
+                basic_stats = self._calculate_basic_stats()
             
-        except Exception as e:
-            return {
-                'test_name': 'Ljung-Box检验',
-                'error': f'检验失败: {str(e)}',
-                'is_independent': None
-            }
+            comprehensive_result = self._combine_results(test_results, basic_stats)
+        
+        self._attach_timings(comprehensive_result, span, execution='parallel' if parallel else 'serial')
+        self.results['comprehensive'] = comprehensive_result
+        return comprehensive_result
     
-    def comprehensive_test(self) -> Dict[str, Any]:
+    async def comprehensive_test_async(self, executor: Optional[Executor] = None) -> Dict[str, Any]:
         """
-        综合平稳性检验
+        异步综合平稳性检验
+        
+        在执行器中并发运行各项检验，等待期间不阻塞事件循环
+        
+        Args:
+            executor: 执行器，默认使用事件循环的默认线程池
         
         Returns:
             综合检验结果
         """
-        # 执行各种检验
-        adf_result = self.adf_test()
-        kpss_result = self.kpss_test()
-        ljung_result = self.ljung_box_test()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(self.comprehensive_test, parallel=True)
+        )
+    
+    def _run_tests_concurrently(self, parent_span, executor: Optional[Executor]) -> Dict[str, Any]:
+        """在线程池中并发执行各项检验，并把各检验的计时区间挂到 parent_span 之下"""
+        def run(name: str):
+            if self.instrumentation is None:
+                return getattr(self, name)()
+            with self.instrumentation.attach(parent_span):
+                return getattr(self, name)()
         
-        # 计算基本统计量
-        basic_stats = self._calculate_basic_stats()
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=len(COMPREHENSIVE_TESTS)) as pool:
+                futures = {name: pool.submit(run, name) for name in COMPREHENSIVE_TESTS}
+                return {name: future.result() for name, future in futures.items()}
+        
+        futures = {name: executor.submit(run, name) for name in COMPREHENSIVE_TESTS}
+        return {name: future.result() for name, future in futures.items()}
+    
+    def _combine_results(self, test_results: Dict[str, Any], basic_stats: Dict[str, float]) -> Dict[str, Any]:
+        """
+        汇总各项检验结果
+        
+        Args:
+            test_results: 检验名称 -> 检验结果
+            basic_stats: 基本统计量
+        
+        Returns:
+            综合检验结果
+        """
+        adf_result = test_results['adf_test']
+        kpss_result = test_results['kpss_test']
         
         # 综合判断
         stationarity_votes = []
@@ -160,76 +229,70 @@ class StationarityAnalyzer:
         else:
             overall_stationary = None
         
-        comprehensive_result = {
+        return {
             'overall_conclusion': self._get_overall_conclusion(adf_result, kpss_result),
             'is_stationary': overall_stationary,
             'adf_test': adf_result,
             'kpss_test': kpss_result,
-            'ljung_box_test': ljung_result,
+            'ljung_box_test': test_results['ljung_box_test'],
             'basic_statistics': basic_stats
         }
-        
-        self.results['comprehensive'] = comprehensive_result
-        return comprehensive_result
     
     def difference_series(self, order: int = 1) -> pd.Series:
         """
         对时间序列进行差分
         
+        已计算过的低阶差分会被缓存，高阶差分从最近的已缓存阶数开始增量计算
+        
         Args:
             order: 差分阶数
         
         Returns:
-            差分后的序列
+            差分后的序列（副本，修改它不会影响缓存）
         """
-        differenced = self.data.copy()
+        if order not in self._diff_cache:
+            start = max(k for k in self._diff_cache if k < order)
+            differenced = self._diff_cache[start]
+            for i in range(start + 1, order + 1):
+                differenced = _lag_difference(differenced, 1)
+                self._diff_cache[i] = differenced
+        return self._diff_cache[order].copy()
+    
+    def seasonal_difference(self, period: int, order: int = 1) -> pd.Series:
+        """
+        对时间序列进行季节差分
+        
+        Args:
+            period: 季节周期
+            order: 季节差分阶数
+        
+        Returns:
+            季节差分后的序列
+        """
+        differenced = self.data
         for i in range(order):
-            differenced = differenced.diff().dropna()
+            differenced = _lag_difference(differenced, period)
         return differenced
     
-    def _interpret_adf(self, adf_result: Tuple) -> str:
-        """解释ADF检验结果"""
-        # ADF检验结果包含：统计量, p值, 使用的滞后期, 观测值数量, 临界值, (可选)回归结果
-        stat = adf_result[0]
-        p_value = adf_result[1]
-        critical_values = adf_result[4]
-        
-        interpretation = f"检验统计量: {stat:.4f}\n"
-        interpretation += f"p值: {p_value:.4f}\n"
-        interpretation += "临界值:\n"
-        
-        for key, value in critical_values.items():
-            comparison = "通过" if stat < value else "未通过"
-            interpretation += f"  {key}: {value:.4f} ({comparison})\n"
-        
-        if p_value < 0.05:
-            interpretation += "\n结论: 拒绝原假设，序列是平稳的"
-        else:
-            interpretation += "\n结论: 无法拒绝原假设，序列可能存在单位根（非平稳）"
-        
-        return interpretation
+    @property
+    def traces_memory(self) -> bool:
+        """是否记录峰值内存"""
+        return self.instrumentation is not None and self.instrumentation.trace_memory
     
-    def _interpret_kpss(self, kpss_result: Tuple) -> str:
-        """解释KPSS检验结果"""
-        # KPSS检验结果包含：统计量, p值, 使用的滞后期, 临界值
-        stat = kpss_result[0]
-        p_value = kpss_result[1]
-        critical_values = kpss_result[3]
-        
-        interpretation = f"检验统计量: {stat:.4f}\n"
-        interpretation += f"p值: {p_value:.4f}\n"
-        interpretation += "临界值:\n"
-        
-        for key, value in critical_values.items():
-            comparison = "通过" if stat < value else "未通过"
-            interpretation += f"  {key}: {value:.4f} ({comparison})\n"
-        
-        if p_value > 0.05:
-            interpretation += "\n结论: 无法拒绝原假设，序列是平稳的"
-        else:
-            interpretation += "\n结论: 拒绝原假设，序列是非平稳的"
-        
-        return interpretation
+    def _span(self, name: str):
+        """创建性能监测区间，未启用监测时为空上下文"""
+        if self.instrumentation is None:
+            return nullcontext()
+        return self.instrumentation.span(name)
+    
+    def _attach_timings(self, result: Mapping[str, Any], span,
+                        execution: Optional[str] = None) -> Mapping[str, Any]:
+        """将区间的计时信息（以及各检验的执行方式）附加到结果的 timings 字段"""
+        if span is not None:
+            result['timings'] = span.to_dict()
+            if execution is not None:
+                result['timings']['execution'] = execution
+        return result
     
     def _calculate_basic_stats(self) -> Dict[str, float]:
         """计算基本统计量"""
@@ -262,7 +325,7 @@ class StationarityAnalyzer:
             return "两种检验均表明序列是非平稳的"
         else:
             return "检验结果不一致，建议进一步分析"
-    
+
 
 
 def calculate_acf_pacf(data: pd.Series, lags: int = 40) -> Tuple[np.ndarray, np.ndarray]:
@@ -283,3 +346,108 @@ def calculate_acf_pacf(data: pd.Series, lags: int = 40) -> Tuple[np.ndarray, np.
     except Exception as e:
         print(f"计算ACF/PACF时出错: {e}")
         return np.array([]), np.array([])
+
+
+def _lag_difference(data: pd.Series, lag: int) -> pd.Series:
+    """按给定滞后对序列做一次差分，直接在底层数组上计算"""
+    values = data.to_numpy(dtype=float)
+    return pd.Series(values[lag:] - values[:-lag], index=data.index[lag:], name=data.name)
+
+
+def _summarize_order(order: int, seasonal_order: int, result: Dict[str, Any]) -> Dict[str, Any]:
+    """提取某一差分阶数下的关键检验指标"""
+    return {
+        'order': order,
+        'seasonal_order': seasonal_order,
+        'n_obs': result.get('basic_statistics', {}).get('count'),
+        'is_stationary': result.get('is_stationary'),
+        'overall_conclusion': result.get('overall_conclusion'),
+        'adf_p_value': result.get('adf_test', {}).get('p_value'),
+        'kpss_p_value': result.get('kpss_test', {}).get('p_value'),
+        'result': result
+    }
+
+
+def find_difference_order(data: pd.Series, max_order: int = 2,
+                          seasonal_period: Optional[int] = None,
+                          max_seasonal_order: int = 1,
+                          initial_result: Optional[Dict[str, Any]] = None,
+                          return_series: bool = True) -> Dict[str, Any]:
+    """
+    自动搜索使序列平稳的差分阶数（类似 ndiffs）
+    
+    若指定季节周期，先逐阶进行季节差分，再在其基础上逐阶进行普通差分。
+    每一阶都由上一阶的数组增量得到，综合结论首次判定为平稳时立即停止。
+    
+    Args:
+        data: 时间序列数据
+        max_order: 最大普通差分阶数
+        seasonal_period: 季节周期，None表示不进行季节差分
+        max_seasonal_order: 最大季节差分阶数
+        initial_result: 原始序列已有的综合检验结果，提供时可跳过第0阶的检验
+        return_series: 是否在结果中返回最终的差分序列
+    
+    Returns:
+        搜索结果字典，order_results 中包含每一阶的检验结果
+    """
+    current = data.dropna()
+    order, seasonal_order = 0, 0
+    
+    if initial_result is None:
+        initial_result = StationarityAnalyzer(current).comprehensive_test()
+    order_results = [_summarize_order(order, seasonal_order, initial_result)]
+    
+    # 依次尝试的差分步骤：(滞后, 是否为季节差分)
+    steps = []
+    if seasonal_period and seasonal_period > 1:
+        steps += [(seasonal_period, True)] * max_seasonal_order
+    steps += [(1, False)] * max_order
+    
+    for lag, is_seasonal in steps:
+        if order_results[-1]['is_stationary']:
+            break
+        if len(current) - lag < 10:
+            break
+        
+        current = _lag_difference(current, lag)
+        if is_seasonal:
+            seasonal_order += 1
+        else:
+            order += 1
+        
+        result = StationarityAnalyzer(current).comprehensive_test()
+        order_results.append(_summarize_order(order, seasonal_order, result))
+    
+    final = order_results[-1]
+    return {
+        'order': final['order'],
+        'seasonal_order': final['seasonal_order'],
+        'seasonal_period': seasonal_period,
+        'is_stationary': final['is_stationary'],
+        'result': final['result'],
+        'differenced': current if return_series else None,
+        'order_results': order_results
+    }
+
+
+def batch_find_difference_order(series_collection: Union[pd.DataFrame, Mapping[str, pd.Series]],
+                                **kwargs) -> Dict[str, Dict[str, Any]]:
+    """
+    批量搜索多个序列的差分阶数
+    
+    Args:
+        series_collection: DataFrame（每列为一个序列）或 名称->序列 的映射
+        **kwargs: 传递给 find_difference_order 的参数
+    
+    Returns:
+        序列名称 -> 搜索结果 的字典
+    """
+    kwargs.setdefault('return_series', False)
+    
+    results = {}
+    for name, series in series_collection.items():
+        try:
+            results[name] = find_difference_order(series, **kwargs)
+        except Exception as e:
+            results[name] = {'error': f'差分阶数搜索失败: {str(e)}', 'is_stationary': None}
+    return results
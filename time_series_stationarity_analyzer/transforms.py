@@ -0,0 +1,279 @@
+"""
+序列变换模块
+提供可组合、惰性求值并缓存中间结果的变换流水线
+"""
+
+import threading
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from itertools import groupby
+from scipy import stats
+from typing import Dict, Any, Optional, Tuple, List, Callable, Hashable
+
+from .stationarity import StationarityAnalyzer, _lag_difference
+from .fractional import frac_diff_ffd
+from .session_store import estimate_size
+from .utils import series_fingerprint
+
+
+def _log_transform(data: pd.Series) -> pd.Series:
+    """对数变换"""
+    if (data <= 0).any():
+        raise ValueError("对数变换要求序列全部为正数")
+    return np.log(data)
+
+
+def _box_cox_transform(data: pd.Series, lmbda: Optional[float] = None) -> pd.Series:
+    """Box-Cox变换，lmbda为None时按极大似然估计"""
+    if (data <= 0).any():
+        raise ValueError("Box-Cox变换要求序列全部为正数")
+    if lmbda is None:
+        transformed, _ = stats.boxcox(data.to_numpy(dtype=float))
+    else:
+        transformed = stats.boxcox(data.to_numpy(dtype=float), lmbda=lmbda)
+    return pd.Series(transformed, index=data.index, name=data.name)
+
+
+def _detrend_transform(data: pd.Series, order: int = 1) -> pd.Series:
+    """减去多项式趋势"""
+    x = np.arange(len(data))
+    values = data.to_numpy(dtype=float)
+    trend = np.polyval(np.polyfit(x, values, order), x)
+    return pd.Series(values - trend, index=data.index, name=data.name)
+
+
+def _frac_difference_transform(data: pd.Series, d: float, threshold: float = 1e-4) -> pd.Series:
+    """固定窗口分数阶差分"""
+    return frac_diff_ffd(data, d, threshold)
+
+
+# 变换名称 -> (实现函数, 显示名称)
+_STEP_REGISTRY: Dict[str, Tuple[Callable[..., pd.Series], str]] = {
+    'log': (_log_transform, '对数变换'),
+    'box_cox': (_box_cox_transform, 'Box-Cox变换'),
+    'detrend': (_detrend_transform, '去趋势'),
+    'difference': (_lag_difference, '差分'),
+    'seasonal_difference': (_lag_difference, '季节差分'),
+    'frac_difference': (_frac_difference_transform, '分数阶差分'),
+}
+
+
+class TransformCache:
+    """
+    按 (输入指纹, 变换参数) 缓存中间结果的LRU缓存
+    
+    同时按条目数和字节数限制容量；所有读写在锁内完成，可以在多个线程间共享
+    """
+    
+    def __init__(self, max_entries: int = 64, max_bytes: Optional[int] = 64 * 1024 * 1024):
+        """
+        初始化缓存
+        
+        Args:
+            max_entries: 最多保留的中间结果数量
+            max_bytes: 中间结果的总字节数上限，None 表示不限制
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[pd.Series, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        # 从缓存复用的步骤数 / 实际计算的步骤数
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[pd.Series]:
+        """读取缓存，命中时将其移动到最近使用的位置，未命中返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def put(self, key: Hashable, value: pd.Series) -> None:
+        """写入缓存，超过容量时淘汰最久未使用的结果；单个结果超过字节上限时不缓存"""
+        size = estimate_size(value)
+        with self._lock:
+            self._discard(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or \
+                    (self.max_bytes is not None and self.total_bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted
+    
+    def discard(self, key: Hashable) -> None:
+        """移除一个结果（不存在时忽略）"""
+        with self._lock:
+            self._discard(key)
+    
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+    
+    def record(self, hits: int, misses: int) -> None:
+        """累计命中和计算的步骤数"""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class TransformPipeline:
+    """
+    可组合的序列变换流水线
+    
+    添加变换只记录步骤并返回新的流水线，不会立即计算；在调用 evaluate()
+    或进行检验时才按步骤求值。每个中间结果以 (输入指纹, 变换参数) 为键缓存，
+    共享前缀的不同流水线（如 log → diff 与 log → detrend）会复用已计算的步骤。
+    """
+    
+    def __init__(self, data: pd.Series, steps: Tuple[Tuple[str, Tuple], ...] = (),
+                 cache: Optional[TransformCache] = None,
+                 fingerprint: Optional[str] = None):
+        """
+        初始化流水线
+        
+        Args:
+            data: 原始时间序列数据
+            steps: 变换步骤，每一步为 (变换名称, 排序后的参数元组)
+            cache: 中间结果缓存，默认为该流水线及其派生流水线新建的缓存
+            fingerprint: 原始数据指纹，未提供时在首次求值时计算
+        """
+        self.data = data
+        self.steps = steps
+        self.cache = cache if cache is not None else TransformCache()
+        self._fingerprint = fingerprint
+    
+    @property
+    def fingerprint(self) -> str:
+        """原始数据指纹"""
+        if self._fingerprint is None:
+            self._fingerprint = series_fingerprint(self.data)
+        return self._fingerprint
+    
+    def _add(self, name: str, **params) -> 'TransformPipeline':
+        """追加一个变换步骤，返回新的流水线"""
+        step = (name, tuple(sorted(params.items())))
+        return TransformPipeline(self.data, self.steps + (step,), self.cache, self._fingerprint)
+    
+    def log(self) -> 'TransformPipeline':
+        """对数变换"""
+        return self._add('log')
+    
+    def box_cox(self, lmbda: Optional[float] = None) -> 'TransformPipeline':
+        """Box-Cox变换"""
+        return self._add('box_cox', lmbda=lmbda)
+    
+    def detrend(self, order: int = 1) -> 'TransformPipeline':
+        """去除多项式趋势"""
+        return self._add('detrend', order=order)
+    
+    def difference(self, order: int = 1) -> 'TransformPipeline':
+        """普通差分，每一阶作为单独步骤缓存"""
+        pipeline = self
+        for i in range(order):
+            pipeline = pipeline._add('difference', lag=1)
+        return pipeline
+    
+    def seasonal_difference(self, period: int) -> 'TransformPipeline':
+        """季节差分"""
+        return self._add('seasonal_difference', lag=period)
+    
+    def frac_difference(self, d: float, threshold: float = 1e-4) -> 'TransformPipeline':
+        """固定窗口分数阶差分"""
+        return self._add('frac_difference', d=d, threshold=threshold)
+    
+    def evaluate(self, cache_result: bool = True) -> pd.Series:
+        """
+        求值流水线
+        
+        从最长的已缓存前缀开始，只计算尚未缓存的步骤
+        
+        Args:
+            cache_result: 是否在缓存中保留最终结果；结果由调用方另行管理
+                          （如放入会话产物存储）时设为False，缓存只保留中间步骤
+        
+        Returns:
+            变换后的序列
+        """
+        keys = []
+        key: Hashable = self.fingerprint
+        for step in self.steps:
+            key = (key, step)
+            keys.append(key)
+        
+        # 找到最长的已缓存前缀，没有可复用的前缀时才从原始数据开始
+        current = None
+        start = 0
+        for i in range(len(keys) - 1, -1, -1):
+            current = self.cache.get(keys[i])
+            if current is not None:
+                start = i + 1
+                break
+        if current is None:
+            current = self.data.dropna()
+        
+        for i in range(start, len(self.steps)):
+            name, params = self.steps[i]
+            func = _STEP_REGISTRY[name][0]
+            current = func(current, **dict(params)).dropna()
+            self.cache.put(keys[i], current)
+        
+        if keys and not cache_result:
+            self.cache.discard(keys[-1])
+        self.cache.record(start, len(self.steps) - start)
+        return current
+    
+    def analyze(self) -> Dict[str, Any]:
+        """
+        对变换后的序列进行综合平稳性检验
+        
+        Returns:
+            综合检验结果
+        """
+        return StationarityAnalyzer(self.evaluate()).comprehensive_test()
+    
+    def describe(self) -> str:
+        """
+        获取流水线的文字描述
+        
+        Returns:
+            形如 "对数变换 → 2阶差分" 的描述
+        """
+        if not self.steps:
+            return "原始序列"
+        
+        labels: List[str] = []
+        for (name, params), group in groupby(self.steps):
+            count = len(list(group))
+            label = _STEP_REGISTRY[name][1]
+            params = dict(params)
+            if name == 'seasonal_difference':
+                label = f"{label}(周期={params['lag']})"
+            elif name == 'frac_difference':
+                label = f"{label}(d={params['d']})"
+            labels.append(f"{count}阶{label}" if count > 1 else label)
+        
+        return " → ".join(labels)
+    
+    def __repr__(self) -> str:
+        return f"TransformPipeline({self.describe()})"
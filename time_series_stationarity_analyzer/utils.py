@@ -5,10 +5,15 @@
 
 import pandas as pd
 import numpy as np
-import io
-from typing import Dict, Any, Optional, Tuple
+import hashlib
+import warnings
+from typing import Dict, Any, Optional, Tuple, Iterator
 from datetime import datetime
 import streamlit as st
+from pandas.tseries.api import guess_datetime_format
+
+from .excel_source import EXCEL_EXTENSIONS, read_excel_columns
+from .frequency import analyze_frequency
 
 def load_data_from_file(uploaded_file) -> Optional[pd.DataFrame]:
     """
@@ -41,21 +46,306 @@ def load_data_from_file(uploaded_file) -> Optional[pd.DataFrame]:
             # 如果所有编码都失败，使用默认编码并报错
             st.error("无法读取CSV文件，请检查文件编码")
             return None
-            
-        elif file_extension in ['xlsx', 'xls']:
-            df = pd.read_excel(uploaded_file)
+        
+        elif file_extension in EXCEL_EXTENSIONS:
+            # 只读流式读取第一个工作表，并缓存为列式文件
+            df = read_excel_columns(uploaded_file.getvalue(), extension=file_extension)
             return df
         else:
             st.error(f"不支持的文件格式: {file_extension}")
             return None
-            
+    
     except Exception as e:
         st.error(f"文件读取失败: {str(e)}")
         return None
 
+# 无法从样本猜出格式时依次尝试的常见日期格式
+COMMON_DATETIME_FORMATS = (
+    '%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%m/%d/%Y', '%d.%m.%Y', '%d-%m-%Y',
+    '%Y%m%d', '%Y年%m月%d日', '%Y年%m月'
+)
+COMMON_TIME_SUFFIXES = ('', ' %H:%M:%S', ' %H:%M', 'T%H:%M:%S')
+
+# 推断格式时使用的样本大小
+DATETIME_SAMPLE_SIZE = 200
+
+# 定宽数字格式中各字段的宽度
+_FIXED_WIDTH_FIELDS = {'%Y': 4, '%m': 2, '%d': 2, '%H': 2, '%M': 2, '%S': 2}
+
+# 整数时间戳的单位按数值大小推断：(上限, 单位)
+_EPOCH_UNIT_LIMITS = ((1e11, 's'), (1e14, 'ms'), (1e17, 'us'))
+
+def infer_epoch_unit(magnitude: float) -> str:
+    """
+    按整数时间戳的最大绝对值推断其单位
+    
+    Args:
+        magnitude: 时间戳绝对值的最大值
+    
+    Returns:
+        时间戳单位（'s'、'ms'、'us'、'ns'）
+    """
+    return next((unit for limit, unit in _EPOCH_UNIT_LIMITS if magnitude < limit), 'ns')
+
+def _datetime_sample(values: np.ndarray, size: int = DATETIME_SAMPLE_SIZE) -> np.ndarray:
+    """取开头和均匀间隔的元素作为格式推断样本"""
+    if len(values) <= size:
+        return values
+    head = values[:size // 2]
+    spread = values[np.linspace(0, len(values) - 1, size - len(head)).astype(np.intp)]
+    return np.concatenate([head, spread])
+
+def _has_repeats(values: np.ndarray, sample_size: int = 1000) -> bool:
+    """
+    粗略判断数组中是否有较多重复值，决定是否值得先去重再解析
+    
+    相邻元素比较可发现按时间排列的重复日期，随机样本可发现无序的重复
+    """
+    if len(values) < 2:
+        return False
+    if np.count_nonzero(values[1:] == values[:-1]) > len(values) // 10:
+        return True
+    sample = values[np.random.default_rng(0).integers(0, len(values), min(sample_size, len(values)))]
+    return len(set(sample)) < 0.95 * len(sample)
+
+def infer_datetime_format(values: np.ndarray) -> Optional[str]:
+    """
+    从样本推断日期字符串的格式
+    
+    先按第一个元素猜测格式（月在前和日在前各一次），再尝试常见格式，
+    返回第一个能解析全部样本的格式。样本中出现 13/01/2020 之类的值时，
+    可以据此区分日在前和月在前的写法
+    
+    Args:
+        values: 日期字符串数组（不含缺失值）
+    
+    Returns:
+        strftime格式字符串，无法推断时返回None
+    """
+    if len(values) == 0:
+        return None
+    sample = pd.Index(_datetime_sample(values))
+    first = str(values[0])
+    
+    candidates = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for dayfirst in (False, True):
+            guessed = guess_datetime_format(first, dayfirst=dayfirst)
+            if guessed is not None and guessed not in candidates:
+                candidates.append(guessed)
+    candidates += [date + time for date in COMMON_DATETIME_FORMATS for time in COMMON_TIME_SUFFIXES
+                   if date + time not in candidates]
+    
+    for fmt in candidates:
+        try:
+            parsed = pd.to_datetime(sample, format=fmt, errors='coerce')
+        except (ValueError, TypeError):
+            continue
+        if not parsed.isna().any():
+            return fmt
+    return None
+
+def _parse_fixed_width(values: np.ndarray, fmt: str) -> Optional[np.ndarray]:
+    """
+    向量化解析定宽数字格式（如 %d/%m/%Y %H:%M）的日期字符串
+    
+    将字符串视为字节矩阵，按列位置直接提取各字段的数字并计算时间戳，
+    不逐个调用 strptime。格式含其他指令、字符串不等宽或字段越界时返回None
+    
+    Args:
+        values: 日期字符串数组
+        fmt: 日期格式
+    
+    Returns:
+        datetime64[us] 数组或None
+    """
+    # 将格式拆分为字段位置和分隔字符
+    fields: Dict[str, Tuple[int, int]] = {}
+    literals = []
+    position, i = 0, 0
+    while i < len(fmt):
+        if fmt[i] == '%':
+            directive = fmt[i:i + 2]
+            width = _FIXED_WIDTH_FIELDS.get(directive)
+            if width is None or directive in fields:
+                return None
+            fields[directive] = (position, position + width)
+            position += width
+            i += 2
+        else:
+            if not fmt[i].isascii():
+                return None
+            literals.append((position, ord(fmt[i])))
+            position += 1
+            i += 1
+    if not {'%Y', '%m', '%d'} <= fields.keys():
+        return None
+    
+    try:
+        encoded = values.astype('S')
+    except (UnicodeEncodeError, ValueError, TypeError):
+        return None
+    # 较短的字符串以空字节补齐，会在下面的分隔符或数字检查中被排除
+    if len(encoded) == 0 or encoded.dtype.itemsize != position:
+        return None
+    
+    matrix = encoded.view(np.uint8).reshape(len(encoded), position)
+    for column, char in literals:
+        if not (matrix[:, column] == char).all():
+            return None
+    
+    def field(directive: str) -> np.ndarray:
+        if directive not in fields:
+            return np.zeros(len(matrix), dtype=np.int64)
+        start, stop = fields[directive]
+        value = np.zeros(len(matrix), dtype=np.int64)
+        for column in range(start, stop):
+            # 无符号减法会使小于 '0' 的字节回绕为大数
+            digit = matrix[:, column] - np.uint8(ord('0'))
+            if (digit > 9).any():
+                raise ValueError(directive)
+            value = value * 10 + digit
+        return value
+    
+    try:
+        year, month, day = field('%Y'), field('%m'), field('%d')
+        hour, minute, second = field('%H'), field('%M'), field('%S')
+    except ValueError:
+        return None
+    if ((month < 1) | (month > 12) | (hour > 23) | (minute > 59) | (second > 59)).any():
+        return None
+    
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    month_start = months.astype('datetime64[D]')
+    month_days = ((months + 1).astype('datetime64[D]') - month_start).astype(np.int64)
+    if ((day < 1) | (day > month_days)).any():
+        return None
+    
+    seconds = (day - 1) * 86_400 + hour * 3_600 + minute * 60 + second
+    return (month_start.astype('datetime64[s]') + seconds.astype('timedelta64[s]')).astype('datetime64[us]')
+
+def parse_datetime_column(column: pd.Series, epoch_unit: Optional[str] = None) -> pd.DatetimeIndex:
+    """
+    将时间列转换为时间索引
+    
+    字符串列先用 factorize 去重，只解析不重复的字符串再按编码展开；格式从样本推断，
+    定宽数字格式使用向量化解析，其余按推断的格式整体解析，无法推断时退回逐元素解析。
+    数值列在指定 epoch_unit 时按整数时间戳直接转换
+    
+    Args:
+        column: 时间列
+        epoch_unit: 数值时间戳的单位（'s'、'ms'、'us'、'ns'），'auto' 表示按数值大小推断，
+                    None 表示按 pandas 默认方式处理数值列
+    
+    Returns:
+        时间索引（缺失值为NaT）
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return pd.DatetimeIndex(column, name=column.name)
+    
+    if epoch_unit is not None and pd.api.types.is_numeric_dtype(column) \
+            and not pd.api.types.is_bool_dtype(column):
+        if pd.api.types.is_integer_dtype(column):
+            # 整数时间戳保持int64，转换为浮点数会丢失纳秒精度；缺失值（可空整数类型）最后填入NaT
+            missing = column.isna().to_numpy()
+            values = column.to_numpy(dtype='int64', na_value=0)
+            observed = values[~missing]
+        else:
+            missing = None
+            values = column.to_numpy(dtype=float, na_value=np.nan)
+            observed = values[np.isfinite(values)]
+        if epoch_unit == 'auto':
+            magnitude = np.abs(observed).max() if len(observed) else 0
+            epoch_unit = infer_epoch_unit(magnitude)
+        parsed = pd.DatetimeIndex(pd.to_datetime(values, unit=epoch_unit), name=column.name)
+        if missing is not None and missing.any():
+            parsed = parsed.where(~missing)
+        return parsed
+    
+    values = column.to_numpy(dtype=object)
+    missing = pd.isna(values)
+    if missing.any():
+        values = values[~missing]
+    
+    # 重复的日期字符串只解析一次
+    if _has_repeats(values):
+        codes, uniques = pd.factorize(values)
+        unique_values = np.asarray(uniques, dtype=object)
+    else:
+        codes, unique_values = None, values
+    
+    parsed = None
+    if len(unique_values) and all(isinstance(value, str) for value in _datetime_sample(unique_values)):
+        fmt = infer_datetime_format(unique_values)
+        if fmt is not None:
+            # ISO 8601 格式由 pandas 的C解析器处理，已经足够快
+            fast = None if fmt.startswith('%Y-%m-%d') else _parse_fixed_width(unique_values, fmt)
+            if fast is not None:
+                parsed = pd.DatetimeIndex(fast)
+            else:
+                try:
+                    parsed = pd.DatetimeIndex(pd.to_datetime(unique_values, format=fmt))
+                except (ValueError, TypeError):
+                    parsed = None
+    
+    if parsed is None:
+        try:
+            parsed = pd.DatetimeIndex(pd.to_datetime(unique_values))
+        except (ValueError, TypeError):
+            # 同一列中混用多种格式时逐个推断
+            parsed = pd.DatetimeIndex(pd.to_datetime(unique_values, format='mixed'))
+    
+    if codes is not None:
+        parsed = parsed.take(codes)
+    if missing.any():
+        # 缺失值位置填入NaT
+        positions = np.full(len(missing), -1, dtype=np.intp)
+        positions[~missing] = np.arange(len(parsed))
+        parsed = parsed.take(positions, allow_fill=True, fill_value=pd.NaT)
+    return parsed.rename(column.name)
+
+def normalize_time_index(data: pd.Series, duplicates: str = 'last') -> pd.Series:
+    """
+    保证时间索引有序且不含重复值
+    
+    单次遍历检查索引是否单调递增，只有无序时才稳定排序；在有序索引上比较
+    相邻时间戳即可找出重复值，只有存在重复时才去重
+    
+    Args:
+        data: 时间序列
+        duplicates: 重复时间戳的处理方式：'last'、'first' 保留最后/第一个值，
+                    'mean' 取平均值，'keep' 保留全部
+    
+    Returns:
+        整理后的序列（无需处理时返回原序列）
+    """
+    if duplicates not in ('last', 'first', 'mean', 'keep'):
+        raise ValueError(f"不支持的重复值处理方式: {duplicates}")
+    
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index(kind='stable')
+    if duplicates == 'keep' or len(data) < 2:
+        return data
+    
+    ticks = data.index.asi8
+    repeated = ticks[1:] == ticks[:-1]
+    if not repeated.any():
+        return data
+    
+    if duplicates == 'mean':
+        return data.groupby(level=0, sort=False).mean()
+    if duplicates == 'last':
+        keep = np.append(~repeated, True)
+    else:
+        keep = np.insert(~repeated, 0, True)
+    return data[keep]
+
 def validate_time_series_data(df: pd.DataFrame, 
                              time_col: str, 
-                             value_col: str) -> Tuple[bool, str, Optional[pd.Series]]:
+                             value_col: str,
+                             duplicates: str = 'last',
+                             epoch_unit: Optional[str] = None) -> Tuple[bool, str, Optional[pd.Series]]:
     """
     验证时间序列数据的有效性
     
@@ -63,6 +353,8 @@ def validate_time_series_data(df: pd.DataFrame,
         df: 数据框
         time_col: 时间列名
         value_col: 数值列名
+        duplicates: 重复时间戳的处理方式（见 normalize_time_index）
+        epoch_unit: 数值时间列的时间戳单位（见 parse_datetime_column）
     
     Returns:
         (是否有效, 错误信息, 时间序列数据)
@@ -81,7 +373,7 @@ def validate_time_series_data(df: pd.DataFrame,
         
         # 尝试转换时间列
         try:
-            time_series = pd.to_datetime(df[time_col])
+            time_series = parse_datetime_column(df[time_col], epoch_unit=epoch_unit)
         except Exception as e:
             return False, f"时间列转换失败: {str(e)}", None
         
@@ -93,15 +385,18 @@ def validate_time_series_data(df: pd.DataFrame,
         except Exception as e:
             return False, f"数值列转换失败: {str(e)}", None
         
-        # 创建时间序列
+        # 创建时间序列，去掉缺失的时间和数值
         ts_data = pd.Series(values.values, index=time_series, name=value_col)
-        ts_data = ts_data.dropna()
+        ts_data = ts_data[ts_data.notna().to_numpy() & ~time_series.isna()]
         
         if len(ts_data) < 10:
             return False, "有效数据点太少（少于10个）", None
         
-        return True, "", ts_data
+        # 按时间排序并处理重复时间戳
+        ts_data = normalize_time_index(ts_data, duplicates)
         
+        return True, "", ts_data
+    
     except Exception as e:
         return False, f"数据验证失败: {str(e)}", None
 
@@ -267,13 +562,15 @@ def get_data_summary(data: pd.Series) -> Dict[str, Any]:
         data: 时间序列数据
     
     Returns:
-        数据摘要字典
+        数据摘要字典，frequency_analysis 为 analyze_frequency 的完整结果
     """
+    frequency = analyze_frequency(data.index)
     return {
         'count': len(data),
         'start_date': data.index.min() if len(data) > 0 else None,
         'end_date': data.index.max() if len(data) > 0 else None,
-        'frequency': infer_frequency(data),
+        'frequency': frequency['label'],
+        'frequency_analysis': frequency,
         'missing_values': data.isna().sum(),
         'missing_percentage': (data.isna().sum() / len(data)) * 100 if len(data) > 0 else 0
     }
@@ -289,42 +586,20 @@ def infer_frequency(data: pd.Series) -> str:
         频率字符串
     """
     try:
-        if len(data) < 2:
-            return "Unknown"
-        
-        # 计算时间间隔
-        time_diffs = pd.Series(data.index).diff().dropna()
-        most_common_diff = time_diffs.mode()[0] if len(time_diffs.mode()) > 0 else time_diffs.median()
-        
-        # 判断频率
-        if most_common_diff <= pd.Timedelta(days=1):
-            return "Daily"
-        elif most_common_diff <= pd.Timedelta(days=7):
-            return "Weekly"
-        elif most_common_diff <= pd.Timedelta(days=31):
-            return "Monthly"
-        elif most_common_diff <= pd.Timedelta(days=92):
-            return "Quarterly"
-        elif most_common_diff <= pd.Timedelta(days=366):
-            return "Yearly"
-        else:
-            return "Irregular"
-    
+        return analyze_frequency(data.index)['label']
     except Exception:
         return "Unknown"
 
-def export_results_to_csv(data: pd.Series, test_results: Dict[str, Any]) -> str:
+def _results_table(test_results: Dict[str, Any]) -> pd.DataFrame:
     """
-    将结果导出为CSV格式
+    将检验结果整理为 Category/Metric/Value/Description 表格
     
     Args:
-        data: 时间序列数据
         test_results: 检验结果
     
     Returns:
-        CSV格式的字符串
+        结果表格
     """
-    # 创建结果DataFrame
     results_data = []
     
     # 基本统计信息
@@ -382,26 +657,191 @@ def export_results_to_csv(data: pd.Series, test_results: Dict[str, Any]) -> str:
             'Description': 'Whether series is stationary (KPSS test)'
         })
     
-    # 创建DataFrame并转换为CSV
-    results_df = pd.DataFrame(results_data)
+    return pd.DataFrame(results_data)
+
+def _date_format(index: pd.Index) -> Optional[str]:
+    """
+    为整个时间索引确定统一的日期格式
     
-    # 将原始数据也包含在内
-    data_df = pd.DataFrame({
-        'Date': data.index,
-        'Value': data.values
-    })
+    pandas 按每次写出的数据决定是否省略时间部分，分块写出时需要预先统一格式，
+    否则不同块的格式可能不一致
+    """
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is not None:
+        return None
+    # 按索引自身的时间单位计算，避免转换为纳秒时越界
+    ticks = index[~index.isna()].asi8
+    per_second = np.timedelta64(1, 's') // np.timedelta64(1, index.unit)
+    if np.all(ticks % (86_400 * per_second) == 0):
+        return '%Y-%m-%d'
+    if np.all(ticks % per_second == 0):
+        return '%Y-%m-%d %H:%M:%S'
+    return None
+
+def _fraction_digits(index: pd.DatetimeIndex) -> int:
+    """
+    pandas 默认格式为时间索引显示的秒以下位数（0、3、6或9），由整个索引中最精细的时间决定
+    """
+    ticks = index[~index.isna()].asi8
+    per_second = np.timedelta64(1, 's') // np.timedelta64(1, index.unit)
+    unit_digits = len(str(per_second)) - 1
+    fraction = ticks % per_second
+    for digits in (9, 6, 3):
+        if digits <= unit_digits and np.any(fraction % 10 ** (unit_digits - digits + 3) != 0):
+            return digits
+    return 0
+
+def _format_dates(index: pd.DatetimeIndex, digits: int) -> np.ndarray:
+    """按指定的秒以下位数格式化时间索引，与 pandas 默认格式一致"""
+    per_second = np.timedelta64(1, 's') // np.timedelta64(1, index.unit)
+    unit_digits = len(str(per_second)) - 1
+    fraction = (index.asi8 % per_second) // 10 ** (unit_digits - digits)
+    text = np.char.add(
+        np.char.add(index.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=str), '.'),
+        np.char.zfill(fraction.astype(str), digits)
+    ).astype(object)
+    text[index.isna()] = ''
+    return text
+
+def iter_results_csv(data: pd.Series, test_results: Dict[str, Any],
+                     chunk_size: int = 100_000) -> Iterator[str]:
+    """
+    分块生成CSV导出内容
     
-    # 使用StringIO创建CSV
-    output = io.StringIO()
+    先输出分析结果，再按 chunk_size 行一块输出原始数据，内存占用与序列长度无关
+    
+    Args:
+        data: 时间序列数据
+        test_results: 检验结果
+        chunk_size: 每块的行数
     
+    Yields:
+        CSV文本片段
+    """
     # 写入分析结果
-    output.write("=== STATIONARITY ANALYSIS RESULTS ===\n")
-    results_df.to_csv(output, index=False)
+    yield "=== STATIONARITY ANALYSIS RESULTS ===\n"
+    yield _results_table(test_results).to_csv(index=False)
+    
+    # 分块写入原始数据
+    yield "\n\n=== ORIGINAL DATA ===\n"
+    date_format = _date_format(data.index)
+    # 含秒以下时间时无法用 strftime 格式表示，记录整体的秒以下位数
+    digits = None
+    if isinstance(data.index, pd.DatetimeIndex) and data.index.tz is None and date_format is None:
+        digits = _fraction_digits(data.index)
+    for start in range(0, max(len(data), 1), chunk_size):
+        chunk = data.iloc[start:start + chunk_size]
+        dates = chunk.index
+        # 显式的 date_format 会走较慢的逐行格式化，仅在该块的默认格式与整体不一致时使用
+        chunk_format = None if _date_format(dates) == date_format else date_format
+        if digits is not None and _fraction_digits(dates) != digits:
+            dates = _format_dates(dates, digits)
+        yield pd.DataFrame({
+            'Date': dates,
+            'Value': chunk.values
+        }).to_csv(index=False, header=start == 0, date_format=chunk_format)
+
+def export_results_to_csv(data: pd.Series, test_results: Dict[str, Any]) -> str:
+    """
+    将结果导出为CSV格式
     
-    output.write("\n\n=== ORIGINAL DATA ===\n")
-    data_df.to_csv(output, index=False)
+    Args:
+        data: 时间序列数据
+        test_results: 检验结果
+    
+    Returns:
+        CSV格式的字符串
+    """
+    return ''.join(iter_results_csv(data, test_results))
+
+def export_results_to_file(data: pd.Series, test_results: Dict[str, Any], path: str,
+                           file_format: str = 'csv', chunk_size: int = 1_000_000) -> str:
+    """
+    将结果分块写入文件
+    
+    CSV格式与 export_results_to_csv 相同；Parquet格式以 Date/Value 两列保存原始数据，
+    分析结果表以JSON形式存放在文件元数据的 stationarity_results 键中（需要pyarrow）
+    
+    Args:
+        data: 时间序列数据
+        test_results: 检验结果
+        path: 输出文件路径
+        file_format: 'csv' 或 'parquet'
+        chunk_size: 每块的行数
+    
+    Returns:
+        输出文件路径
+    """
+    if file_format == 'csv':
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            for part in iter_results_csv(data, test_results, chunk_size):
+                f.write(part)
+        return path
+    
+    if file_format != 'parquet':
+        raise ValueError(f"不支持的导出格式: {file_format}")
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("导出Parquet格式需要安装pyarrow")
     
-    return output.getvalue()
+    results_json = _results_table(test_results).to_json(orient='records', force_ascii=False)
+    writer = None
+    try:
+        for start in range(0, max(len(data), 1), chunk_size):
+            chunk = data.iloc[start:start + chunk_size]
+            table = pa.Table.from_pandas(
+                pd.DataFrame({'Date': chunk.index, 'Value': chunk.values}), preserve_index=False
+            )
+            if writer is None:
+                schema = table.schema.with_metadata({
+                    **(table.schema.metadata or {}),
+                    b'stationarity_results': results_json.encode('utf-8')
+                })
+                writer = pq.ParquetWriter(path, schema, compression='zstd')
+            writer.write_table(table.replace_schema_metadata(writer.schema.metadata))
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+def _array_bytes(values) -> bytes:
+    """将数组转换为用于哈希的字节串"""
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'biufcmM':
+        return np.ascontiguousarray(arr).tobytes()
+    return pd.util.hash_array(arr.astype(object)).tobytes()
+
+def series_fingerprint(data: pd.Series) -> str:
+    """
+    计算序列的内容指纹
+    
+    指纹只取决于索引和数值（及其类型），与序列名称无关，可用作缓存键
+    
+    Args:
+        data: 时间序列数据
+    
+    Returns:
+        十六进制指纹字符串
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{len(data)}|{data.dtype}|{data.index.dtype}".encode())
+    hasher.update(_array_bytes(data.index))
+    hasher.update(_array_bytes(data.values))
+    return hasher.hexdigest()
+
+def bytes_fingerprint(content: bytes) -> str:
+    """
+    计算字节内容（如上传文件）的指纹
+    
+    Args:
+        content: 字节串
+    
+    Returns:
+        十六进制指纹字符串
+    """
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
 
 def get_stat_description(stat_name: str) -> str:
     """
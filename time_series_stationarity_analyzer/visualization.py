@@ -11,24 +11,302 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import streamlit as st
-from typing import Tuple, Optional
+import functools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Tuple, Optional, Sequence, Dict, Any, Callable
 from .stationarity import calculate_acf_pacf
+from .seasonality import detect_seasonal_periods, decompose_series
+from .rolling import RollingStatistics
+from .utils import series_fingerprint
 
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Arial Unicode MS']
 plt.rcParams['axes.unicode_minus'] = False
 
+# 分布汇总缓存：(序列指纹, 分箱数, 异常值上限) -> 汇总结果
+_DISTRIBUTION_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_DISTRIBUTION_CACHE_SIZE = 32
+_DISTRIBUTION_CACHE_LOCK = threading.Lock()
+
+
+def summarize_distribution(data: pd.Series, bins: int = 30,
+                           max_outliers: int = 1000) -> Dict[str, Any]:
+    """
+    在服务端计算直方图与箱线图所需的汇总量
+    
+    四分位数使用线性插值（与Plotly默认一致），须线取1.5倍四分位距范围内的
+    最远数据点。异常值超过上限时按排序后等间距抽样，并保留两端极值。
+    结果按序列内容和参数缓存。
+    
+    Args:
+        data: 时间序列数据
+        bins: 直方图分箱数
+        max_outliers: 最多保留的异常值数量
+    
+    Returns:
+        包含 counts、edges、q1、median、q3、mean、lower_fence、upper_fence、
+        outliers、n_outliers、count 的字典
+    """
+    key = (series_fingerprint(data), bins, max_outliers)
+    with _DISTRIBUTION_CACHE_LOCK:
+        cached = _DISTRIBUTION_CACHE.get(key)
+        if cached is not None:
+            _DISTRIBUTION_CACHE.move_to_end(key)
+            return cached
+    
+    values = data.to_numpy(dtype=float)
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return {'count': 0}
+    
+    counts, edges = np.histogram(values, bins=bins)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    low_limit = q1 - 1.5 * iqr
+    high_limit = q3 + 1.5 * iqr
+    inside = (values >= low_limit) & (values <= high_limit)
+    
+    outliers = np.sort(values[~inside])
+    n_outliers = outliers.size
+    if n_outliers > max_outliers:
+        outliers = outliers[np.linspace(0, n_outliers - 1, max_outliers).round().astype(int)]
+    
+    summary = {
+        'counts': counts,
+        'edges': edges,
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'mean': float(values.mean()),
+        'lower_fence': float(values[inside].min()),
+        'upper_fence': float(values[inside].max()),
+        'outliers': outliers,
+        'n_outliers': int(n_outliers),
+        'count': int(values.size)
+    }
+    
+    with _DISTRIBUTION_CACHE_LOCK:
+        _DISTRIBUTION_CACHE[key] = summary
+        _DISTRIBUTION_CACHE.move_to_end(key)
+        while len(_DISTRIBUTION_CACHE) > _DISTRIBUTION_CACHE_SIZE:
+            _DISTRIBUTION_CACHE.popitem(last=False)
+    return summary
+
+
+# 单个图表序列化后的默认大小上限（字节），超过时对折线轨迹做抽稀
+DEFAULT_FIGURE_BUDGET = 2 * 1024 * 1024
+# 抽稀后每条轨迹至少保留的点数
+MIN_DECIMATED_POINTS = 1000
+# 最近生成的图表指标
+FIGURE_METRICS: "deque[Dict[str, Any]]" = deque(maxlen=100)
+
+
+# 估算大小时计入的轨迹数据属性
+_SIZED_ATTRIBUTES = ('x', 'y', 'z', 'text', 'customdata')
+# 估算大小时的固定开销（布局与每条轨迹的其他属性）
+_LAYOUT_BYTES = 8 * 1024
+_TRACE_BYTES = 1024
+# 估算值在大小上限的该倍数范围内时才精确序列化测量：低于下限必然不超限，
+# 高于上限必然需要抽稀，直接按估算值确定抽稀比例
+_EXACT_SIZE_RANGE = (0.5, 2.0)
+
+
+def _figure_size(fig: go.Figure) -> int:
+    """图表序列化为JSON后的字节数"""
+    return len(fig.to_json().encode('utf-8'))
+
+
+def _array_bytes(values: Any) -> int:
+    """估算一个轨迹属性序列化后的字节数"""
+    if isinstance(values, str):
+        return len(values) + 2
+    array = np.asarray(values)
+    if array.size == 0:
+        return 2
+    if array.dtype.kind in 'iufb':
+        # 数值数组以base64编码的二进制形式序列化
+        return int(array.nbytes * 4 / 3) + 64
+    if array.dtype.kind == 'M':
+        # 时间戳序列化为ISO格式字符串
+        return array.size * 28
+    sample = array.ravel()[:: max(array.size // 100, 1)]
+    return int(array.size * (sum(len(str(value)) for value in sample) / len(sample) + 3))
+
+
+def _estimate_figure_size(fig: go.Figure) -> int:
+    """按各轨迹数据的长度和类型估算序列化后的字节数，不做序列化"""
+    total = _LAYOUT_BYTES
+    for trace in fig.data:
+        total += _TRACE_BYTES
+        for name in _SIZED_ATTRIBUTES:
+            values = getattr(trace, name, None)
+            if values is not None:
+                total += _array_bytes(values)
+    return total
+
+
+def _figure_points(fig: go.Figure) -> int:
+    """图表中各轨迹的数据点总数"""
+    total = 0
+    for trace in fig.data:
+        values = getattr(trace, 'y', None)
+        if values is None:
+            values = getattr(trace, 'x', None)
+        if values is not None:
+            total += len(values)
+    return total
+
+
+def minmax_decimate_indices(values: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    最小-最大抽稀
+    
+    将序列均分为 n_out // 2 个桶，每个桶保留最小值和最大值所在的位置，
+    从而在大幅减少点数的同时保留尖峰形态。缺失值所在位置不会被选中。
+    
+    Args:
+        values: 一维数组
+        n_out: 目标点数
+    
+    Returns:
+        按原顺序排列的保留位置
+    """
+    n = len(values)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    
+    # 末尾不足一个桶的部分并入最后一个桶
+    edges = np.arange(n_buckets + 1) * (n // n_buckets)
+    edges[-1] = n
+    missing = np.isnan(values)
+    low = np.minimum.reduceat(np.where(missing, np.inf, values), edges[:-1])
+    high = np.maximum.reduceat(np.where(missing, -np.inf, values), edges[:-1])
+    
+    # 桶内第一个等于最小/最大值的位置
+    bucket_id = np.repeat(np.arange(n_buckets), np.diff(edges))
+    positions = np.arange(n)
+    is_low = values == low[bucket_id]
+    is_high = values == high[bucket_id]
+    low_index = np.full(n_buckets, n, dtype=np.int64)
+    high_index = np.full(n_buckets, n, dtype=np.int64)
+    np.minimum.at(low_index, bucket_id[is_low], positions[is_low])
+    np.minimum.at(high_index, bucket_id[is_high], positions[is_high])
+    
+    indices = np.concatenate([low_index, high_index, [0, n - 1]])
+    indices = indices[indices < n]
+    return np.unique(indices)
+
+
+def decimate_figure(fig: go.Figure, fraction: float,
+                    min_points: int = MIN_DECIMATED_POINTS) -> bool:
+    """
+    按比例对图表中的折线轨迹做最小-最大抽稀（原地修改）
+    
+    Args:
+        fig: Plotly图表对象
+        fraction: 每条轨迹保留的点数比例
+        min_points: 每条轨迹至少保留的点数
+    
+    Returns:
+        是否有轨迹被抽稀
+    """
+    decimated = False
+    for trace in fig.data:
+        if trace.type not in ('scatter', 'scattergl') or trace.y is None:
+            continue
+        y = np.asarray(trace.y, dtype=float)
+        max_points = max(int(len(y) * fraction), min_points)
+        if len(y) <= max_points:
+            continue
+        
+        keep = minmax_decimate_indices(y, max_points)
+        x = np.asarray(trace.x) if trace.x is not None else np.arange(len(y))
+        trace.update(x=x[keep], y=y[keep])
+        decimated = True
+    return decimated
+
+
+def instrument_figure(func: Callable[..., go.Figure]) -> Callable[..., go.Figure]:
+    """
+    图表方法装饰器：记录构建耗时与序列化大小，超过大小上限时自动抽稀
+    
+    大小上限取自可视化器的 figure_budget（模块级函数使用 DEFAULT_FIGURE_BUDGET），
+    为 None 时不做抽稀；track_figures 为 False 时跳过测量。大小先按轨迹数据的
+    长度估算，只有估算值接近上限或抽稀之后才实际序列化测量，避免大图表被整体序列化。
+    指标记录在可视化器的 figure_metrics 字典及模块级 FIGURE_METRICS 中。
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> go.Figure:
+        visualizer = args[0] if args and isinstance(args[0], TimeSeriesVisualizer) else None
+        if visualizer is not None and not visualizer.track_figures:
+            return func(*args, **kwargs)
+        budget = visualizer.figure_budget if visualizer is not None else DEFAULT_FIGURE_BUDGET
+        
+        start = time.perf_counter()
+        fig = func(*args, **kwargs)
+        build_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        size = _estimate_figure_size(fig)
+        exact = budget is not None and \
+            budget * _EXACT_SIZE_RANGE[0] < size < budget * _EXACT_SIZE_RANGE[1]
+        if exact:
+            size = _figure_size(fig)
+        original_size = size
+        original_points = _figure_points(fig)
+        decimated = False
+        
+        # 按超出比例缩减点数，序列化后仍超出时继续缩减
+        for _ in range(3):
+            if budget is None or size <= budget:
+                break
+            if not decimate_figure(fig, budget / size * 0.9):
+                break
+            decimated = True
+            size = _figure_size(fig)
+            exact = True
+        
+        record = {
+            'figure': func.__name__,
+            'build_time': build_time,
+            'budget_time': time.perf_counter() - start,
+            'bytes': size,
+            'original_bytes': original_size,
+            'points': _figure_points(fig),
+            'original_points': original_points,
+            'decimated': decimated,
+            'exact_size': exact,
+            'budget': budget
+        }
+        FIGURE_METRICS.append(record)
+        if visualizer is not None:
+            visualizer.figure_metrics[func.__name__] = record
+        return fig
+    return wrapper
+
+
 class TimeSeriesVisualizer:
     """时间序列可视化器"""
     
-    def __init__(self, theme: str = 'plotly_white'):
+    def __init__(self, theme: str = 'plotly_white',
+                 figure_budget: Optional[int] = DEFAULT_FIGURE_BUDGET,
+                 track_figures: bool = True):
         """
         初始化可视化器
         
         Args:
             theme: 图表主题
+            figure_budget: 单个图表序列化后的大小上限（字节），None 表示不限制
+            track_figures: 是否记录图表构建耗时与大小
         """
         self.theme = theme
+        self.figure_budget = figure_budget
+        self.track_figures = track_figures
+        # 各图表方法最近一次的指标：方法名 -> 指标字典
+        self.figure_metrics: Dict[str, Dict[str, Any]] = {}
         self.colors = {
             'primary': '#1f77b4',
             'secondary': '#ff7f0e',
@@ -37,7 +315,12 @@ class TimeSeriesVisualizer:
             'warning': '#ff9800',
             'info': '#17a2b8'
         }
+        # 最近一次计算的ACF：(序列指纹, ACF值)，供季节周期检测复用
+        self._last_acf = None
+        # 滚动统计引擎，按序列对象复用，滑块变化时无需重新扫描数据
+        self._rolling_engine = None
     
+    @instrument_figure
     def plot_time_series(self, data: pd.Series, title: str = "时间序列图", 
                         height: int = 400) -> go.Figure:
         """
@@ -89,6 +372,7 @@ class TimeSeriesVisualizer:
         
         return fig
     
+    @instrument_figure
     def plot_acf_pacf(self, data: pd.Series, lags: int = 40, 
                      title: str = "自相关和偏自相关函数") -> go.Figure:
         """
@@ -104,6 +388,8 @@ class TimeSeriesVisualizer:
         """
         # 计算ACF和PACF
         acf_values, pacf_values = calculate_acf_pacf(data, lags)
+        if len(acf_values) > 0:
+            self._last_acf = (series_fingerprint(data), acf_values)
         
         if len(acf_values) == 0 or len(pacf_values) == 0:
             # 如果计算失败，返回空图
@@ -179,28 +465,39 @@ class TimeSeriesVisualizer:
         
         return fig
     
+    @instrument_figure
     def plot_decomposition(self, data: pd.Series, 
-                          title: str = "时间序列分解") -> go.Figure:
+                          title: str = "时间序列分解",
+                          periods: Optional[Sequence[int]] = None,
+                          method: str = 'auto') -> go.Figure:
         """
         绘制时间序列分解图
         
         Args:
             data: 时间序列数据
             title: 图表标题
+            periods: 季节周期列表，None表示自动检测
+            method: 分解方法 ('auto', 'classical', 'stl', 'mstl')
         
         Returns:
             Plotly图表对象
         """
         try:
-            from statsmodels.tsa.seasonal import seasonal_decompose
+            if periods is None:
+                candidates = self.detect_periods(data)
+                if candidates:
+                    periods = [candidates[0]['period']]
             
             # 进行时间序列分解
-            decomposition = seasonal_decompose(data, model='additive', period=min(12, len(data)//2))
+            decomposition = decompose_series(data, periods=periods, method=method)
             
             # 创建子图
+            period_text = ', '.join(str(p) for p in decomposition['periods'])
+            if decomposition['window'] < len(data.dropna()):
+                period_text += f", 末尾{decomposition['window']}个点"
             fig = make_subplots(
                 rows=4, cols=1,
-                subplot_titles=('原始序列', '趋势', '季节性', '残差'),
+                subplot_titles=('原始序列', '趋势', f'季节性 (周期={period_text})', '残差'),
                 vertical_spacing=0.08
             )
             
@@ -217,7 +514,7 @@ class TimeSeriesVisualizer:
             # 趋势
             fig.add_trace(
                 go.Scatter(
-                    x=data.index, y=decomposition.trend.values,
+                    x=decomposition['trend'].index, y=decomposition['trend'].values,
                     mode='lines', name='趋势',
                     line=dict(color=self.colors['secondary'])
                 ),
@@ -227,7 +524,7 @@ class TimeSeriesVisualizer:
             # 季节性
             fig.add_trace(
                 go.Scatter(
-                    x=data.index, y=decomposition.seasonal.values,
+                    x=decomposition['seasonal'].index, y=decomposition['seasonal'].values,
                     mode='lines', name='季节性',
                     line=dict(color=self.colors['success'])
                 ),
@@ -237,7 +534,7 @@ class TimeSeriesVisualizer:
             # 残差
             fig.add_trace(
                 go.Scatter(
-                    x=data.index, y=decomposition.resid.values,
+                    x=decomposition['resid'].index, y=decomposition['resid'].values,
                     mode='lines', name='残差',
                     line=dict(color=self.colors['danger'])
                 ),
@@ -252,7 +549,7 @@ class TimeSeriesVisualizer:
             )
             
             return fig
-            
+        
         except Exception as e:
             # 如果分解失败，返回错误信息
             fig = go.Figure()
@@ -265,14 +562,36 @@ class TimeSeriesVisualizer:
             )
             return fig
     
+    def detect_periods(self, data: pd.Series, max_candidates: int = 3) -> list:
+        """
+        检测季节周期，若已为该序列计算过ACF则复用其峰值
+        
+        Args:
+            data: 时间序列数据
+            max_candidates: 最多返回的候选周期数
+        
+        Returns:
+            候选周期列表
+        """
+        acf_values = None
+        if self._last_acf is not None and self._last_acf[0] == series_fingerprint(data):
+            acf_values = self._last_acf[1]
+        return detect_seasonal_periods(data, max_candidates=max_candidates, acf_values=acf_values)
+    
+    @instrument_figure
     def plot_distribution(self, data: pd.Series, 
-                         title: str = "数据分布") -> go.Figure:
+                         title: str = "数据分布", bins: int = 30,
+                         max_outliers: int = 1000) -> go.Figure:
         """
         绘制数据分布图
         
+        直方图分箱与箱线图统计量在服务端预先计算，图表数据量与序列长度无关
+        
         Args:
             data: 时间序列数据
             title: 图表标题
+            bins: 直方图分箱数
+            max_outliers: 箱线图最多显示的异常值数量
         
         Returns:
             Plotly图表对象
@@ -283,34 +602,66 @@ class TimeSeriesVisualizer:
             specs=[[{"secondary_y": False}, {"secondary_y": False}]]
         )
         
-        # 直方图
-        fig.add_trace(
-            go.Histogram(
-                x=data.values,
-                nbinsx=30,
-                name='分布',
-                marker_color=self.colors['primary'],
-                opacity=0.7
-            ),
-            row=1, col=1
-        )
+        summary = summarize_distribution(data, bins=bins, max_outliers=max_outliers)
         
-        # 箱线图
-        fig.add_trace(
-            go.Box(
-                y=data.values,
-                name='箱线图',
-                marker_color=self.colors['secondary'],
-                boxpoints='outliers'
-            ),
-            row=1, col=2
-        )
+        if summary['count'] > 0:
+            edges = summary['edges']
+            
+            # 直方图
+            fig.add_trace(
+                go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=summary['counts'],
+                    width=np.diff(edges),
+                    name='分布',
+                    marker_color=self.colors['primary'],
+                    opacity=0.7,
+                    customdata=np.column_stack([edges[:-1], edges[1:]]),
+                    hovertemplate='区间: [%{customdata[0]:.4g}, %{customdata[1]:.4g})<br>'
+                                  '频次: %{y}<extra></extra>'
+                ),
+                row=1, col=1
+            )
+            
+            # 箱线图（预先计算的统计量）
+            fig.add_trace(
+                go.Box(
+                    x=['箱线图'],
+                    q1=[summary['q1']],
+                    median=[summary['median']],
+                    q3=[summary['q3']],
+                    mean=[summary['mean']],
+                    lowerfence=[summary['lower_fence']],
+                    upperfence=[summary['upper_fence']],
+                    name='箱线图',
+                    marker_color=self.colors['secondary'],
+                    boxpoints=False
+                ),
+                row=1, col=2
+            )
+            
+            # 异常值
+            if summary['outliers'].size > 0:
+                outlier_name = '异常值'
+                if summary['n_outliers'] > summary['outliers'].size:
+                    outlier_name = f"异常值 (抽样 {summary['outliers'].size}/{summary['n_outliers']})"
+                fig.add_trace(
+                    go.Scatter(
+                        x=['箱线图'] * summary['outliers'].size,
+                        y=summary['outliers'],
+                        mode='markers',
+                        name=outlier_name,
+                        marker=dict(color=self.colors['secondary'], size=4, opacity=0.6)
+                    ),
+                    row=1, col=2
+                )
         
         fig.update_layout(
             title=dict(text=title, x=0.5, font=dict(size=16)),
             template=self.theme,
             height=400,
-            showlegend=False
+            showlegend=False,
+            bargap=0
         )
         
         fig.update_xaxes(title_text="数值", row=1, col=1)
@@ -319,6 +670,7 @@ class TimeSeriesVisualizer:
         
         return fig
     
+    @instrument_figure
     def plot_rolling_statistics(self, data: pd.Series, window: int = 12,
                                title: str = "滚动统计") -> go.Figure:
         """
@@ -333,8 +685,9 @@ class TimeSeriesVisualizer:
             Plotly图表对象
         """
         # 计算滚动统计
-        rolling_mean = data.rolling(window=window).mean()
-        rolling_std = data.rolling(window=window).std()
+        engine = self.get_rolling_engine(data)
+        rolling_mean = engine.mean(window)
+        rolling_std = engine.std(window)
         
         fig = go.Figure()
         
@@ -379,6 +732,80 @@ class TimeSeriesVisualizer:
         
         return fig
     
+    def get_rolling_engine(self, data: pd.Series) -> RollingStatistics:
+        """
+        获取序列的滚动统计引擎，同一序列对象只预计算一次前缀和
+        
+        Args:
+            data: 时间序列数据
+        
+        Returns:
+            滚动统计引擎
+        """
+        if self._rolling_engine is None or self._rolling_engine.data is not data:
+            self._rolling_engine = RollingStatistics(data)
+        return self._rolling_engine
+    
+    @instrument_figure
+    def plot_rolling_diagnostics(self, data: pd.Series, window: int = 12,
+                                 title: str = "滚动平稳性诊断") -> go.Figure:
+        """
+        绘制滚动方差比与均值漂移诊断图
+        
+        Args:
+            data: 时间序列数据
+            window: 滚动窗口大小
+            title: 图表标题
+        
+        Returns:
+            Plotly图表对象
+        """
+        engine = self.get_rolling_engine(data)
+        variance_ratio = engine.variance_ratio(window)
+        mean_shift = engine.mean_shift(window)
+        
+        fig = make_subplots(
+            rows=2, cols=1,
+            subplot_titles=('方差比 (当前窗口/前一窗口)', '均值漂移统计量'),
+            vertical_spacing=0.12
+        )
+        
+        fig.add_trace(
+            go.Scatter(
+                x=variance_ratio.index,
+                y=variance_ratio.values,
+                mode='lines',
+                name='方差比',
+                line=dict(color=self.colors['primary'], width=1)
+            ),
+            row=1, col=1
+        )
+        fig.add_hline(y=1, line_dash="dash", line_color=self.colors['danger'], row=1, col=1)
+        
+        fig.add_trace(
+            go.Scatter(
+                x=mean_shift.index,
+                y=mean_shift.values,
+                mode='lines',
+                name='均值漂移',
+                line=dict(color=self.colors['secondary'], width=1)
+            ),
+            row=2, col=1
+        )
+        fig.add_hline(y=1.96, line_dash="dash", line_color=self.colors['danger'], row=2, col=1)
+        fig.add_hline(y=-1.96, line_dash="dash", line_color=self.colors['danger'], row=2, col=1)
+        
+        fig.update_layout(
+            title=dict(text=f"{title} (窗口={window})", x=0.5, font=dict(size=16)),
+            template=self.theme,
+            height=600,
+            showlegend=False
+        )
+        fig.update_yaxes(type='log', row=1, col=1)
+        
+        return fig
+    
+    @instrument_figure
     def compare_series(self, original: pd.Series, transformed: pd.Series,
                       labels: Tuple[str, str] = ("原始序列", "转换后序列"),
                       title: str = "序列对比") -> go.Figure:
@@ -437,6 +864,7 @@ class TimeSeriesVisualizer:
         
         return fig
 
+@instrument_figure
 def create_test_report_chart(test_results: dict) -> go.Figure:
     """
     创建检验结果汇总图表
@@ -503,3 +931,100 @@ def create_test_report_chart(test_results: dict) -> go.Figure:
     )
     
     return fig
+
+@instrument_figure
+def create_p_value_heatmap(summary: pd.DataFrame, highlight: Optional[str] = None) -> go.Figure:
+    """
+    创建多序列检验结果热力图
+    
+    每行一个序列，每列一项检验；颜色表示结论（绿色为平稳/独立，红色为非平稳/
+    存在自相关，灰色为检验失败），格中标注p值
+    
+    Args:
+        summary: analyze_columns 或 analyze_groups 返回的结果表
+        highlight: 需要突出显示的序列名称
+    
+    Returns:
+        Plotly图表对象
+    """
+    tests = [('综合结论', None, 'is_stationary'),
+             ('ADF检验', 'adf_p_value', 'adf_stationary'),
+             ('KPSS检验', 'kpss_p_value', 'kpss_stationary'),
+             ('Ljung-Box检验', 'ljung_box_p_value', 'ljung_box_independent')]
+    names = summary['entity'].astype(str).tolist()
+    
+    verdicts = np.column_stack([
+        summary[flag].map({True: 1.0, False: 0.0}).astype(float).to_numpy() for _, _, flag in tests
+    ])
+    text = np.column_stack([
+        np.where(summary[flag].eq(True), '平稳', np.where(summary[flag].eq(False), '非平稳', '失败'))
+        if column is None else
+        np.where(summary[column].notna(), summary[column].map(lambda p: f"{p:.3f}"), '—')
+        for _, column, flag in tests
+    ])
+    
+    fig = go.Figure(go.Heatmap(
+        z=verdicts,
+        x=[label for label, _, _ in tests],
+        y=names,
+        text=text,
+        texttemplate='%{text}',
+        colorscale=[[0.0, '#d62728'], [1.0, '#2ca02c']],
+        zmin=0, zmax=1,
+        showscale=False,
+        xgap=2, ygap=1,
+        hovertemplate='<b>%{y}</b><br>%{x}: %{text}<extra></extra>'
+    ))
+    
+    if highlight is not None and str(highlight) in names:
+        row = names.index(str(highlight))
+        fig.add_shape(type='rect', x0=-0.5, x1=len(tests) - 0.5, y0=row - 0.5, y1=row + 0.5,
+                      line=dict(color='#1f77b4', width=3))
+    
+    fig.update_layout(
+        title=dict(text="多序列平稳性检验结果", x=0.5, font=dict(size=16)),
+        template='plotly_white',
+        height=max(300, 22 * len(names) + 120),
+        plot_bgcolor='#e0e0e0',
+        yaxis=dict(autorange='reversed', type='category'),
+        xaxis=dict(side='top')
+    )
+    
+    return fig
+
+@instrument_figure
+def create_history_chart(history: pd.DataFrame) -> go.Figure:
+    """
+    创建单个序列历次检验的p值趋势图
+    
+    Args:
+        history: ResultsStore.query 返回的记录（同一序列）
+    
+    Returns:
+        Plotly图表对象
+    """
+    history = history.sort_values('created_at')
+    fig = go.Figure()
+    for column, label in (('adf_p_value', 'ADF检验'), ('kpss_p_value', 'KPSS检验'),
+                          ('ljung_box_p_value', 'Ljung-Box检验')):
+        fig.add_trace(go.Scatter(
+            x=history['created_at'],
+            y=history[column],
+            mode='lines+markers',
+            name=label,
+            customdata=history['overall_conclusion'],
+            hovertemplate='%{x}<br>p值: %{y:.4f}<br>%{customdata}<extra>' + label + '</extra>'
+        ))
+    
+    fig.add_hline(y=0.05, line_dash="dash", line_color="red",
+                  annotation_text="α = 0.05")
+    
+    fig.update_layout(
+        title=dict(text="历次检验p值趋势", x=0.5, font=dict(size=16)),
+        xaxis_title="检验时间",
+        yaxis_title="p值",
+        template='plotly_white',
+        height=400
+    )
+    
+    return fig